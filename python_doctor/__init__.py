@@ -1,3 +1,15 @@
 """Python Doctor — health scoring for Python codebases."""
 
 __version__ = "2026.5.11"
+
+# The library API is imported on first use, so ``import python_doctor`` and the CLI stay fast.
+_SESSION_EXPORTS = frozenset({"Session", "ScanResult"})
+
+
+def __getattr__(name: str):
+    """Lazily export the library API from :mod:`python_doctor.session`."""
+    if name in _SESSION_EXPORTS:
+        from . import session
+
+        return getattr(session, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
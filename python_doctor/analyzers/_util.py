@@ -1,6 +1,16 @@
 """Shared utilities for analyzers."""
 
+import functools
+import heapq
 import os
+import shutil
+import subprocess  # nosec B404 — required for running CLI tools
+import threading
+import time
+from typing import Callable
+
+from ..rules import CATEGORIES, DIMINISHING_RETURNS, AnalyzerResult, Finding
+from ..timing import NULL_TIMER
 
 # Directories to skip during analysis
 SKIP_DIRS = frozenset({
@@ -9,10 +19,19 @@ SKIP_DIRS = frozenset({
 })
 
 
+# Files named on one tool command line, keeping it well under the OS limit.
+FILES_PER_TOOL_RUN = 1000
+
 _TEST_DIRS = frozenset({"tests", "test", "testing"})
 _EXAMPLE_DIRS = frozenset({"examples", "example", "docs_src", "samples", "demo", "demos", "benchmarks", "scripts"})
 
 
+@functools.lru_cache(maxsize=None)
+def find_tool(name: str) -> str | None:
+    """Path of the *name* executable on PATH, looked up once per process."""
+    return shutil.which(name)
+
+
 def is_test_file(filepath: str) -> bool:
     """Check if a file is a test file."""
     parts = os.path.normpath(filepath).split(os.sep)
@@ -28,6 +47,135 @@ def is_example_file(filepath: str) -> bool:
     return any(p in _EXAMPLE_DIRS for p in parts)
 
 
+def split_by_root(items, roots: list[str], filename: Callable[[object], str]) -> dict[str, list]:
+    """Distribute tool output *items* over the scan *roots* that contain them.
+
+    Used when one tool run covers several roots. *filename* extracts an
+    item's file path; an item under nested roots goes to each of them, as
+    separate runs would report it.
+    """
+    by_root: dict[str, list] = {root: [] for root in roots}
+    root_set = {os.path.abspath(root): root for root in roots}
+    owners: dict[str, list[str]] = {}
+    for item in items:
+        directory = os.path.dirname(os.path.abspath(filename(item)))
+        found = owners.get(directory)
+        if found is None:
+            found = []
+            d = directory
+            while True:
+                if d in root_set:
+                    found.append(root_set[d])
+                parent = os.path.dirname(d)
+                if parent == d:
+                    break
+                d = parent
+            owners[directory] = found
+        for root in found:
+            by_root[root].append(item)
+    return by_root
+
+
+# How often a cancellable tool run checks whether it should be killed.
+_TOOL_POLL_SECONDS = 0.05
+
+
+class ToolCancelled(Exception):
+    """Raised by :func:`run_tool` when the scan is cancelled mid-run."""
+
+
+def run_tool(
+    cmd: list[str], timeout: float = 120, cancel: threading.Event | None = None
+) -> subprocess.CompletedProcess:
+    """Run an external tool, capturing its text output.
+
+    Without *cancel* this is plain ``subprocess.run``.  With it the child is
+    polled and killed as soon as the event is set, raising ToolCancelled.
+    """
+    if cancel is None:
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)  # nosec B603
+    deadline = time.monotonic() + timeout
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as proc:  # nosec B603
+        while True:
+            try:
+                out, err = proc.communicate(timeout=_TOOL_POLL_SECONDS)
+                return subprocess.CompletedProcess(cmd, proc.returncode, out, err)
+            except subprocess.TimeoutExpired:
+                if cancel.is_set():
+                    proc.kill()
+                    proc.communicate()
+                    raise ToolCancelled(cmd[0]) from None
+                if time.monotonic() > deadline:
+                    proc.kill()
+                    proc.communicate()
+                    raise
+
+
+# Decimals kept in deduction totals; far below any cost, far above float noise.
+_TOTAL_DIGITS = 9
+
+
+def _rounded(total: float) -> float:
+    """Round *total* to ``_TOTAL_DIGITS`` decimals; whole totals become ints, as JSON output has always shown them."""
+    total = round(total, _TOTAL_DIGITS)
+    return int(total) if total.is_integer() else total
+
+
+class DeductionAccumulator:
+    """Streaming form of :func:`diminishing_deduction`.
+
+    Costs are fed in one at a time.  The *top_n* largest are kept in a
+    bounded min-heap and everything that falls out of it goes into a
+    running tail sum, so memory is O(top_n) however many findings there
+    are.  ``top_n=None`` counts every cost in full.  Totals are rounded to
+    ``_TOTAL_DIGITS`` decimals so they do not depend on the order costs
+    arrived in (float sums do), which keeps merged shard runs exact.
+    """
+
+    __slots__ = ("top_n", "tail_rate", "_head", "_tail", "_linear")
+
+    def __init__(self, top_n: int | None = 5, tail_rate: float = 0.1):
+        self.top_n = top_n
+        self.tail_rate = tail_rate
+        self._head: list[float] = []
+        self._tail = 0.0
+        self._linear = 0.0
+
+    @classmethod
+    def for_category(cls, category: str) -> "DeductionAccumulator":
+        """Build an accumulator using the category's diminishing-returns curve."""
+        top_n, tail_rate = DIMINISHING_RETURNS.get(category, (None, 1.0))
+        return cls(top_n=top_n, tail_rate=tail_rate)
+
+    def add(self, cost: float) -> None:
+        """Feed one finding's cost into the running deduction."""
+        self._linear += cost
+        if self.top_n is None:
+            return
+        if len(self._head) < self.top_n:
+            heapq.heappush(self._head, cost)
+        elif cost > self._head[0]:
+            self._tail += heapq.heapreplace(self._head, cost)
+        else:
+            self._tail += cost
+
+    @property
+    def raw_total(self) -> float:
+        """Sum of every cost seen, without diminishing returns."""
+        return _rounded(self._linear)
+
+    @property
+    def total(self) -> float:
+        """Uncapped deduction: top costs in full plus the discounted tail."""
+        if self.top_n is None:
+            return _rounded(self._linear)
+        return _rounded(sum(self._head) + self._tail * self.tail_rate)
+
+    def value(self, cap: float) -> float:
+        """Return the deduction capped at *cap*."""
+        return min(self.total, cap)
+
+
 def diminishing_deduction(
     costs: list[float],
     top_n: int = 5,
@@ -40,6 +188,102 @@ def diminishing_deduction(
     remaining finding is counted at *tail_rate* of its cost.  The result
     is capped at *cap*.
     """
-    sorted_costs = sorted(costs, reverse=True)
-    total = sum(c if i < top_n else c * tail_rate for i, c in enumerate(sorted_costs))
-    return min(total, cap)
+    acc = DeductionAccumulator(top_n=top_n, tail_rate=tail_rate)
+    for cost in costs:
+        acc.add(cost)
+    return acc.value(cap)
+
+
+class FindingSink:
+    """Collects one analyzer's findings and scores them as they arrive.
+
+    Analyzers call :meth:`add` for every finding they produce and
+    :meth:`finish` once at the end to set ``result.deduction``.  The sink
+    applies rule suppression, tallies counts and costs per rule, and keeps
+    at most *keep* findings (``None`` keeps all), passing every scored
+    finding to *on_finding* as it arrives.  Analyzers poll
+    :attr:`should_stop` between units of work: it turns true once the
+    *cancel* event is set, or, with *score_only*, once the category cap is
+    reached and further findings cannot change the score.  *timer*
+    (see :mod:`python_doctor.timing`) receives the analyzer's phase timings.
+    """
+
+    def __init__(
+        self,
+        category: str,
+        max_deduction: float | None = None,
+        *,
+        suppress: Callable[[str, str], bool] | None = None,
+        keep: int | None = None,
+        score_only: bool = False,
+        cancel: threading.Event | None = None,
+        on_finding: Callable[[Finding], None] | None = None,
+        timer=None,
+    ):
+        self.result = AnalyzerResult(category=category)
+        if max_deduction is None:
+            max_deduction = CATEGORIES[category]["max_deduction"]
+        self.max_deduction = max_deduction
+        self.deduction = DeductionAccumulator.for_category(category)
+        self.suppress = suppress
+        self.keep = keep
+        self.score_only = score_only
+        self.cancel = cancel
+        self.on_finding = on_finding
+        self.timer = timer if timer is not None else NULL_TIMER
+        self.suppressed = 0
+
+    @classmethod
+    def from_kwargs(cls, category: str, kw: dict) -> "FindingSink":
+        """Build a sink from the keyword arguments passed to ``analyze``."""
+        return cls(
+            category,
+            kw.get("max_deduction"),
+            suppress=kw.get("suppress"),
+            keep=kw.get("keep"),
+            score_only=kw.get("score_only", False),
+            cancel=kw.get("cancel"),
+            on_finding=kw.get("on_finding"),
+            timer=kw.get("timer"),
+        )
+
+    @property
+    def saturated(self) -> bool:
+        """True when only the score is wanted and the category cap is reached."""
+        return self.score_only and self.deduction.total >= self.max_deduction
+
+    @property
+    def should_stop(self) -> bool:
+        """True when the analyzer can stop producing findings."""
+        return self.saturated or (self.cancel is not None and self.cancel.is_set())
+
+    def run_tool(self, cmd: list[str], timeout: float = 120) -> subprocess.CompletedProcess:
+        """Run an external tool, killing it if this scan is cancelled."""
+        with self.timer.tool(cmd):
+            return run_tool(cmd, timeout=timeout, cancel=self.cancel)
+
+    def add(self, finding: Finding) -> None:
+        """Record a finding and feed its cost into the deduction."""
+        if self.suppress is not None:
+            with self.timer.phase("filtering"):
+                suppressed = self.suppress(finding.rule, finding.file)
+            if suppressed:
+                self.suppressed += 1
+                return
+        result = self.result
+        if self.keep is None or len(result.findings) < self.keep:
+            result.findings.append(finding)
+        result.rule_counts[finding.rule] = result.rule_counts.get(finding.rule, 0) + 1
+        result.rule_costs[finding.rule] = result.rule_costs.get(finding.rule, 0.0) + finding.cost
+        self.deduction.add(finding.cost)
+        if self.on_finding is not None:
+            self.on_finding(finding)
+
+    def finish(self) -> AnalyzerResult:
+        """Set the capped deduction on the result and return it."""
+        # Once anything is suppressed the remaining costs are summed linearly,
+        # matching how suppressed results have always been rescored.
+        total = self.deduction.raw_total if self.suppressed else self.deduction.total
+        self.result.deduction = min(total, self.max_deduction)
+        self.result.suppressed = self.suppressed
+        return self.result
@@ -3,12 +3,11 @@
 import ast
 import json
 import os
-import shutil
-import subprocess  # nosec B404 — required for running CLI tools
 import sys
+from typing import Callable
 
-from ..rules import BANDIT_SEVERITY_COST, CATEGORIES, AnalyzerResult, Finding
-from ._util import SKIP_DIRS, diminishing_deduction, is_example_file, is_test_file
+from ..rules import BANDIT_SEVERITY_COST, AnalyzerResult, Finding
+from ._util import SKIP_DIRS, FindingSink, find_tool, is_example_file, is_test_file, run_tool, split_by_root
 
 
 def _is_literal_subprocess(finding: dict) -> bool:
@@ -37,18 +36,43 @@ def _is_literal_subprocess(finding: dict) -> bool:
     return False
 
 
-def _build_bandit_cmd(abs_path: str, excludes: str) -> list[str]:
-    """Build the bandit command, preferring the standalone binary."""
-    if shutil.which("bandit"):
-        return ["bandit", "-r", "-f", "json", "-q", "--exclude", excludes, abs_path]
-    return [sys.executable, "-m", "bandit", "-r", "-f", "json", "-q", "--exclude", excludes, abs_path]
+def _excludes(abs_paths: list[str]) -> str:
+    """Bandit --exclude value skipping SKIP_DIRS at any depth under each root.
 
+    Bandit matches a path against each entry both as a glob and as a
+    substring; nested directories need the glob form.
+    """
+    return ",".join(
+        exclude
+        for p in abs_paths
+        for d in sorted(SKIP_DIRS)
+        for exclude in (os.path.join(p, d), os.path.join(p, "*", d, "*"))
+    )
+
+
+def _build_bandit_cmd(abs_path: str | list[str], excludes: str) -> list[str]:
+    """Build the bandit command for one or more roots, preferring the standalone binary."""
+    targets = [abs_path] if isinstance(abs_path, str) else abs_path
+    if find_tool("bandit"):
+        return ["bandit", "-r", "-f", "json", "-q", "--exclude", excludes, *targets]
+    return [sys.executable, "-m", "bandit", "-r", "-f", "json", "-q", "--exclude", excludes, *targets]
+
+
+def fetch_batch(paths: list[str], fix: bool = False) -> dict[str, list[dict]]:
+    """Run bandit once over several roots and split its results by root."""
+    abs_paths = [os.path.abspath(p) for p in paths]
+    proc = run_tool(_build_bandit_cmd(abs_paths, _excludes(abs_paths)))
+    data = json.loads(proc.stdout) if proc.stdout.strip() else {}
+    return split_by_root(data.get("results", []), paths, lambda item: item.get("filename", ""))
 
-def _run_bandit(cmd: list[str], result: AnalyzerResult) -> list[dict] | None:
+
+def _run_bandit(cmd: list[str], sink: FindingSink) -> list[dict] | None:
     """Run bandit and return its result list, or None if it failed."""
+    result = sink.result
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=120)  # nosec B603
-        data = json.loads(proc.stdout) if proc.stdout.strip() else {}
+        proc = sink.run_tool(cmd)
+        with sink.timer.phase("parse"):
+            data = json.loads(proc.stdout) if proc.stdout.strip() else {}
         return data.get("results", [])
     except FileNotFoundError:
         result.error = "bandit not found (skipped)"
@@ -118,20 +142,36 @@ def _items_to_findings(items: list[dict]) -> list[Finding]:
     return findings
 
 
-def analyze(path: str, **_kw) -> AnalyzerResult:
-    """Run bandit security analysis on the project."""
-    result = AnalyzerResult(category="security")
-    max_ded = _kw.get("max_deduction", CATEGORIES["security"]["max_deduction"])
-    abs_path = os.path.abspath(path)
-    excludes = ",".join(os.path.join(abs_path, d) for d in SKIP_DIRS)
-
-    cmd = _build_bandit_cmd(abs_path, excludes)
-    items = _run_bandit(cmd, result)
+def analyze(
+    path: str,
+    items: list[dict] | None = None,
+    files: list[str] | None = None,
+    include: Callable[[str], bool] | None = None,
+    **_kw,
+) -> AnalyzerResult:
+    """Run bandit security analysis on the project.
+
+    *items* are bandit's results for *path* when bandit already ran (see
+    :func:`fetch_batch`); otherwise bandit is run here, over *files* only
+    when given. With *include*, only results for files it accepts are
+    scored.
+    """
+    sink = FindingSink.from_kwargs("security", _kw)
+    if items is None and files is not None and not files:
+        return sink.finish()
     if items is None:
-        return result
-
-    result.findings = _items_to_findings(items)
-    result.deduction = diminishing_deduction(
-        [f.cost for f in result.findings], top_n=5, tail_rate=0.1, cap=max_ded
-    )
-    return result
+        abs_path = os.path.abspath(path)
+        # Bandit applies --exclude to files named on the command line too.
+        targets = abs_path if files is None else [os.path.abspath(f) for f in files if f.endswith(".py")]
+        items = _run_bandit(_build_bandit_cmd(targets, _excludes([abs_path])), sink)
+        if items is None:
+            return sink.result
+
+    with sink.timer.phase("rules"):
+        for finding in _items_to_findings(items):
+            if sink.should_stop:
+                break
+            if include is not None and not include(finding.file):
+                continue
+            sink.add(finding)
+    return sink.finish()
@@ -1,57 +1,91 @@
 """Radon cyclomatic complexity analyzer."""
 
 import json
-import shutil
-import subprocess  # nosec B404 — required for running CLI tools
 import sys
+from typing import Callable
 
-from ..rules import CATEGORIES, AnalyzerResult, Finding
-from ._util import is_example_file, is_test_file
-
-
-def analyze(path: str, **_kw) -> AnalyzerResult:
-    """Analyze cyclomatic complexity using radon."""
-    result = AnalyzerResult(category="complexity")
-    max_ded = _kw.get("max_deduction", CATEGORIES["complexity"]["max_deduction"])
-
-    excludes = ".venv/*,node_modules/*,__pycache__/*,.git/*,.tox/*,tests/*,test/*,scripts/*,docs/*"
-    if shutil.which("radon"):
-        cmd = ["radon", "cc", "-j", "-n", "C", "-e", excludes, path]
-    else:
-        cmd = [sys.executable, "-m", "radon", "cc", "-j", "-n", "C", "-e", excludes, path]
-    try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=120)  # nosec B603
-        data = json.loads(proc.stdout) if proc.stdout.strip() else {}
-    except FileNotFoundError:
-        result.error = "radon not found (skipped)"
-        return result
-    except Exception as e:
-        result.error = str(e)
-        return result
-
-    for filename, funcs in data.items():
-        if is_test_file(filename) or is_example_file(filename):
-            continue
-        for func in funcs:
-            cc = func.get("complexity", 0)
-            name = func.get("name", "?")
-            line = func.get("lineno", 0)
-            if cc > 25:
-                cost = 2
-            elif cc > 15:
-                cost = 1
-            else:
+from ..rules import AnalyzerResult, Finding
+from ._util import FILES_PER_TOOL_RUN, FindingSink, find_tool, is_example_file, is_test_file, run_tool, split_by_root
+
+_EXCLUDES = ".venv/*,node_modules/*,__pycache__/*,.git/*,.tox/*,tests/*,test/*,scripts/*,docs/*"
+
+
+def _radon_cmd(paths: list[str]) -> list[str]:
+    """Build the radon command, preferring the standalone binary."""
+    if find_tool("radon"):
+        return ["radon", "cc", "-j", "-n", "C", "-e", _EXCLUDES, *paths]
+    return [sys.executable, "-m", "radon", "cc", "-j", "-n", "C", "-e", _EXCLUDES, *paths]
+
+
+def _parse(stdout: str) -> dict:
+    return json.loads(stdout) if stdout.strip() else {}
+
+
+def fetch_batch(paths: list[str], fix: bool = False) -> dict[str, dict]:
+    """Run radon once over several roots and split its per-file results by root."""
+    data = _parse(run_tool(_radon_cmd(paths)).stdout)
+    split = split_by_root(data.items(), paths, lambda entry: entry[0])
+    return {root: dict(entries) for root, entries in split.items()}
+
+
+def fetch_files(files: list[str]) -> dict:
+    """Run radon on the Python files among *files* only."""
+    files = [f for f in files if f.endswith(".py")]
+    data = {}
+    for start in range(0, len(files), FILES_PER_TOOL_RUN):
+        data.update(_parse(run_tool(_radon_cmd(files[start:start + FILES_PER_TOOL_RUN])).stdout))
+    return data
+
+
+def analyze(
+    path: str, items: dict | None = None, include: Callable[[str], bool] | None = None, **_kw
+) -> AnalyzerResult:
+    """Analyze cyclomatic complexity using radon.
+
+    *items* is radon's JSON output for *path* when radon already ran (see
+    :func:`fetch_batch`); otherwise radon is run here. With *include*, only
+    results for files it accepts are scored.
+    """
+    sink = FindingSink.from_kwargs("complexity", _kw)
+    result = sink.result
+
+    data = items
+    if data is None:
+        try:
+            proc = sink.run_tool(_radon_cmd([path]))
+            with sink.timer.phase("parse"):
+                data = _parse(proc.stdout)
+        except FileNotFoundError:
+            result.error = "radon not found (skipped)"
+            return result
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+    with sink.timer.phase("rules"):
+        for filename, funcs in data.items():
+            if sink.should_stop:
+                break
+            if is_test_file(filename) or is_example_file(filename):
                 continue
+            if include is not None and not include(filename):
+                continue
+            for func in funcs:
+                cc = func.get("complexity", 0)
+                name = func.get("name", "?")
+                line = func.get("lineno", 0)
+                if cc > 25:
+                    cost = 2
+                elif cc > 15:
+                    cost = 1
+                else:
+                    continue
+
+                sink.add(Finding(
+                    category="complexity",
+                    rule=f"radon/CC{cc}",
+                    message=f"Function '{name}' has complexity {cc}",
+                    file=filename, line=line, cost=cost,
+                ))
 
-            result.findings.append(Finding(
-                category="complexity",
-                rule=f"radon/CC{cc}",
-                message=f"Function '{name}' has complexity {cc}",
-                file=filename, line=line, cost=cost,
-            ))
-
-    # Diminishing returns: top 3 findings at full cost, rest at 10%
-    sorted_costs = sorted((f.cost for f in result.findings), reverse=True)
-    total = sum(c if i < 3 else c * 0.1 for i, c in enumerate(sorted_costs))
-    result.deduction = min(total, max_ded)
-    return result
+    return sink.finish()
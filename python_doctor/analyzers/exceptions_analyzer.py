@@ -2,26 +2,27 @@
 
 import ast
 import os
+from typing import Callable
 
-from ..rules import BARE_EXCEPT_COST, CATEGORIES, SILENT_EXCEPTION_COST, AnalyzerResult, Finding
-from ._util import SKIP_DIRS, is_test_file
+from ..rules import BARE_EXCEPT_COST, SILENT_EXCEPTION_COST, AnalyzerResult, Finding
+from ._util import SKIP_DIRS, FindingSink, is_test_file
 
 
-def _check_bare_except(node: ast.ExceptHandler, fp: str, result: AnalyzerResult) -> None:
+def _check_bare_except(node: ast.ExceptHandler, fp: str, sink: FindingSink) -> None:
     """Flag bare except: clauses without an exception type."""
     if node.type is None:
-        result.findings.append(Finding(
+        sink.add(Finding(
             category="exceptions", rule="exceptions/bare",
             message="Bare except: without exception type",
             file=fp, line=node.lineno, cost=BARE_EXCEPT_COST,
         ))
 
 
-def _check_silent_swallow(node: ast.ExceptHandler, fp: str, result: AnalyzerResult) -> None:
+def _check_silent_swallow(node: ast.ExceptHandler, fp: str, sink: FindingSink) -> None:
     """Flag except Exception: pass patterns."""
     if (isinstance(node.type, ast.Name) and node.type.id == "Exception"
             and len(node.body) == 1 and isinstance(node.body[0], ast.Pass)):
-        result.findings.append(Finding(
+        sink.add(Finding(
             category="exceptions", rule="exceptions/silent",
             message="except Exception: pass (silently swallowed)",
             file=fp, line=node.lineno, cost=SILENT_EXCEPTION_COST,
@@ -80,31 +81,37 @@ def _find_fallback_chains(tree: ast.Module) -> set[int]:
     return suppressed
 
 
-def _check_file(fp: str, result: AnalyzerResult) -> None:
+def _check_file(fp: str, sink: FindingSink) -> None:
     """Analyze exception handlers in a single file."""
+    timer = sink.timer
     try:
-        with open(fp, "r", errors="ignore") as fh:
-            tree = ast.parse(fh.read(), filename=fp)
+        with timer.phase("read"), open(fp, "r", errors="ignore") as fh:
+            source = fh.read()
+        with timer.phase("parse"):
+            tree = ast.parse(source, filename=fp)
     except (SyntaxError, OSError):
         return
 
-    suppressed = _find_fallback_chains(tree)
+    with timer.phase("rules"):
+        suppressed = _find_fallback_chains(tree)
+
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ExceptHandler):
+                continue
+            if node.lineno in suppressed:
+                continue
+            _check_bare_except(node, fp, sink)
+            _check_silent_swallow(node, fp, sink)
 
-    for node in ast.walk(tree):
-        if not isinstance(node, ast.ExceptHandler):
-            continue
-        if node.lineno in suppressed:
-            continue
-        _check_bare_except(node, fp, result)
-        _check_silent_swallow(node, fp, result)
 
+def analyze(path: str, include: Callable[[str], bool] | None = None, **_kw) -> AnalyzerResult:
+    """Analyze exception handling patterns across the project.
 
-def analyze(path: str, **_kw) -> AnalyzerResult:
-    """Analyze exception handling patterns across the project."""
-    result = AnalyzerResult(category="exceptions")
-    max_ded = _kw.get("max_deduction", CATEGORIES["exceptions"]["max_deduction"])
+    With *include*, only the files it accepts are checked.
+    """
+    sink = FindingSink.from_kwargs("exceptions", _kw)
 
-    for root, dirs, files in os.walk(path):
+    for root, dirs, files in sink.timer.iterate("walk", os.walk(path)):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         for f in files:
             if not f.endswith(".py"):
@@ -112,7 +119,11 @@ def analyze(path: str, **_kw) -> AnalyzerResult:
             fp = os.path.join(root, f)
             if is_test_file(fp):
                 continue
-            _check_file(fp, result)
+            if include is not None and not include(fp):
+                continue
+            if sink.should_stop:
+                return sink.finish()
+            with sink.timer.file(fp):
+                _check_file(fp, sink)
 
-    result.deduction = min(sum(f.cost for f in result.findings), max_ded)
-    return result
+    return sink.finish()
@@ -2,8 +2,10 @@
 
 import ast
 import os
+from typing import Callable
 
-from ..rules import CATEGORIES, CIRCULAR_IMPORT_COST, STAR_IMPORT_COST, AnalyzerResult, Finding
+from ..rules import CIRCULAR_IMPORT_COST, STAR_IMPORT_COST, AnalyzerResult, Finding
+from ._util import FindingSink
 
 _SKIP_DIRS = {"__pycache__", ".git", "node_modules", ".venv", "venv", ".tox", ".mypy_cache", ".ruff_cache"}
 
@@ -30,7 +32,7 @@ def _collect_py_files(path: str) -> list[str]:
     return py_files
 
 
-def _check_star_imports(node: ast.ImportFrom, fp: str, result: AnalyzerResult) -> None:
+def _check_star_imports(node: ast.ImportFrom, fp: str, sink: FindingSink) -> None:
     """Flag wildcard imports like 'from X import *'."""
     # Star imports in __init__.py are a standard Python pattern for public API re-exports
     if os.path.basename(fp) == "__init__.py":
@@ -38,47 +40,72 @@ def _check_star_imports(node: ast.ImportFrom, fp: str, result: AnalyzerResult) -
     if node.names:
         for alias in node.names:
             if alias.name == "*":
-                result.findings.append(Finding(
+                sink.add(Finding(
                     category="imports", rule="imports/star",
                     message=f"from {node.module or '?'} import *",
                     file=fp, line=node.lineno, cost=STAR_IMPORT_COST,
                 ))
 
 
-def _process_file_imports(
-    fp: str, path: str, imports_graph: dict[str, set[str]], result: AnalyzerResult
-) -> None:
-    """Parse a single file and update the import graph, flagging star imports."""
+def _process_file_imports(fp: str, path: str, sink: FindingSink) -> list | None:
+    """Parse a single file, flagging star imports.
+
+    Returns ``[module, imported modules]`` for the import graph (module is
+    None outside a package layout), or None if the file cannot be parsed.
+    """
+    timer = sink.timer
     try:
-        with open(fp, "r", errors="ignore") as f:
-            tree = ast.parse(f.read(), filename=fp)
+        with timer.phase("read"), open(fp, "r", errors="ignore") as f:
+            source = f.read()
+        with timer.phase("parse"):
+            tree = ast.parse(source, filename=fp)
     except (SyntaxError, OSError):
-        return
+        return None
 
     mod_name = _get_module_name(fp, path)
-    if mod_name:
-        imports_graph.setdefault(mod_name, set())
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ImportFrom):
-            _check_star_imports(node, fp, result)
-            if mod_name and node.module:
-                imports_graph.setdefault(mod_name, set()).add(node.module)
-        elif isinstance(node, ast.Import):
-            for alias in node.names:
+    deps: set[str] = set()
+    with timer.phase("rules"):
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom):
+                _check_star_imports(node, fp, sink)
+                if mod_name and node.module:
+                    deps.add(node.module)
+            elif isinstance(node, ast.Import):
                 if mod_name:
-                    imports_graph.setdefault(mod_name, set()).add(alias.name)
+                    deps.update(alias.name for alias in node.names)
+    return [mod_name, deps]
 
 
-def _build_import_graph(py_files: list[str], path: str, result: AnalyzerResult) -> dict[str, set[str]]:
-    """Parse all files and build an import dependency graph, flagging star imports."""
-    imports_graph: dict[str, set[str]] = {}
+def _scan_files(
+    py_files: list[str], path: str, sink: FindingSink, include: Callable[[str], bool] | None = None
+) -> dict[str, list]:
+    """Parse all files, flagging star imports; return each file's import-graph entry.
+
+    With *include*, only the files it accepts are parsed.
+    """
+    entries: dict[str, list] = {}
     for fp in py_files:
-        _process_file_imports(fp, path, imports_graph, result)
+        if sink.should_stop:
+            break
+        if include is not None and not include(fp):
+            continue
+        with sink.timer.file(fp):
+            entry = _process_file_imports(fp, path, sink)
+        if entry is not None:
+            entries[fp] = entry
+    return entries
+
+
+def _build_import_graph(entries) -> dict[str, set[str]]:
+    """Build the module dependency graph from per-file ``[module, imports]`` entries."""
+    imports_graph: dict[str, set[str]] = {}
+    for mod_name, deps in entries:
+        if mod_name:
+            imports_graph.setdefault(mod_name, set()).update(deps)
     return imports_graph
 
 
-def _detect_circular_imports(imports_graph: dict[str, set[str]], result: AnalyzerResult) -> None:
+def _detect_circular_imports(imports_graph: dict[str, set[str]], sink: FindingSink) -> None:
     """Detect direct circular imports (A->B and B->A)."""
     seen_cycles: set[tuple[str, str]] = set()
     for mod_a, deps_a in imports_graph.items():
@@ -90,21 +117,44 @@ def _detect_circular_imports(imports_graph: dict[str, set[str]], result: Analyze
                 cycle_key = tuple(sorted([mod_a, dep]))
                 if cycle_key not in seen_cycles:
                     seen_cycles.add(cycle_key)
-                    result.findings.append(Finding(
+                    sink.add(Finding(
                         category="imports", rule="imports/circular",
                         message=f"Circular import: {cycle_key[0]} <-> {cycle_key[1]}",
                         cost=CIRCULAR_IMPORT_COST,
                     ))
 
 
-def analyze(path: str, **_kw) -> AnalyzerResult:
-    """Analyze import hygiene: star imports and circular dependencies."""
-    result = AnalyzerResult(category="imports")
-    max_ded = _kw.get("max_deduction", CATEGORIES["imports"]["max_deduction"])
+def _collect(path: str, sink: FindingSink, include: Callable[[str], bool] | None = None) -> dict:
+    """Parse the files of *path*; star imports go straight to *sink*.
+
+    The facts hold each parsed file's ``[module, imports]`` under ``files``.
+    """
+    with sink.timer.phase("walk"):
+        py_files = _collect_py_files(path)
+    return {"files": _scan_files(py_files, path, sink, include)}
 
-    py_files = _collect_py_files(path)
-    imports_graph = _build_import_graph(py_files, path, result)
-    _detect_circular_imports(imports_graph, result)
 
-    result.deduction = min(sum(f.cost for f in result.findings), max_ded)
-    return result
+def check_facts(facts: dict, sink: FindingSink) -> None:
+    """Run the project-wide checks (circular imports) on collected facts."""
+    if not sink.should_stop:
+        with sink.timer.phase("rules"):
+            _detect_circular_imports(_build_import_graph(facts["files"].values()), sink)
+
+
+def merge_facts(parts: list[dict]) -> dict:
+    """Combine the facts of several disjoint parts of one project."""
+    return {"files": {fp: entry for part in parts for fp, entry in part["files"].items()}}
+
+
+def analyze_shard(path: str, include: Callable[[str], bool] | None = None, **_kw) -> tuple[AnalyzerResult, dict]:
+    """Check the files *include* accepts; return their findings and import-graph facts."""
+    sink = FindingSink.from_kwargs("imports", _kw)
+    facts = _collect(path, sink, include)
+    return sink.finish(), facts
+
+
+def analyze(path: str, include: Callable[[str], bool] | None = None, **_kw) -> AnalyzerResult:
+    """Analyze import hygiene: star imports and circular dependencies."""
+    sink = FindingSink.from_kwargs("imports", _kw)
+    check_facts(_collect(path, sink, include), sink)
+    return sink.finish()
@@ -1,64 +1,104 @@
 """Ruff linter analyzer."""
 
 import json
-import shutil
-import subprocess  # nosec B404 — required for running CLI tools
 import sys
+from typing import Callable
 
-from ..rules import CATEGORIES, RUFF_ERROR_COST, RUFF_WARNING_COST, AnalyzerResult, Finding
-from ._util import diminishing_deduction, is_example_file, is_test_file
-
-
-def analyze(path: str, fix: bool = False, **_kw) -> AnalyzerResult:
-    """Run ruff linting analysis, optionally auto-fixing issues."""
-    result = AnalyzerResult(category="lint")
-    max_ded = _kw.get("max_deduction", CATEGORIES["lint"]["max_deduction"])
-
-    if shutil.which("ruff"):
-        cmd = ["ruff", "check"]
-    else:
-        cmd = [sys.executable, "-m", "ruff", "check"]
-
-    try:
-        if fix:
-            fix_cmd = cmd + ["--fix",
-                 "--exclude", ".venv,node_modules,__pycache__,.git,.tox,docs",
-                 path]
-            subprocess.run(fix_cmd, capture_output=True, text=True, timeout=120)  # nosec B603
-
-        proc = subprocess.run(cmd + ["--output-format", "json",  # nosec B603
-             "--exclude", ".venv,node_modules,__pycache__,.git,.tox,docs",
-             path],
-            capture_output=True, text=True, timeout=120)
-        items = json.loads(proc.stdout) if proc.stdout.strip() else []
-    except FileNotFoundError:
-        result.error = "ruff not found (skipped)"
-        return result
-    except Exception as e:
-        result.error = str(e)
-        return result
-
-    for item in items:
-        code = item.get("code", "?")
-        msg = item.get("message", "")
-        filename = item.get("filename", "")
-        line = item.get("location", {}).get("row", 0)
-
-        # Skip findings in test/example files — they have different quality bar
-        if is_test_file(filename) or is_example_file(filename):
-            continue
-
-        # E/W prefixes are warnings, others are errors
-        is_warning = code.startswith(("W", "D"))
-        cost = RUFF_WARNING_COST if is_warning else RUFF_ERROR_COST
-
-        result.findings.append(Finding(
-            category="lint", rule=f"ruff/{code}", message=msg,
-            file=filename, line=line,
-            severity="warning" if is_warning else "error", cost=cost,
-        ))
-
-    result.deduction = diminishing_deduction(
-        [f.cost for f in result.findings], top_n=5, tail_rate=0.1, cap=max_ded
-    )
-    return result
+from ..rules import RUFF_ERROR_COST, RUFF_WARNING_COST, AnalyzerResult, Finding
+from ._util import FILES_PER_TOOL_RUN, FindingSink, find_tool, is_example_file, is_test_file, run_tool, split_by_root
+
+_EXCLUDES = ".venv,node_modules,__pycache__,.git,.tox,docs"
+
+
+def _ruff_cmd() -> list[str]:
+    """Return the ruff check command, preferring the standalone binary."""
+    if find_tool("ruff"):
+        return ["ruff", "check"]
+    return [sys.executable, "-m", "ruff", "check"]
+
+
+def _fix_cmd(paths: list[str]) -> list[str]:
+    return _ruff_cmd() + ["--fix", "--exclude", _EXCLUDES, *paths]
+
+
+def _check_cmd(paths: list[str]) -> list[str]:
+    return _ruff_cmd() + ["--output-format", "json", "--exclude", _EXCLUDES, *paths]
+
+
+def _parse(stdout: str) -> list[dict]:
+    return json.loads(stdout) if stdout.strip() else []
+
+
+def fetch_batch(paths: list[str], fix: bool = False) -> dict[str, list[dict]]:
+    """Run ruff once over several roots and split its items by root."""
+    if fix:
+        run_tool(_fix_cmd(paths))
+    items = _parse(run_tool(_check_cmd(paths)).stdout)
+    return split_by_root(items, paths, lambda item: item.get("filename", ""))
+
+
+def fetch_files(files: list[str]) -> list[dict]:
+    """Run ruff on *files* only, applying the exclusions a directory run would."""
+    items = []
+    for start in range(0, len(files), FILES_PER_TOOL_RUN):
+        chunk = files[start:start + FILES_PER_TOOL_RUN]
+        items += _parse(run_tool(_check_cmd(["--force-exclude", *chunk])).stdout)
+    return items
+
+
+def analyze(
+    path: str,
+    fix: bool = False,
+    items: list[dict] | None = None,
+    include: Callable[[str], bool] | None = None,
+    **_kw,
+) -> AnalyzerResult:
+    """Run ruff linting analysis, optionally auto-fixing issues.
+
+    *items* are ruff's JSON results for *path* when ruff already ran (see
+    :func:`fetch_batch`); otherwise ruff is run here. With *include*, only
+    results for files it accepts are scored.
+    """
+    sink = FindingSink.from_kwargs("lint", _kw)
+    result = sink.result
+
+    if items is None:
+        try:
+            if fix:
+                sink.run_tool(_fix_cmd([path]))
+            proc = sink.run_tool(_check_cmd([path]))
+            with sink.timer.phase("parse"):
+                items = _parse(proc.stdout)
+        except FileNotFoundError:
+            result.error = "ruff not found (skipped)"
+            return result
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+    with sink.timer.phase("rules"):
+        for item in items:
+            if sink.should_stop:
+                break
+            code = item.get("code", "?")
+            msg = item.get("message", "")
+            filename = item.get("filename", "")
+            line = item.get("location", {}).get("row", 0)
+
+            # Skip findings in test/example files — they have different quality bar
+            if is_test_file(filename) or is_example_file(filename):
+                continue
+            if include is not None and not include(filename):
+                continue
+
+            # E/W prefixes are warnings, others are errors
+            is_warning = code.startswith(("W", "D"))
+            cost = RUFF_WARNING_COST if is_warning else RUFF_ERROR_COST
+
+            sink.add(Finding(
+                category="lint", rule=f"ruff/{code}", message=msg,
+                file=filename, line=line,
+                severity="warning" if is_warning else "error", cost=cost,
+            ))
+
+    return sink.finish()
@@ -2,9 +2,9 @@
 
 import ast
 import os
+from typing import Callable
 
 from ..rules import (
-    CATEGORIES,
     LARGE_FILE_COST,
     LARGE_FILE_THRESHOLD,
     LOW_TEST_RATIO_COST,
@@ -21,38 +21,28 @@ from ..rules import (
     AnalyzerResult,
     Finding,
 )
-from ._util import SKIP_DIRS, is_test_file
+from ._util import SKIP_DIRS, FindingSink, is_test_file
 
 
-def _count_lines(filepath: str) -> int:
-    """Count total lines in a file."""
-    try:
-        with open(filepath, "r", errors="ignore") as f:
-            return sum(1 for _ in f)
-    except OSError:
-        return 0
-
+def _read_counts(source: str) -> tuple[int, int]:
+    """Return (total lines, non-blank non-comment lines) of *source*.
 
-def _count_code_lines(filepath: str) -> int:
-    """Count non-blank, non-comment lines."""
-    count = 0
-    try:
-        with open(filepath, "r", errors="ignore") as f:
-            for line in f:
-                stripped = line.strip()
-                if stripped and not stripped.startswith("#"):
-                    count += 1
-    except OSError:
-        pass
-    return count
+    *source* was read in text mode, so every line ending is ``\\n``.
+    """
+    lines = source.count("\n") + (1 if source and not source.endswith("\n") else 0)
+    code = 0
+    for line in source.split("\n"):
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#"):
+            code += 1
+    return lines, code
 
 
-def _has_type_hints(filepath: str) -> bool:
-    """Check if a file contains any type annotations."""
+def _has_type_hints(source: str, filepath: str) -> bool:
+    """Check if *source* contains any type annotations."""
     try:
-        with open(filepath, "r", errors="ignore") as f:
-            tree = ast.parse(f.read(), filename=filepath)
-    except (SyntaxError, OSError):
+        tree = ast.parse(source, filename=filepath)
+    except SyntaxError:
         return False
 
     for node in ast.walk(tree):
@@ -67,78 +57,103 @@ def _has_type_hints(filepath: str) -> bool:
     return False
 
 
-def _collect_py_files(path: str) -> tuple[list[str], list[str], list[str], bool]:
-    """Walk the project and classify Python files into source and test files."""
-    py_files = []
-    test_files = []
-    source_files = []
-    has_tests = False
-    for root, dirs, files in os.walk(path):
+def _check_large_file(fp: str, lines: int, sink: FindingSink) -> None:
+    """Flag a source file exceeding the line threshold."""
+    if lines > LARGE_FILE_THRESHOLD:
+        sink.add(Finding(
+            category="structure", rule="structure/large-file",
+            message=f"{lines} lines (consider splitting)",
+            file=fp, cost=LARGE_FILE_COST,
+        ))
+
+
+def _file_facts(fp: str, sink: FindingSink) -> list:
+    """Read one file once: flag it if large, return ``[is_test, code_lines, hinted]``."""
+    timer = sink.timer
+    is_test = is_test_file(fp)
+    try:
+        with timer.phase("read"), open(fp, "r", errors="ignore") as f:
+            source = f.read()
+    except OSError:
+        return [is_test, 0, False]
+    with timer.phase("read"):
+        lines, code_lines = _read_counts(source)
+    if not is_test:
+        _check_large_file(fp, lines, sink)
+    with timer.phase("parse"):
+        hinted = _has_type_hints(source, fp)
+    return [is_test, code_lines, hinted]
+
+
+def _collect(path: str, sink: FindingSink, include: Callable[[str], bool] | None = None) -> dict:
+    """Walk the project, checking each Python file, and return the project facts.
+
+    Per-file findings (large files) go straight to *sink*. The returned
+    facts are what the project-wide checks need: ``files`` maps each file
+    to ``[is_test, code_lines, hinted]``, ``test_dir`` whether a
+    tests directory exists and ``project`` the health-file checks. With
+    *include*, only files it accepts are read; the tree facts still cover
+    the whole project.
+    """
+    files: dict[str, list] = {}
+    test_dir = py_typed = False
+    for root, dirs, names in sink.timer.iterate("walk", os.walk(path)):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         if any(d in ("tests", "test") for d in dirs):
-            has_tests = True
-        for f in files:
-            if f.endswith(".py"):
-                fp = os.path.join(root, f)
-                py_files.append(fp)
-                if is_test_file(fp):
-                    has_tests = True
-                    test_files.append(fp)
-                else:
-                    source_files.append(fp)
-    return py_files, test_files, source_files, has_tests
-
-
-def _check_large_files(py_files: list[str], result: AnalyzerResult) -> None:
-    """Flag files exceeding the line threshold."""
-    for fp in py_files:
-        lines = _count_lines(fp)
-        if lines > LARGE_FILE_THRESHOLD:
-            result.findings.append(Finding(
-                category="structure", rule="structure/large-file",
-                message=f"{lines} lines (consider splitting)",
-                file=fp, cost=LARGE_FILE_COST,
-            ))
-
-
-def _check_tests(has_tests: bool, test_files: list[str], source_files: list[str], result: AnalyzerResult) -> None:
+            test_dir = True
+        if "py.typed" in names:
+            py_typed = True
+        for name in names:
+            if not name.endswith(".py"):
+                continue
+            fp = os.path.join(root, name)
+            if include is not None and not include(fp):
+                continue
+            with sink.timer.file(fp):
+                files[fp] = _file_facts(fp, sink)
+    with sink.timer.phase("rules"):
+        project = _project_facts(path, py_typed)
+    return {"files": files, "test_dir": test_dir, "project": project}
+
+
+def _check_tests(files: list[list], test_dir: bool, sink: FindingSink) -> None:
     """Check for test existence and test-to-source ratio."""
-    if not has_tests:
-        result.findings.append(Finding(
+    if not (test_dir or any(is_test for is_test, _, _ in files)):
+        sink.add(Finding(
             category="structure", rule="structure/no-tests",
             message="No tests directory or test files found",
             cost=NO_TESTS_COST,
         ))
         return
 
-    test_lines = sum(_count_code_lines(f) for f in test_files)
-    source_lines = sum(_count_code_lines(f) for f in source_files)
+    test_lines = sum(code for is_test, code, _ in files if is_test)
+    source_lines = sum(code for is_test, code, _ in files if not is_test)
     if source_lines <= 0:
         return
 
     ratio = test_lines / source_lines
     if ratio < 0.1:
-        result.findings.append(Finding(
+        sink.add(Finding(
             category="structure", rule="structure/low-test-ratio",
             message=f"Test-to-source ratio is {ratio:.2f} (very low, <0.1)",
             cost=VERY_LOW_TEST_RATIO_COST,
         ))
     elif ratio < 0.3:
-        result.findings.append(Finding(
+        sink.add(Finding(
             category="structure", rule="structure/low-test-ratio",
             message=f"Test-to-source ratio is {ratio:.2f} (low, <0.3)",
             cost=LOW_TEST_RATIO_COST,
         ))
 
 
-def _check_type_hints(py_files: list[str], result: AnalyzerResult) -> bool:
+def _check_type_hints(files: list[list], sink: FindingSink) -> bool:
     """Check type hint coverage across files. Returns whether type hints are used."""
-    hinted = sum(1 for fp in py_files if _has_type_hints(fp))
+    hinted = sum(1 for _, _, has_hints in files if has_hints)
     uses_type_hints = hinted > 0
-    ratio = hinted / len(py_files) if py_files else 1
+    ratio = hinted / len(files) if files else 1
     if ratio < TYPE_HINT_THRESHOLD:
         pct = int((1 - ratio) * 100)
-        result.findings.append(Finding(
+        sink.add(Finding(
             category="structure", rule="structure/type-hints",
             message=f"No type hints found in {pct}% of files",
             cost=LOW_TYPE_HINTS_COST,
@@ -146,114 +161,105 @@ def _check_type_hints(py_files: list[str], result: AnalyzerResult) -> bool:
     return uses_type_hints
 
 
-def _check_readme(path: str, result: AnalyzerResult) -> None:
-    """Check for README file."""
-    if not any(os.path.isfile(os.path.join(path, n)) for n in ("README.md", "README.rst", "README")):
-        result.findings.append(Finding(
-            category="structure", rule="structure/no-readme",
-            message="No README found", cost=NO_README_COST,
-        ))
+def _has_readme(path: str) -> bool:
+    return any(os.path.isfile(os.path.join(path, n)) for n in ("README.md", "README.rst", "README"))
 
 
-def _check_license(path: str, result: AnalyzerResult) -> None:
-    """Check for LICENSE file."""
-    if not any(os.path.isfile(os.path.join(path, n)) for n in ("LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE")):
-        result.findings.append(Finding(
-            category="structure", rule="structure/no-license",
-            message="No LICENSE file found", cost=NO_LICENSE_COST,
-        ))
+def _has_license(path: str) -> bool:
+    return any(os.path.isfile(os.path.join(path, n)) for n in ("LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE"))
 
 
-def _check_gitignore(path: str, result: AnalyzerResult) -> None:
-    """Check for .gitignore file."""
-    if not os.path.isfile(os.path.join(path, ".gitignore")):
-        result.findings.append(Finding(
-            category="structure", rule="structure/no-gitignore",
-            message="No .gitignore found", cost=NO_GITIGNORE_COST,
-        ))
+def _has_gitignore(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, ".gitignore"))
+
 
+def _file_contains(filepath: str, marker: str) -> bool:
+    """True if *filepath* exists and its text contains *marker*."""
+    if not os.path.isfile(filepath):
+        return False
+    try:
+        with open(filepath) as f:
+            return marker in f.read()
+    except OSError:
+        return False
 
-def _check_linter_config(path: str, result: AnalyzerResult) -> None:
-    """Check for linter configuration."""
+
+def _has_linter_config(path: str) -> bool:
     if os.path.isfile(os.path.join(path, "ruff.toml")):
-        return
-    pyproject = os.path.join(path, "pyproject.toml")
-    if os.path.isfile(pyproject):
-        try:
-            with open(pyproject) as f:
-                if "[tool.ruff]" in f.read():
-                    return
-        except OSError:
-            pass
-    setup_cfg = os.path.join(path, "setup.cfg")
-    if os.path.isfile(setup_cfg):
-        try:
-            with open(setup_cfg) as f:
-                if "[flake8]" in f.read():
-                    return
-        except OSError:
-            pass
-    result.findings.append(Finding(
-        category="structure", rule="structure/no-linter-config",
-        message="No linter configuration found", cost=NO_LINTER_CONFIG_COST,
-    ))
-
-
-def _check_type_checker_config(path: str, result: AnalyzerResult) -> None:
-    """Check for type checker configuration."""
+        return True
+    return (_file_contains(os.path.join(path, "pyproject.toml"), "[tool.ruff]")
+            or _file_contains(os.path.join(path, "setup.cfg"), "[flake8]"))
+
+
+def _has_type_checker_config(path: str) -> bool:
     if any(os.path.isfile(os.path.join(path, n)) for n in ("mypy.ini", "pyrightconfig.json", ".mypy.ini")):
-        return
-    pyproject = os.path.join(path, "pyproject.toml")
-    if os.path.isfile(pyproject):
-        try:
-            with open(pyproject) as f:
-                if "[tool.mypy]" in f.read():
-                    return
-        except OSError:
-            pass
-    result.findings.append(Finding(
-        category="structure", rule="structure/no-type-checker",
-        message="No type checker configuration found", cost=NO_TYPE_CHECKER_COST,
-    ))
-
-
-def _check_py_typed(path: str, uses_type_hints: bool, result: AnalyzerResult) -> None:
-    """Check for py.typed marker file when type hints are used."""
-    if not uses_type_hints:
-        return
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        if "py.typed" in files:
-            return
-    result.findings.append(Finding(
-        category="structure", rule="structure/no-py-typed",
-        message="Type hints used but no py.typed marker found", cost=NO_PY_TYPED_COST,
-    ))
+        return True
+    return _file_contains(os.path.join(path, "pyproject.toml"), "[tool.mypy]")
 
 
-def _check_project_health(path: str, result: AnalyzerResult, uses_type_hints: bool) -> None:
-    """Check for README, LICENSE, .gitignore, linter config, type checker config."""
-    _check_readme(path, result)
-    _check_license(path, result)
-    _check_gitignore(path, result)
-    _check_linter_config(path, result)
-    _check_type_checker_config(path, result)
-    _check_py_typed(path, uses_type_hints, result)
+# Project health checks: (fact, rule, message, cost), flagged when the fact is false.
+_HEALTH_CHECKS = (
+    ("readme", "structure/no-readme", "No README found", NO_README_COST),
+    ("license", "structure/no-license", "No LICENSE file found", NO_LICENSE_COST),
+    ("gitignore", "structure/no-gitignore", "No .gitignore found", NO_GITIGNORE_COST),
+    ("linter_config", "structure/no-linter-config", "No linter configuration found", NO_LINTER_CONFIG_COST),
+    ("type_checker", "structure/no-type-checker", "No type checker configuration found", NO_TYPE_CHECKER_COST),
+)
 
 
-def analyze(path: str, **_kw) -> AnalyzerResult:
-    """Analyze project structure: file sizes, tests, type hints, and project health."""
-    result = AnalyzerResult(category="structure")
-    max_ded = _kw.get("max_deduction", CATEGORIES["structure"]["max_deduction"])
+def _project_facts(path: str, py_typed: bool) -> dict[str, bool]:
+    """Which project health files and settings exist under *path*."""
+    return {
+        "readme": _has_readme(path),
+        "license": _has_license(path),
+        "gitignore": _has_gitignore(path),
+        "linter_config": _has_linter_config(path),
+        "type_checker": _has_type_checker_config(path),
+        "py_typed": py_typed,
+    }
+
+
+def _check_project_health(project: dict[str, bool], uses_type_hints: bool, sink: FindingSink) -> None:
+    """Check for README, LICENSE, .gitignore, linter/type checker config and py.typed."""
+    for fact, rule, message, cost in _HEALTH_CHECKS:
+        if not project[fact]:
+            sink.add(Finding(category="structure", rule=rule, message=message, cost=cost))
+    if uses_type_hints and not project["py_typed"]:
+        sink.add(Finding(
+            category="structure", rule="structure/no-py-typed",
+            message="Type hints used but no py.typed marker found", cost=NO_PY_TYPED_COST,
+        ))
+
+
+def check_facts(facts: dict, sink: FindingSink) -> None:
+    """Run the project-wide checks (tests, type hints, health) on collected facts."""
+    files = list(facts["files"].values())
+    if not files:
+        return
+    with sink.timer.phase("rules"):
+        _check_tests(files, facts["test_dir"], sink)
+        uses_type_hints = _check_type_hints(files, sink)
+        _check_project_health(facts["project"], uses_type_hints, sink)
 
-    py_files, test_files, source_files, has_tests = _collect_py_files(path)
-    if not py_files:
-        return result
 
-    _check_large_files(source_files, result)
-    _check_tests(has_tests, test_files, source_files, result)
-    uses_type_hints = _check_type_hints(py_files, result)
-    _check_project_health(path, result, uses_type_hints)
+def merge_facts(parts: list[dict]) -> dict:
+    """Combine the facts of several disjoint parts of one project."""
+    return {
+        "files": {fp: entry for part in parts for fp, entry in part["files"].items()},
+        "test_dir": any(part["test_dir"] for part in parts),
+        "project": parts[0]["project"] if parts else {},
+    }
 
-    result.deduction = min(sum(f.cost for f in result.findings), max_ded)
-    return result
+
+def analyze_shard(path: str, include: Callable[[str], bool] | None = None, **_kw) -> tuple[AnalyzerResult, dict]:
+    """Check the files *include* accepts; return their findings and the project facts."""
+    sink = FindingSink.from_kwargs("structure", _kw)
+    facts = _collect(path, sink, include)
+    return sink.finish(), facts
+
+
+def analyze(path: str, include: Callable[[str], bool] | None = None, **_kw) -> AnalyzerResult:
+    """Analyze project structure: file sizes, tests, type hints, and project health."""
+    sink = FindingSink.from_kwargs("structure", _kw)
+    check_facts(_collect(path, sink, include), sink)
+    return sink.finish()
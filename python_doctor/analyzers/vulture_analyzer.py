@@ -0,0 +1,64 @@
+"""Vulture dead-code analyzer, run at ``--level deep``; its findings count toward lint."""
+
+import os
+import re
+import sys
+from typing import Callable
+
+from ..rules import DEAD_CODE_CERTAIN_COST, DEAD_CODE_LIKELY_COST, AnalyzerResult, Finding
+from ._util import SKIP_DIRS, FindingSink, find_tool, is_example_file, is_test_file
+
+# Below this vulture mostly reports names used dynamically (plugins, hooks).
+MIN_CONFIDENCE = 60
+
+# "path:line: unused function 'name' (60% confidence)"
+_LINE = re.compile(r"^(?P<file>.+?):(?P<line>\d+): (?P<message>.+?) \((?P<confidence>\d+)% confidence\)")
+
+
+def _vulture_cmd(path: str) -> list[str]:
+    """Build the vulture command, preferring the standalone binary."""
+    exclude = ",".join(sorted(SKIP_DIRS))
+    args = ["--min-confidence", str(MIN_CONFIDENCE), "--exclude", exclude, path]
+    if find_tool("vulture"):
+        return ["vulture", *args]
+    return [sys.executable, "-m", "vulture", *args]
+
+
+def analyze(path: str, include: Callable[[str], bool] | None = None, **_kw) -> AnalyzerResult:
+    """Report unused and unreachable code found by vulture.
+
+    The result is a lint result; the runner merges it into ruff's.
+    """
+    sink = FindingSink.from_kwargs("lint", _kw)
+    try:
+        proc = sink.run_tool(_vulture_cmd(path))
+    except FileNotFoundError:
+        sink.result.error = "vulture not found (skipped)"
+        return sink.result
+    except Exception as e:
+        sink.result.error = str(e)
+        return sink.result
+    if proc.returncode not in (0, 3) and not proc.stdout:
+        sink.result.error = (proc.stderr.strip().splitlines() or ["vulture failed"])[-1]
+        return sink.result
+
+    with sink.timer.phase("rules"):
+        for raw in proc.stdout.splitlines():
+            if sink.should_stop:
+                break
+            match = _LINE.match(raw)
+            if match is None:
+                continue
+            # vulture prints paths relative to the working directory when it can.
+            filename = os.path.abspath(match["file"])
+            if is_test_file(filename) or is_example_file(filename):
+                continue
+            if include is not None and not include(filename):
+                continue
+            certain = int(match["confidence"]) >= 100
+            sink.add(Finding(
+                category="lint", rule="vulture/" + "-".join(match["message"].split()[:2]), message=match["message"],
+                file=filename, line=int(match["line"]), severity="warning",
+                cost=DEAD_CODE_CERTAIN_COST if certain else DEAD_CODE_LIKELY_COST,
+            ))
+    return sink.finish()
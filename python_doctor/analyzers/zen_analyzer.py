@@ -2,13 +2,13 @@
 
 import ast
 import os
+from typing import Callable
 
 from ..rules import (
-    CATEGORIES,
     AnalyzerResult,
     Finding,
 )
-from ._util import SKIP_DIRS, is_example_file, is_test_file
+from ._util import SKIP_DIRS, FindingSink, is_example_file, is_test_file
 
 # Costs
 DEEP_NESTING_COST = 1
@@ -53,7 +53,7 @@ def _function_lines(node: ast.FunctionDef | ast.AsyncFunctionDef) -> int:
     return last - first + 1
 
 
-def _check_functions(tree: ast.Module, fp: str, result: AnalyzerResult) -> None:
+def _check_functions(tree: ast.Module, fp: str, sink: FindingSink) -> None:
     """Check functions for deep nesting, excessive length, and too many parameters."""
     for node in ast.walk(tree):
         if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
@@ -63,7 +63,7 @@ def _check_functions(tree: ast.Module, fp: str, result: AnalyzerResult) -> None:
 
         depth = _nesting_depth(node)
         if depth > NESTING_THRESHOLD:
-            result.findings.append(Finding(
+            sink.add(Finding(
                 category="zen", rule="zen/deep-nesting",
                 message=f"Function '{name}' has nesting depth {depth} (max {NESTING_THRESHOLD})",
                 file=fp, line=node.lineno, cost=DEEP_NESTING_COST,
@@ -71,7 +71,7 @@ def _check_functions(tree: ast.Module, fp: str, result: AnalyzerResult) -> None:
 
         lines = _function_lines(node)
         if lines > LONG_FUNCTION_LINES:
-            result.findings.append(Finding(
+            sink.add(Finding(
                 category="zen", rule="zen/long-function",
                 message=f"Function '{name}' is {lines} lines (max {LONG_FUNCTION_LINES})",
                 file=fp, line=node.lineno, cost=LONG_FUNCTION_COST,
@@ -87,14 +87,14 @@ def _check_functions(tree: ast.Module, fp: str, result: AnalyzerResult) -> None:
             nparams -= 1
         # Skip constructors — they naturally have many params in frameworks
         if nparams > MANY_PARAMS_THRESHOLD and name not in ("__init__", "__init_subclass__"):
-            result.findings.append(Finding(
+            sink.add(Finding(
                 category="zen", rule="zen/too-many-params",
                 message=f"Function '{name}' has {nparams} parameters (max {MANY_PARAMS_THRESHOLD})",
                 file=fp, line=node.lineno, cost=MANY_PARAMS_COST,
             ))
 
 
-def _check_classes(tree: ast.Module, fp: str, result: AnalyzerResult) -> None:
+def _check_classes(tree: ast.Module, fp: str, sink: FindingSink) -> None:
     """Check classes for too many methods."""
     for node in ast.walk(tree):
         if not isinstance(node, ast.ClassDef):
@@ -104,14 +104,14 @@ def _check_classes(tree: ast.Module, fp: str, result: AnalyzerResult) -> None:
             if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
         ]
         if len(methods) > LARGE_CLASS_METHODS:
-            result.findings.append(Finding(
+            sink.add(Finding(
                 category="zen", rule="zen/large-class",
                 message=f"Class '{node.name}' has {len(methods)} methods (max {LARGE_CLASS_METHODS})",
                 file=fp, line=node.lineno, cost=LARGE_CLASS_COST,
             ))
 
 
-def _check_dense_lines(source: str, fp: str, result: AnalyzerResult) -> None:
+def _check_dense_lines(source: str, fp: str, sink: FindingSink) -> None:
     """Check for lines with multiple semicolon-separated statements."""
     for lineno, line in enumerate(source.splitlines(), 1):
         stripped = line.strip()
@@ -122,33 +122,38 @@ def _check_dense_lines(source: str, fp: str, result: AnalyzerResult) -> None:
             continue
         # Count semicolons outside of strings (simple heuristic)
         if stripped.count(";") >= DENSE_STATEMENTS_THRESHOLD:
-            result.findings.append(Finding(
+            sink.add(Finding(
                 category="zen", rule="zen/dense-code",
                 message="Multiple statements on one line",
                 file=fp, line=lineno, cost=DENSE_LINE_COST,
             ))
 
 
-def _check_file(fp: str, result: AnalyzerResult) -> None:
+def _check_file(fp: str, sink: FindingSink) -> None:
     """Analyze a single file for Zen of Python violations."""
+    timer = sink.timer
     try:
-        with open(fp, "r", errors="ignore") as fh:
+        with timer.phase("read"), open(fp, "r", errors="ignore") as fh:
             source = fh.read()
-        tree = ast.parse(source, filename=fp)
+        with timer.phase("parse"):
+            tree = ast.parse(source, filename=fp)
     except (SyntaxError, OSError):
         return
 
-    _check_functions(tree, fp, result)
-    _check_classes(tree, fp, result)
-    _check_dense_lines(source, fp, result)
+    with timer.phase("rules"):
+        _check_functions(tree, fp, sink)
+        _check_classes(tree, fp, sink)
+        _check_dense_lines(source, fp, sink)
 
 
-def analyze(path: str, **_kw) -> AnalyzerResult:
-    """Analyze the project for Zen of Python violations."""
-    result = AnalyzerResult(category="zen")
-    max_ded = _kw.get("max_deduction", CATEGORIES["zen"]["max_deduction"])
+def analyze(path: str, include: Callable[[str], bool] | None = None, **_kw) -> AnalyzerResult:
+    """Analyze the project for Zen of Python violations.
 
-    for root, dirs, files in os.walk(path):
+    With *include*, only the files it accepts are checked.
+    """
+    sink = FindingSink.from_kwargs("zen", _kw)
+
+    for root, dirs, files in sink.timer.iterate("walk", os.walk(path)):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         for f in files:
             if not f.endswith(".py"):
@@ -156,10 +161,11 @@ def analyze(path: str, **_kw) -> AnalyzerResult:
             fp = os.path.join(root, f)
             if is_test_file(fp) or is_example_file(fp):
                 continue
-            _check_file(fp, result)
+            if include is not None and not include(fp):
+                continue
+            if sink.should_stop:
+                return sink.finish()
+            with sink.timer.file(fp):
+                _check_file(fp, sink)
 
-    # Diminishing returns: top 3 findings at full cost, rest at 10%
-    sorted_costs = sorted((f.cost for f in result.findings), reverse=True)
-    total = sum(c if i < 3 else c * 0.1 for i, c in enumerate(sorted_costs))
-    result.deduction = min(total, max_ded)
-    return result
+    return sink.finish()
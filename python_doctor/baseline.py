@@ -0,0 +1,129 @@
+"""Findings baseline: accept a project's existing findings and score only new ones.
+
+``--update-baseline`` writes one fingerprint per finding to
+``.python-doctor/baseline``; ``--baseline`` drops every finding whose
+fingerprint is in the file and rescores each category on what is left, so
+``--min-score`` and ``--strict`` gate on new findings only. A fingerprint
+hashes the rule, the file relative to the project root and the finding's
+source line with whitespace collapsed, so it survives code moving up or
+down; findings without a line use their message with digits masked.
+Identical lines in one file share a fingerprint, so the baseline holds it
+once per finding and each one accepts as many findings as it was written for.
+"""
+
+import hashlib
+import os
+import re
+from collections import Counter
+
+from .rules import AnalyzerResult, Finding
+from .state import STATE_DIR
+
+BASELINE_FILE = "baseline"
+_HEADER = "# python-doctor baseline v1"
+_DIGITS = re.compile(r"\d+")
+
+
+def default_baseline_path(path: str) -> str:
+    return os.path.join(path, STATE_DIR, BASELINE_FILE)
+
+
+class _Snippets:
+    """Normalized source lines, reading each file once."""
+
+    def __init__(self):
+        self._files: dict[str, list[str]] = {}
+
+    def line(self, file: str, line: int) -> str | None:
+        lines = self._files.get(file)
+        if lines is None:
+            try:
+                with open(file, encoding="utf-8", errors="replace") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                lines = []
+            self._files[file] = lines
+        if 0 < line <= len(lines):
+            return " ".join(lines[line - 1].split())
+        return None
+
+
+def _fingerprints(path: str, results: list[AnalyzerResult]):
+    """Yield ``(result index, finding, fingerprint)`` for every kept finding."""
+    snippets = _Snippets()
+    for i, r in enumerate(results):
+        for f in r.findings:
+            rel = os.path.relpath(f.file, path).replace(os.sep, "/") if f.file else ""
+            snippet = snippets.line(f.file, f.line) if f.file else None
+            if snippet is None:
+                snippet = "#" + _DIGITS.sub("#", f.message)
+            digest = hashlib.blake2b(f"{f.rule}\0{rel}\0{snippet}".encode(), digest_size=8).hexdigest()
+            yield i, f, digest
+
+
+def load_baseline(file: str) -> Counter:
+    """Fingerprint -> number of findings it accepts. Raises OSError if *file* cannot be read."""
+    with open(file, encoding="utf-8") as f:
+        return Counter(line.strip() for line in f if line.strip() and not line.startswith("#"))
+
+
+def write_baseline(file: str, path: str, results: list[AnalyzerResult]) -> int:
+    """Write the fingerprints of every finding in *results*; return how many were written."""
+    prints = sorted(digest for _i, _f, digest in _fingerprints(path, results))
+    os.makedirs(os.path.dirname(os.path.abspath(file)), exist_ok=True)
+    with open(file, "w", encoding="utf-8") as f:
+        f.write("\n".join([_HEADER, *prints]) + "\n")
+    return len(prints)
+
+
+class BaselineReport:
+    """How the baseline split a scan's findings, as a JSON key or a summary line."""
+
+    key = "baseline"
+
+    def __init__(self, file: str, known: int, new: int, fixed: int):
+        self.file = file
+        self.known = known
+        self.new = new
+        self.fixed = fixed
+
+    def to_dict(self, root: str) -> dict:
+        return {"file": self.file, "known": self.known, "new": self.new, "fixed": self.fixed}
+
+    def format_table(self, root: str) -> str:
+        lines = [f"🧾 Baseline: {self.new} new findings scored, {self.known} known findings ignored"]
+        if self.fixed:
+            lines.append(f"  {self.fixed} baselined findings are gone; --update-baseline drops them")
+        return "\n".join(lines)
+
+
+def apply_baseline(
+    path: str, results: list[AnalyzerResult], baseline: Counter, caps: dict[str, float], file: str = ""
+) -> tuple[list[AnalyzerResult], BaselineReport]:
+    """Drop the findings *baseline* accepts and rescore each category on the rest.
+
+    *results* must hold every finding (``keep=None``). Each category is
+    rescored under its cap in *caps*, as if the new findings were all the
+    analyzer had found.
+    """
+    from .registry import rescore
+
+    remaining = Counter(baseline)
+    new: list[list[Finding]] = [[] for _ in results]
+    known = 0
+    for i, finding, digest in _fingerprints(path, results):
+        if remaining[digest] > 0:
+            remaining[digest] -= 1
+            known += 1
+        else:
+            new[i].append(finding)
+    out = []
+    for r, findings in zip(results, new):
+        if len(findings) == len(r.findings):
+            out.append(r)
+            continue
+        scored = rescore(r.category, caps[r.category], None, findings, suppressed=r.suppressed)
+        scored.error = r.error
+        out.append(scored)
+    report = BaselineReport(file, known, sum(map(len, new)), sum(remaining.values()))
+    return out, report
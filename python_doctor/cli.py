@@ -1,39 +1,35 @@
 """Main CLI entry point for Python Doctor."""
 
 import argparse
-import concurrent.futures
-import fnmatch
-import json
 import os
 import sys
 
 from . import __version__
-from .analyzers import (
-    bandit_analyzer,
-    complexity,
-    exceptions_analyzer,
-    imports_analyzer,
-    ruff_analyzer,
-    structure,
-    zen_analyzer,
+from .commands import COMMANDS
+from .commands import run as run_command
+from .output import (
+    MAX_FINDINGS_DISPLAY,
+    build_json_output,
+    compute_exit_code,
+    emit_output,
+    open_output,
+    print_badge,
+    print_report,
 )
-from .config import load_config
-from .profile import detect_profile, profile_for_kind
-from .rules import CATEGORIES
-from .scorer import category_score, compute_score, score_label
-from .state import compute_delta, load_state, save_state
-
-ANALYZERS = [
-    ("security", bandit_analyzer),
-    ("lint", ruff_analyzer),
-    ("complexity", complexity),
-    ("structure", structure),
-    ("imports", imports_analyzer),
-    ("exceptions", exceptions_analyzer),
-    ("zen", zen_analyzer),
-]
-
-MAX_FINDINGS_DISPLAY = 5
+
+# Everything needed only for scanning is imported inside the functions that
+# use it, so --version, --ci, --pre-commit and --help start fast.
+_RUNNER_EXPORTS = frozenset({"ANALYZERS", "run_analyzers", "run_gate"})
+
+
+def __getattr__(name: str):
+    """Lazily re-export the scan entry points that used to live here."""
+    if name in _RUNNER_EXPORTS:
+        from . import runner
+
+        return getattr(runner, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 BADGE_CI_WORKFLOW = """\
 name: Python Doctor
@@ -93,156 +89,6 @@ jobs:
 """
 
 
-def run_analyzers(path: str, fix: bool = False, profile_name: str | None = None):
-    """Run all analyzers on the given path and return results.
-
-    Analyzers run in parallel via a ThreadPoolExecutor (each one is I/O bound:
-    bandit/ruff/radon shell out, others walk AST/filesystem). Results are
-    returned in the same order as ``ANALYZERS`` so output stays deterministic.
-    """
-    config = load_config(path)
-
-    # Determine profile: CLI flag > config file > auto-detect
-    if profile_name:
-        profile = profile_for_kind(profile_name)
-    elif config.profile_override:
-        profile = profile_for_kind(config.profile_override)
-    else:
-        profile = detect_profile(path)
-
-    # Merge overrides (config wins over profile defaults)
-    merged_max_deduction = {**profile.max_deduction_overrides, **config.max_deduction_overrides}
-    merged_suppressed = profile.suppressed_rules | config.suppress_rules
-
-    def _run_one(cat_name, mod):
-        kwargs = {"path": path}
-        if cat_name == "lint":
-            kwargs["fix"] = fix
-        if cat_name in merged_max_deduction:
-            kwargs["max_deduction"] = merged_max_deduction[cat_name]
-        result = mod.analyze(**kwargs)
-
-        # Filter findings matching suppressed rules (global and per-file)
-        original_findings = result.findings
-        if merged_suppressed or config.per_file_suppress:
-            result.findings = [
-                f for f in original_findings
-                if not (
-                    (merged_suppressed and f.rule in merged_suppressed)
-                    or (
-                        f.file
-                        and config.per_file_suppress
-                        and any(
-                            fnmatch.fnmatch(os.path.relpath(f.file, path), pat)
-                            and f.rule in rules
-                            for pat, rules in config.per_file_suppress.items()
-                        )
-                    )
-                )
-            ]
-            if len(result.findings) != len(original_findings):
-                max_ded = kwargs.get("max_deduction", CATEGORIES[cat_name]["max_deduction"])
-                result.deduction = min(sum(f.cost for f in result.findings), max_ded)
-
-        return result
-
-    max_workers = min(len(ANALYZERS), os.cpu_count() or 4)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # executor.map preserves input ordering, so results match ANALYZERS order.
-        results = list(executor.map(lambda pair: _run_one(*pair), ANALYZERS))
-    return results
-
-
-def format_finding(f, path: str) -> str:
-    """Format a single finding for display."""
-    rel = os.path.relpath(f.file, path) if f.file else ""
-    loc = f"{rel}:{f.line}" if f.line else rel
-    icon = "⚠" if f.severity in ("warning", "low", "medium") else "✗"
-    return f"  {icon} {f.rule}: {f.message}" + (f" ({loc})" if loc else "")
-
-
-def _format_delta_suffix(delta: dict | None) -> str:
-    """Return ASCII suffix for the score header, e.g. '  [+3 from last run]'."""
-    if not delta or not delta.get("has_previous"):
-        return ""
-    total = delta["total_delta"]
-    if total > 0:
-        body = f"+{total} from last run"
-    elif total < 0:
-        body = f"{total} from last run"
-    else:
-        body = "no change"
-    return f"  [{body}]"
-
-
-def print_report(results, path: str, verbose: bool = False, delta: dict | None = None):
-    """Print the full health report to stdout."""
-    print(f"\n🐍 Python Doctor v{__version__}")
-    print(f"Scanning: {path}\n")
-
-    score = compute_score(results)
-    label = score_label(score)
-    suffix = _format_delta_suffix(delta)
-    print(f"📊 Score: {score}/100 ({label}){suffix}\n")
-
-    for result in results:
-        cat = CATEGORIES[result.category]
-        cat_sc = category_score(result)
-        emoji = cat["emoji"]
-        name = cat["label"]
-        max_d = cat["max_deduction"]
-
-        if result.error:
-            print(f"{emoji} {name} — ⚠ {result.error}")
-            continue
-
-        check = " ✓" if not result.findings else ""
-        print(f"{emoji} {name} ({cat_sc}/{max_d}){check}")
-
-        if not result.findings:
-            print("  ✓ All clear.")
-        else:
-            limit = None if verbose else MAX_FINDINGS_DISPLAY
-            shown = result.findings[:limit]
-            for f in shown:
-                print(format_finding(f, path))
-            remaining = len(result.findings) - len(shown)
-            if remaining > 0:
-                print(f"  ... and {remaining} more")
-        print()
-
-    if delta and delta.get("has_previous") and delta.get("total_delta", 0) < 0:
-        top = delta.get("top_regression")
-        if top:
-            cat_name, drop = top
-            label = CATEGORIES.get(cat_name, {}).get("label", cat_name)
-            points = abs(drop)
-            word = "point" if points == 1 else "points"
-            print(f"Regression: {label} dropped {points} {word}.")
-            print()
-
-
-def _badge_color(score: int) -> str:
-    """Return shields.io color for a given score."""
-    if score >= 90:
-        return "brightgreen"
-    if score >= 75:
-        return "green"
-    if score >= 50:
-        return "yellow"
-    return "red"
-
-
-def _print_badge(score: int):
-    """Print a shields.io badge markdown snippet."""
-    color = _badge_color(score)
-    encoded = f"{score}%2F100"
-    url = f"https://img.shields.io/badge/python--doctor-{encoded}-{color}"
-    print(f"[![python-doctor]({url})](https://github.com/saikatkumardey/python-doctor)")
-    print()
-    print("Add this to your README.md. To auto-update the score on every push,")
-    print("run: python-doctor --ci > .github/workflows/python-doctor.yml")
-
 
 def _install_pre_commit_hook(min_score: int | None = None):
     """Install python-doctor as a git pre-commit hook."""
@@ -316,16 +162,117 @@ def _find_git_dir() -> str | None:
         path = parent
 
 
+def _shard_spec(value: str) -> tuple[int, int]:
+    """Parse ``--shard I/N`` into (I, N), with 1 <= I <= N."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got '{value}'") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {index} is not in 1..{count}")
+    return index, count
+
+
+def _fraction(value: str) -> float:
+    """Parse a ``--sample`` fraction in (0, 1]."""
+    try:
+        fraction = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number, got '{value}'") from None
+    if not 0 < fraction <= 1:
+        raise argparse.ArgumentTypeError(f"{value} is not in (0, 1]")
+    return fraction
+
+
 def _build_parser() -> argparse.ArgumentParser:
     """Construct the argparse parser. Split out of main() to keep it small."""
     parser = argparse.ArgumentParser(
         prog="python-doctor",
         description="Scan Python codebases and get a 0-100 health score.",
     )
-    parser.add_argument("path", nargs="?", default=".", help="Directory to scan")
+    _add_target_arguments(parser)
+    _add_output_arguments(parser)
+    _add_action_arguments(parser)
+    _add_gate_arguments(parser)
+    _add_diagnostic_arguments(parser)
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    return parser
+
+
+def _add_target_arguments(parser: argparse.ArgumentParser) -> None:
+    """Where and how much to scan: the paths, per-root, shard, sample and level options."""
+    parser.add_argument(
+        "path", nargs="*", default=["."], help="Directory to scan (several with --per-root)"
+    )
+    parser.add_argument(
+        "--per-root",
+        action="store_true",
+        help="Scan each PATH as its own project in one run; report per-root scores and an aggregate.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard_spec,
+        metavar="I/N",
+        default=None,
+        help="Scan only shard I of N and write partial results (combine them with 'python-doctor merge').",
+    )
+    parser.add_argument(
+        "--sample",
+        type=_fraction,
+        metavar="FRACTION",
+        default=None,
+        help="Estimate the score from a stratified random FRACTION of the files, with a confidence interval.",
+    )
+    parser.add_argument(
+        "--sample-files",
+        type=int,
+        metavar="N",
+        default=None,
+        help="Like --sample, drawing about N files.",
+    )
+    parser.add_argument(
+        "--level",
+        choices=["quick", "standard", "deep"],
+        default=None,
+        help=(
+            "quick: in-process analyzers only, reusing the last full scan's tool results; "
+            "standard (default): every analyzer; deep: also dead-code detection with vulture."
+        ),
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        default=None,
+        help="Pick the most thorough level (up to --level, default standard) predicted to finish in SECONDS.",
+    )
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    """What to print and where."""
     parser.add_argument("--verbose", "-v", action="store_true", help="Show all findings")
     parser.add_argument("--score", action="store_true", help="Output only the score number")
-    parser.add_argument("--json", dest="json_out", action="store_true", help="JSON output")
+    parser.add_argument("--json", dest="format", action="store_const", const="json", help="JSON output")
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "ndjson", "compact"],
+        default="text",
+        help=(
+            "Output format. ndjson streams one line per finding and category as analyzers finish; "
+            "compact is JSON with shared rule and file-path tables."
+        ),
+    )
+    parser.add_argument("--compact", action="store_true", help="Write JSON without indentation")
+    parser.add_argument(
+        "--output", "-o",
+        metavar="FILE",
+        default=None,
+        help="Write json/ndjson/compact output to FILE instead of stdout",
+    )
+
+
+def _add_action_arguments(parser: argparse.ArgumentParser) -> None:
+    """Fixing, profile override, and the badge / CI / pre-commit helpers."""
     parser.add_argument("--fix", action="store_true", help="Auto-fix what's possible (ruff --fix)")
     parser.add_argument(
         "--profile",
@@ -336,86 +283,176 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--badge", action="store_true", help="Output a shields.io badge for your README")
     parser.add_argument("--ci", action="store_true", help="Output a GitHub Actions workflow for the badge")
     parser.add_argument("--pre-commit", action="store_true", help="Install as a git pre-commit hook")
+
+
+def _add_gate_arguments(parser: argparse.ArgumentParser) -> None:
+    """Pass/fail thresholds, the baseline and the state cache that deltas compare against."""
     parser.add_argument(
         "--min-score",
         type=int,
         default=None,
         help="Minimum score threshold (exit 1 if below). Default: 50",
     )
+    parser.add_argument(
+        "--gate",
+        action="store_true",
+        help="Only decide pass/fail against --min-score; stop as soon as the outcome is known.",
+    )
     parser.add_argument(
         "--strict",
         action="store_true",
         help="Exit 2 if score regressed vs cached state (for CI).",
     )
+    parser.add_argument(
+        "--baseline",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="Ignore findings fingerprinted in FILE (default: .python-doctor/baseline) and score only new ones.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the fingerprints of every current finding to the baseline file and exit.",
+    )
     parser.add_argument(
         "--no-cache",
         action="store_true",
         help="Skip reading/writing the .python-doctor/state.json cache.",
     )
-    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
-    return parser
+    parser.add_argument(
+        "--rolling",
+        type=int,
+        metavar="N",
+        default=None,
+        help="Compare against the median of the last N logged runs instead of the previous run.",
+    )
 
 
-def _build_json_output(results, path: str, score: int, delta: dict) -> dict:
-    """Build the JSON output payload. Returns a dict ready for json.dumps."""
-    output = {
-        "version": __version__,
-        "path": path,
-        "score": score,
-        "label": score_label(score),
-        "categories": {},
-        "delta": {
-            "total": delta["total_delta"],
-            "categories": delta["category_deltas"],
-            "has_previous": delta["has_previous"],
-        },
-    }
-    for r in results:
-        cat = CATEGORIES[r.category]
-        output["categories"][r.category] = {
-            "score": category_score(r),
-            "max": cat["max_deduction"],
-            "deduction": r.deduction,
-            "error": r.error,
-            "findings": [
-                {"rule": f.rule, "message": f.message, "file": f.file, "line": f.line, "severity": f.severity}
-                for f in r.findings
-            ],
-        }
-    return output
+def _add_diagnostic_arguments(parser: argparse.ArgumentParser) -> None:
+    """Extra reports on the scan itself."""
+    parser.add_argument(
+        "--rollup",
+        type=int,
+        metavar="DEPTH",
+        default=None,
+        help="Score every directory down to DEPTH levels and show the lowest-scoring ones.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report wall/CPU time per analyzer and phase, and the slowest files.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Report peak and retained memory per analyzer (runs analyzers one at a time).",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        default=None,
+        help="Write Chrome/Perfetto trace events for the scan to FILE.",
+    )
 
 
-def _emit_output(args, results, path: str, score: int, delta: dict) -> None:
-    """Dispatch on output mode: --score / --json / default report."""
-    if args.score:
-        print(score)
-    elif args.json_out:
-        print(json.dumps(_build_json_output(results, path, score, delta), indent=2))
-    else:
-        print_report(results, path, verbose=args.verbose, delta=delta)
+def _summary_options(args) -> dict:
+    """Pick how many findings analyzers must keep for the requested output.
+
+    ``--score`` and ``--badge`` only need the number, so analyzers keep no
+    findings and stop at their category cap. The default report shows the
+    first few per category; ``--verbose``, ``--json`` and ``--rollup`` need
+    them all, as does matching findings against a baseline.
+    """
+    if args.rollup is not None or args.baseline is not None or args.update_baseline:
+        return {}
+    if args.score or args.badge:
+        return {"keep": 0, "score_only": True}
+    if args.format == "ndjson":
+        return {"keep": 0}
+    if args.format in ("json", "compact") or args.verbose:
+        return {}
+    return {"keep": MAX_FINDINGS_DISPLAY}
+
 
 
-def _save_state_safely(path: str, results, score: int) -> None:
-    """Save state cache, swallowing OS errors (state is best-effort)."""
+def _save_state_safely(path: str, results, score: int, seconds: float | None = None) -> None:
+    """Save state cache and append the run to the score log, swallowing errors (both are best-effort)."""
+    import sqlite3
+
+    from .gitobjects import head_commit
+    from .scorelog import append_run
+    from .state import save_state
+
     try:
         save_state(path, results, score)
-    except OSError:
+        append_run(path, results, score, seconds=seconds, commit=head_commit(path))
+    except (OSError, sqlite3.Error):
         pass
 
 
-def _compute_exit_code(score: int, args, delta: dict) -> int:
-    """Compute exit code based on score threshold and --strict regression check."""
+def _previous_state(args, path: str) -> dict | None:
+    """What the delta compares against: the last run, or with --rolling the median of recent runs."""
+    from .state import load_state
+
+    if args.no_cache:
+        return None
+    if args.rolling:
+        from .scorelog import rolling_baseline
+
+        return rolling_baseline(path, args.rolling)
+    return load_state(path)
+
+
+def _compute_delta(args, path: str, results, score: int) -> dict:
+    from .state import compute_delta
+
+    delta = compute_delta(_previous_state(args, path), results, score)
+    if args.rolling:
+        delta["baseline"] = f"median of last {args.rolling} runs"
+    return delta
+
+
+
+def _check_gate_options(parser, args) -> None:
+    """Reject options that --gate does not support."""
+    if args.baseline is not None or args.update_baseline:
+        parser.error("--baseline and --update-baseline cannot be combined with --gate")
+    if args.level is not None or args.time_budget is not None:
+        parser.error("--level and --time-budget cannot be combined with --gate")
+
+
+def _run_gate_mode(args, path: str) -> int:
+    """Run --gate: print the decided outcome and return the exit code."""
+    from .runner import run_gate
+    from .state import compute_delta, load_state
+
+    prev_state = None if args.no_cache else load_state(path)
     threshold = args.min_score if args.min_score is not None else 50
-    if score < threshold:
-        return 1
-    if args.strict and delta["has_previous"] and delta["total_delta"] < 0:
-        return 2
-    return 0
+
+    def decide(lower: int, upper: int) -> int | None:
+        # compute_exit_code is a step function of the score, so the outcome
+        # is settled once both ends of the bracket map to the same code.
+        low_code = compute_exit_code(lower, args, compute_delta(prev_state, [], lower))
+        high_code = compute_exit_code(upper, args, compute_delta(prev_state, [], upper))
+        return low_code if low_code == high_code else None
+
+    code, lower, upper = run_gate(path, decide, fix=args.fix, profile_name=args.profile)
+    verdict = "pass" if code == 0 else "fail"
+    bracket = f"{lower}" if lower == upper else f"{lower}-{upper}"
+    print(f"{verdict}: score {bracket} (min {threshold})")
+    return code
 
 
 def main():
     """CLI entry point for python-doctor."""
-    args = _build_parser().parse_args()
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        sys.exit(run_command(argv[0], argv[1:]))
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
 
     if args.ci:
         print(BADGE_CI_WORKFLOW)
@@ -425,27 +462,542 @@ def main():
         _install_pre_commit_hook(args.min_score)
         return
 
-    path = os.path.abspath(args.path)
-    if not os.path.isdir(path):
-        print(f"Error: '{path}' is not a directory.", file=sys.stderr)
+    paths = _scan_paths(args)
+    if args.per_root:
+        _check_per_root_options(parser, args)
+        with open_output(args) as out:
+            code = _scan_roots(args, list(dict.fromkeys(paths)), out)
+        sys.exit(code)
+    if len(paths) > 1:
+        parser.error("scanning several paths requires --per-root")
+    sys.exit(_run_mode(parser, args, paths[0]))
+
+
+def _scan_paths(args) -> list[str]:
+    """The absolute PATH arguments; exit with an error if one is not a directory."""
+    paths = [os.path.abspath(p) for p in args.path]
+    for path in paths:
+        if not os.path.isdir(path):
+            print(f"Error: '{path}' is not a directory.", file=sys.stderr)
+            sys.exit(1)
+    return paths
+
+
+def _run_mode(parser, args, path: str) -> int:
+    """Run the scan mode the options select on *path*, after rejecting options it cannot honour."""
+    if args.sample is not None or args.sample_files is not None:
+        _check_sample_options(parser, args)
+        return _run_sample(args, path)
+
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be positive")
+
+    if args.gate:
+        _check_gate_options(parser, args)
+        return _run_gate_mode(args, path)
+
+    if args.shard:
+        _check_shard_options(parser, args)
+        return _run_shard(args, path)
+
+    if args.update_baseline:
+        if args.level == "quick":
+            parser.error("--update-baseline needs every analyzer; use --level standard or deep")
+        return _update_baseline(args, path)
+
+    with open_output(args) as out:
+        return _scan(args, path, out)
+
+
+def _replay_ndjson(results, out) -> None:
+    """Write the ndjson finding and category records of results that were not streamed."""
+    from .report import NdjsonWriter
+
+    stream = NdjsonWriter(out)
+    for r in results:
+        for f in r.findings:
+            stream.finding(f)
+        stream.category(r)
+
+
+def _baseline_file(args, path: str) -> str:
+    from .baseline import default_baseline_path
+
+    return os.path.abspath(args.baseline) if args.baseline else default_baseline_path(path)
+
+
+def _apply_baseline(args, path: str, results):
+    """Drop baselined findings from *results*; return the rescored results and the baseline report."""
+    from .baseline import apply_baseline, load_baseline
+    from .runner import category_caps
+
+    file = _baseline_file(args, path)
+    try:
+        baseline = load_baseline(file)
+    except OSError as e:
+        print(f"Error: cannot read baseline '{file}': {e.strerror or e}", file=sys.stderr)
+        print("Create it with --update-baseline.", file=sys.stderr)
         sys.exit(1)
+    return apply_baseline(path, results, baseline, category_caps(path, args.profile), file)
+
+
+def _update_baseline(args, path: str) -> int:
+    """--update-baseline: fingerprint every current finding (reusing cached results when possible)."""
+    from .baseline import write_baseline
+
+    results = _collect_results(args, path, sys.stdout)
+    file = _baseline_file(args, path)
+    try:
+        count = write_baseline(file, path, results)
+    except OSError as e:
+        print(f"Error: cannot write baseline '{file}': {e.strerror or e}", file=sys.stderr)
+        return 1
+    print(f"🧾 Baseline updated: {count} findings → {file}")
+    return 0
+
+
+def _collect_results(args, path: str, out, timings=None, memory=None):
+    """Return analyzer results, reusing the fingerprint cache when the tree is unchanged."""
+    import contextlib
+
+    from .fingerprint import build_tree, scan_key
+
+    options = _summary_options(args)
+    streaming = args.format == "ndjson" and not (args.score or args.badge) and args.baseline is None
+    if args.no_cache or args.fix or memory is not None:
+        return _run_analyzers(args, path, out, options, streaming, timings=timings, memory=memory)
 
-    results = run_analyzers(path, fix=args.fix, profile_name=args.profile)
+    with timings.run.phase("fingerprint") if timings is not None else contextlib.nullcontext():
+        tree, key = build_tree(path), scan_key(args.profile, args.level or "standard")
+    results = _cached_results(args, path, tree, key, options, streaming, timings)
+    if results is None:
+        return _scan_and_record(args, path, out, options, streaming, timings, tree, key)
+    if streaming:
+        _replay_ndjson(results, out)
+    return results
+
+
+def _cached_results(args, path: str, tree, key, options: dict, streaming: bool, timings):
+    """Results stored for *tree* under *key*, or None; the outcome is recorded in *timings*."""
+    from .fingerprint import cached_results, changed_files, load_fingerprint, scan_key
+
+    # Replaying an ndjson stream needs every finding, not just the ones kept in memory.
+    wanted_keep = None if streaming else options.get("keep")
+    stored = load_fingerprint(path)
+    # quick never stores results of its own; an unchanged tree's full results beat it.
+    results = cached_results(
+        stored, tree, scan_key(args.profile) if args.level == "quick" else key,
+        keep=wanted_keep, score_only=options.get("score_only", False),
+    )
+    if timings is not None:
+        changed = None
+        if results is None and stored is not None and "" in stored["tree"]:
+            changed = len(changed_files(stored["tree"], tree))
+        timings.record_cache(results is not None, changed)
+    return results
+
+
+def _run_analyzers(args, path: str, out, options: dict, streaming: bool, **hooks):
+    """Run the analyzers the options select, streaming ndjson records to *out* if *streaming*.
+
+    *hooks* are further :class:`~python_doctor.runner.ScanOptions` fields (timings, cost model, ...).
+    """
+    from .report import NdjsonWriter
+    from .runner import ScanOptions, run_analyzers
+
+    if streaming:
+        stream = NdjsonWriter(out)
+        options = {**options, "on_finding": stream.finding, "on_result": stream.category}
+    scan = ScanOptions(level=args.level or "standard", **options, **hooks)
+    return run_analyzers(path, fix=args.fix, profile_name=args.profile, options=scan)
+
+
+def _scan_and_record(args, path: str, out, options: dict, streaming: bool, timings, tree, key):
+    """Run the analyzers, then save the learned costs and, above quick, the results for *tree*."""
+    from .costmodel import CostModel, project_work, save_file_costs
+    from .fingerprint import save_fingerprint
+    from .shard import index_sizes
+
+    durations, file_durations = {}, {}
+    model, work = CostModel.load(path), project_work(index_sizes(tree))
+    results = _run_analyzers(
+        args, path, out, options, streaming,
+        timings=timings, durations=durations, cost_model=model, work=work, file_durations=file_durations,
+    )
+    model.record(durations, work)
+    try:
+        model.save(path)
+        save_file_costs(path, file_durations)
+        if args.level != "quick":
+            save_fingerprint(
+                path, tree, key, results, keep=options.get("keep"), score_only=options.get("score_only", False)
+            )
+    except OSError:
+        pass
+    return results
+
+
+def _plan_level(args, path: str):
+    """Resolve --level / --time-budget into ``args.level`` and announce the predicted time on stderr.
+
+    Returns the :class:`~python_doctor.costmodel.LevelReport`, or None when
+    neither option was given.
+    """
+    if args.level is None and args.time_budget is None:
+        return None
+    from .costmodel import CostModel, LevelReport, project_work
+    from .fingerprint import build_tree
+    from .shard import index_sizes
+
+    model = CostModel.load(path)
+    work = project_work(index_sizes(build_tree(path)))
+    level = args.level or "standard"
+    if args.time_budget is not None:
+        level = model.choose_level(args.time_budget, work, highest=level)
+    args.level = level
+    report = LevelReport(level, model.predict_level(level, work), args.time_budget, model.learned)
+    if not (args.score or args.badge):  # those print diagnostics on stderr anyway
+        print(report.summary(), file=sys.stderr)
+    return report
+
+
+def _reuse_full_results(args, path: str, results, report):
+    """At --level quick, fill in the skipped tool categories from the last standard scan's results.
+
+    A deep scan's lint results include the deep-only analyzers' findings,
+    which a quick scan must not count, so those are never reused.
+    """
+    from .fingerprint import load_fingerprint, scan_key
+    from .registry import skipped_error
+    from .state import results_from_dicts
+
+    stored = load_fingerprint(path)
+    full = {}
+    if stored and stored.get("key") == scan_key(args.profile):
+        try:
+            full = {r.category: r for r in results_from_dicts(stored["results"])}
+        except (KeyError, TypeError, ValueError):
+            full = {}
+    out = []
+    for r in results:
+        if r.error != skipped_error("quick"):
+            out.append(r)
+        elif r.category in full and not full[r.category].error:
+            out.append(full[r.category])
+            report.reused.append(r.category)
+        else:
+            out.append(r)
+            report.skipped.append(r.category)
+    return out
+
+
+def _start_diagnostics(args, path: str):
+    """Start the recorders --timings / --trace and --memory-report ask for; return them (or None)."""
+    timings = memory = None
+    if args.timings or args.trace:
+        from .timing import RunTimings, TraceRecorder
+
+        timings = RunTimings(trace=TraceRecorder(path) if args.trace else None)
+        timings.start()
+    if args.memory_report:
+        from .memory import MemoryReport
+
+        memory = MemoryReport()
+        memory.start()
+    return timings, memory
+
+
+def _finish_diagnostics(args, results, timings, memory) -> list:
+    """Stop the recorders, write the --trace file and return the reports to show."""
+    reports = []
+    if timings is not None:
+        timings.stop()
+        if timings.trace is not None:
+            timings.trace.write(args.trace)
+        if args.timings:
+            reports.append(timings)
+    if memory is not None:
+        memory.record_results(results)
+        memory.stop()
+        reports.append(memory)
+    return reports
+
+
+def _rollup_report(args, path: str, results):
+    """The --rollup table of the lowest-scoring directories."""
+    from .rollup import RollupReport, build_rollup
+    from .runner import category_caps
+
+    rows = build_rollup(results, path, args.rollup, category_caps(path, args.profile))
+    return RollupReport(rows, args.rollup)
+
+
+def _scan(args, path: str, out) -> int:
+    """Run a full scan, emit the requested output, and return the exit code."""
+    import time
+
+    from .scorer import compute_score
+
+    timings, memory = _start_diagnostics(args, path)
+    level_report = _plan_level(args, path)
+    started = time.monotonic()
+    results = _collect_results(args, path, out, timings, memory)
+    diagnostics = []
+    if level_report is not None:
+        if args.level == "quick":
+            results = _reuse_full_results(args, path, results, level_report)
+        diagnostics.append(level_report)
+    diagnostics += _finish_diagnostics(args, results, timings, memory)
+    # The delta, state and score log cover the whole scan, not just the findings new since the baseline.
+    scanned = results
+    if args.baseline is not None:
+        results, report = _apply_baseline(args, path, results)
+        diagnostics.insert(0, report)
+        if args.format == "ndjson" and not (args.score or args.badge):
+            _replay_ndjson(results, out)
+    if args.rollup is not None:
+        diagnostics.append(_rollup_report(args, path, results))
     score = compute_score(results)
+    scanned_score = score if scanned is results else compute_score(scanned)
 
     if args.badge:
-        _print_badge(score)
-        return
+        print_badge(score)
+        for report in diagnostics:
+            print(report.format_table(path), file=sys.stderr)
+        return 0
+
+    delta = _compute_delta(args, path, scanned, scanned_score)
+
+    emit_output(args, results, path, score, delta, out, diagnostics)
+
+    # A quick scan's score is partly stale, so it is neither the new baseline nor logged.
+    if not args.no_cache and args.level != "quick":
+        _save_state_safely(path, scanned, scanned_score, seconds=time.monotonic() - started)
+
+    return compute_exit_code(score, args, delta)
+
+
+# Options that only make sense for a single root.
+_SINGLE_ROOT_OPTIONS = {
+    "level": "--level",
+    "time_budget": "--time-budget",
+    "sample": "--sample",
+    "sample_files": "--sample-files",
+    "gate": "--gate",
+    "baseline": "--baseline",
+    "update_baseline": "--update-baseline",
+    "rollup": "--rollup",
+    "timings": "--timings",
+    "trace": "--trace",
+    "memory_report": "--memory-report",
+}
+
+
+def _check_per_root_options(parser, args) -> None:
+    """Reject options that --per-root does not support."""
+    for dest, flag in _SINGLE_ROOT_OPTIONS.items():
+        if getattr(args, dest) not in (None, False):
+            parser.error(f"{flag} cannot be combined with --per-root")
+    if args.format in ("ndjson", "compact"):
+        parser.error(f"--format {args.format} cannot be combined with --per-root")
+
+
+def _collect_roots(args, roots: list[str]) -> dict:
+    """Return results per root, reusing each root's fingerprint cache where it matches."""
+    from .fingerprint import build_tree, cached_results, load_fingerprint, save_fingerprint, scan_key
+    from .runner import run_roots
+
+    options = _summary_options(args)
+    use_cache = not (args.no_cache or args.fix)
+    found: dict = {}
+    trees: dict = {}
+    key = None
+    if use_cache:
+        key = scan_key(args.profile)
+        for root in roots:
+            trees[root] = build_tree(root)
+            cached = cached_results(
+                load_fingerprint(root), trees[root], key,
+                keep=options.get("keep"), score_only=options.get("score_only", False),
+            )
+            if cached is not None:
+                found[root] = cached
+    pending = [root for root in roots if root not in found]
+    if pending:
+        fresh = run_roots(pending, fix=args.fix, profile_name=args.profile, **options)
+        for root, results in fresh.items():
+            found[root] = results
+            if use_cache:
+                try:
+                    save_fingerprint(
+                        root, trees[root], key, results,
+                        keep=options.get("keep"), score_only=options.get("score_only", False),
+                    )
+                except OSError:
+                    pass
+    return {root: found[root] for root in roots}
 
-    prev_state = None if args.no_cache else load_state(path)
-    delta = compute_delta(prev_state, results, score)
 
-    _emit_output(args, results, path, score, delta)
+def _display_root(root: str) -> str:
+    """Show *root* relative to the working directory when it is inside it."""
+    rel = os.path.relpath(root)
+    return root if rel.startswith(os.pardir) else rel
+
+
+def _aggregate_score(scores: dict) -> int:
+    """Aggregate of per-root scores: their mean, rounded."""
+    return round(sum(scores.values()) / len(scores)) if scores else 100
+
+
+def _print_roots_summary(scores: dict, aggregate: int) -> None:
+    """Print the per-root score table and the aggregate line."""
+    from .scorer import score_label
+
+    print(f"📦 Roots ({len(scores)})")
+    for root, score in sorted(scores.items(), key=lambda kv: kv[1]):
+        print(f"  {score:>3}/100  {_display_root(root)}")
+    lowest = min(scores, key=scores.get)
+    print(f"\n📊 Aggregate: {aggregate}/100 ({score_label(aggregate)}) — mean of {len(scores)} roots, "
+          f"lowest {scores[lowest]} ({_display_root(lowest)})\n")
+
+
+def _scan_roots(args, roots: list[str], out) -> int:
+    """Run --per-root: scan every root, emit per-root and aggregate output, return the exit code.
+
+    The exit code is the worst of the per-root exit codes, so CI fails when
+    any root is below --min-score (or regressed, with --strict).
+    """
+    import json
+
+    from .scorer import compute_score, score_label
+
+    results_by_root = _collect_roots(args, roots)
+    scores = {root: compute_score(results) for root, results in results_by_root.items()}
+    aggregate = _aggregate_score(scores)
+
+    if args.badge:
+        print_badge(aggregate)
+        return 0
+
+    deltas = {root: _compute_delta(args, root, results, scores[root]) for root, results in results_by_root.items()}
+    if args.score:
+        print(aggregate)
+    elif args.format == "json":
+        output = {
+            "version": __version__,
+            "score": aggregate,
+            "label": score_label(aggregate),
+            "roots": [
+                build_json_output(results, root, scores[root], deltas[root])
+                for root, results in results_by_root.items()
+            ],
+        }
+        print(json.dumps(output, indent=None if args.compact else 2), file=out)
+    else:
+        for root, results in results_by_root.items():
+            print_report(results, root, verbose=args.verbose, delta=deltas[root])
+        _print_roots_summary(scores, aggregate)
 
     if not args.no_cache:
-        _save_state_safely(path, results, score)
+        for root, results in results_by_root.items():
+            _save_state_safely(root, results, scores[root])
+    return max(compute_exit_code(scores[root], args, deltas[root]) for root in roots)
+
+
+
+# Options a --shard run does not support: it only writes partial results.
+_SHARD_EXCLUSIVE_OPTIONS = {
+    "level": "--level",
+    "time_budget": "--time-budget",
+    "per_root": "--per-root",
+    "gate": "--gate",
+    "baseline": "--baseline",
+    "update_baseline": "--update-baseline",
+    "fix": "--fix",
+    "score": "--score",
+    "badge": "--badge",
+    "rollup": "--rollup",
+    "timings": "--timings",
+    "trace": "--trace",
+    "memory_report": "--memory-report",
+}
+
+
+def _check_shard_options(parser, args) -> None:
+    """Reject options that --shard does not support."""
+    for dest, flag in _SHARD_EXCLUSIVE_OPTIONS.items():
+        if getattr(args, dest) not in (None, False):
+            parser.error(f"{flag} cannot be combined with --shard")
+    if args.format not in (None, "text"):
+        parser.error("--shard always writes partial results; use 'python-doctor merge' for reports")
+
+
+# Options a sampled scan cannot honour: it reports an estimate, not findings.
+_SAMPLE_EXCLUSIVE_OPTIONS = {
+    "level": "--level",
+    "time_budget": "--time-budget",
+    "gate": "--gate",
+    "shard": "--shard",
+    "baseline": "--baseline",
+    "update_baseline": "--update-baseline",
+    "fix": "--fix",
+    "badge": "--badge",
+    "verbose": "--verbose",
+    "rollup": "--rollup",
+    "strict": "--strict",
+    "rolling": "--rolling",
+    "timings": "--timings",
+    "trace": "--trace",
+    "memory_report": "--memory-report",
+}
+
+
+def _check_sample_options(parser, args) -> None:
+    """Reject options that --sample does not support."""
+    if args.sample is not None and args.sample_files is not None:
+        parser.error("--sample and --sample-files are mutually exclusive")
+    if args.sample_files is not None and args.sample_files < 1:
+        parser.error("--sample-files must be at least 1")
+    for dest, flag in _SAMPLE_EXCLUSIVE_OPTIONS.items():
+        if getattr(args, dest) not in (None, False):
+            parser.error(f"{flag} cannot be combined with --sample")
+    if args.format in ("ndjson", "compact"):
+        parser.error(f"--format {args.format} cannot be combined with --sample")
+
+
+def _run_sample(args, path: str) -> int:
+    """Run --sample / --sample-files: estimate the score from a sample of the files."""
+    import json
+
+    from .sample import estimate_score, format_estimate
+
+    estimate = estimate_score(path, args.sample, args.sample_files, args.profile)
+    if args.score:
+        print(estimate.score)
+    elif args.format == "json":
+        with open_output(args) as out:
+            print(json.dumps(estimate.to_dict(), indent=None if args.compact else 2), file=out)
+    else:
+        print(f"🐍 Python Doctor v{__version__}")
+        print(f"Scanning: {path}")
+        print(format_estimate(estimate))
+    threshold = args.min_score if args.min_score is not None else 50
+    return 1 if estimate.score < threshold else 0
+
 
-    sys.exit(_compute_exit_code(score, args, delta))
+def _run_shard(args, path: str) -> int:
+    """Run --shard: scan one shard and write its partial results to --output or stdout."""
+    import contextlib
+
+    from .runner import scan_shard
+    from .shard import write_partial
+
+    index, count = args.shard
+    partial = scan_shard(path, index, count, args.profile)
+    stream = open(args.output, "w", encoding="utf-8") if args.output else contextlib.nullcontext(sys.stdout)
+    with stream as out:
+        write_partial(partial, out)
+    return 0
 
 
 if __name__ == "__main__":
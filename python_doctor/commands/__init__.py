@@ -0,0 +1,17 @@
+"""Subcommands: ``python-doctor NAME ...``.
+
+Each is a module here with ``build_parser()`` and ``main(argv)``, which
+returns the exit code. They are imported only when run, so the scan's
+startup does not pay for them.
+"""
+
+import importlib
+
+# Dispatched on the first argument. A directory with one of these names can
+# still be scanned as ./NAME.
+COMMANDS = ("merge", "fleet", "history", "bisect", "trend")
+
+
+def run(name: str, argv: list[str]) -> int:
+    """Run subcommand *name* with the arguments after it."""
+    return importlib.import_module(f"{__name__}.{name}").main(argv)
@@ -0,0 +1,64 @@
+"""``python-doctor bisect GOOD BAD``: find the commit that lowered the score."""
+
+import argparse
+import json
+import os
+import sys
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from ..rules import CATEGORIES
+
+    parser = argparse.ArgumentParser(
+        prog="python-doctor bisect",
+        description=(
+            "Binary-search the first-parent commits after GOOD up to BAD for the first one that "
+            "scores below GOOD, and list the findings it introduced."
+        ),
+    )
+    parser.add_argument("good", metavar="GOOD", help="A commit with the good score")
+    parser.add_argument("bad", metavar="BAD", help="A later commit with a lower score")
+    parser.add_argument("--path", default=".", help="Path inside the git repository to score (default: .)")
+    parser.add_argument(
+        "--category", choices=list(CATEGORIES), default=None, help="Compare only this category's score"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cli", "web", "library", "script"],
+        default=None,
+        help="Override auto-detected project profile",
+    )
+    parser.add_argument("--verbose", "-v", action="store_true", help="List every introduced finding")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Skip reading/writing the per-file cache in .python-doctor/"
+    )
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    """Bisect the commits *argv* names, print the culprit and return the exit code."""
+    from ..gitobjects import GitError
+    from ..regression import bisect_regression, format_bisect
+
+    args = build_parser().parse_args(argv)
+    path = os.path.abspath(args.path)
+    if not os.path.isdir(path):
+        print(f"Error: '{args.path}' is not a directory", file=sys.stderr)
+        return 1
+
+    def progress(message: str) -> None:
+        print(f"{message}...", file=sys.stderr)
+
+    try:
+        result = bisect_regression(
+            path, args.good, args.bad, args.category, args.profile, use_cache=not args.no_cache, progress=progress
+        )
+    except GitError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        print(format_bisect(result, limit=None if args.verbose else 20))
+    return 0
@@ -0,0 +1,63 @@
+"""``python-doctor fleet TARGET``: scan many repositories, streaming a line per repository."""
+
+import argparse
+import contextlib
+import sys
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python-doctor fleet",
+        description=(
+            "Score many repositories in one run on a shared worker pool, "
+            "writing one NDJSON line per repository as it finishes."
+        ),
+    )
+    parser.add_argument(
+        "target",
+        help="Directory whose subdirectories are repositories, or a file listing one repository path per line",
+    )
+    parser.add_argument(
+        "--workers", "-j", type=int, default=None, metavar="N", help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cli", "web", "library", "script"],
+        default=None,
+        help="Override auto-detected project profile for every repository",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Skip reading/writing each repository's .python-doctor/ cache"
+    )
+    parser.add_argument(
+        "--min-score",
+        type=int,
+        default=None,
+        help="Exit 1 if any repository scores below this. Default: 50",
+    )
+    parser.add_argument("--output", "-o", metavar="FILE", default=None, help="Write NDJSON to FILE instead of stdout")
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    """Scan the repositories *argv* names and return 1 if any failed or scored below --min-score."""
+    from ..fleet import discover_repos, run_fleet
+    from ..report import NdjsonWriter
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        repos = discover_repos(args.target)
+    except OSError as e:
+        print(f"Error: cannot read '{args.target}': {e}", file=sys.stderr)
+        return 1
+    stream = open(args.output, "w", encoding="utf-8") if args.output else contextlib.nullcontext(sys.stdout)
+    with stream as out:
+        scores = run_fleet(
+            repos, NdjsonWriter(out), workers=args.workers, profile_name=args.profile, use_cache=not args.no_cache
+        )
+    threshold = args.min_score if args.min_score is not None else 50
+    failed = len(scores) < len(repos) or any(score < threshold for score in scores.values())
+    return 1 if failed else 0
@@ -0,0 +1,65 @@
+"""``python-doctor history [PATH]``: score the last N commits as a time series."""
+
+import argparse
+import contextlib
+import os
+import sys
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python-doctor history",
+        description=(
+            "Score each of the last N commits without checking them out. Per-file results are "
+            "cached by blob id, so only file versions not seen before are analyzed."
+        ),
+    )
+    parser.add_argument("path", nargs="?", default=".", help="Path inside a git repository (default: .)")
+    parser.add_argument("--last", type=int, default=20, metavar="N", help="Number of commits to score (default: 20)")
+    parser.add_argument("--rev", default="HEAD", help="Score the first-parent history of REV (default: HEAD)")
+    parser.add_argument(
+        "--profile",
+        choices=["cli", "web", "library", "script"],
+        default=None,
+        help="Override auto-detected project profile",
+    )
+    parser.add_argument("--json", dest="format", action="store_const", const="json", help="JSON output")
+    parser.add_argument("--format", choices=["text", "json", "csv"], default="text", help="Output format")
+    parser.add_argument("--output", "-o", metavar="FILE", default=None, help="Write the time series to FILE")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Skip reading/writing the per-file cache in .python-doctor/"
+    )
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    """Score the commits *argv* selects, write the series and return the exit code."""
+    from ..gitobjects import GitError
+    from ..history import format_history, score_history, write_history_csv, write_history_json
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.last < 1:
+        parser.error("--last must be at least 1")
+    path = os.path.abspath(args.path)
+    if not os.path.isdir(path):
+        print(f"Error: '{args.path}' is not a directory", file=sys.stderr)
+        return 1
+
+    def progress(message: str) -> None:
+        print(f"{message}...", file=sys.stderr)
+
+    try:
+        points = score_history(path, args.last, args.rev, args.profile, use_cache=not args.no_cache, progress=progress)
+    except GitError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    stream = open(args.output, "w", encoding="utf-8") if args.output else contextlib.nullcontext(sys.stdout)
+    with stream as out:
+        if args.format == "json":
+            write_history_json(points, path, args.rev, out)
+        elif args.format == "csv":
+            write_history_csv(points, out)
+        else:
+            print(format_history(points, args.rev), file=out)
+    return 0
@@ -0,0 +1,49 @@
+"""``python-doctor merge PART...``: report and score the combined shard results."""
+
+import argparse
+import sys
+
+from ..output import compute_exit_code, emit_output, open_output
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python-doctor merge",
+        description="Combine --shard partial results into one report and score.",
+    )
+    parser.add_argument("parts", nargs="+", metavar="PART", help="Partial-results files, one per shard")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show all findings")
+    parser.add_argument("--score", action="store_true", help="Output only the score number")
+    parser.add_argument("--json", dest="format", action="store_const", const="json", help="JSON output")
+    parser.add_argument("--format", choices=["text", "json", "compact"], default="text", help="Output format")
+    parser.add_argument("--compact", action="store_true", help="Write JSON without indentation")
+    parser.add_argument(
+        "--output", "-o", metavar="FILE", default=None, help="Write json/compact output to FILE instead of stdout"
+    )
+    parser.add_argument(
+        "--min-score",
+        type=int,
+        default=None,
+        help="Minimum score threshold (exit 1 if below). Default: 50",
+    )
+    parser.set_defaults(strict=False)
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    """Merge the partial results in *argv*, emit the report and return the exit code."""
+    from ..scorer import compute_score
+    from ..shard import load_partials, merge_partials
+    from ..state import compute_delta
+
+    args = build_parser().parse_args(argv)
+    try:
+        path, results = merge_partials(load_partials(args.parts))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    score = compute_score(results)
+    delta = compute_delta(None, results, score)
+    with open_output(args) as out:
+        emit_output(args, results, path, score, delta, out)
+    return compute_exit_code(score, args, delta)
@@ -0,0 +1,66 @@
+"""``python-doctor trend [PATH]``: logged scores over time with rolling-median deltas."""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+
+def _timestamp(value: str) -> int:
+    """Parse an ISO date or date-time (UTC unless it has an offset) for argparse."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (use YYYY-MM-DD or YYYY-MM-DDTHH:MM)") from None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from ..scorelog import DEFAULT_WINDOW
+
+    parser = argparse.ArgumentParser(
+        prog="python-doctor trend",
+        description=(
+            "Show the scores of past scans from the append-only log in .python-doctor/, "
+            "each with its difference from the median of the runs before it."
+        ),
+    )
+    parser.add_argument("path", nargs="?", default=".", help="Scanned directory (default: .)")
+    parser.add_argument("--since", type=_timestamp, default=None, metavar="DATE", help="Only runs at or after DATE")
+    parser.add_argument("--until", type=_timestamp, default=None, metavar="DATE", help="Only runs before DATE")
+    parser.add_argument("--last", type=int, default=None, metavar="N", help="Only the newest N runs in range")
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=DEFAULT_WINDOW,
+        metavar="N",
+        help=f"Runs the rolling median covers (default: {DEFAULT_WINDOW})",
+    )
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    """Print the logged runs *argv* selects and return the exit code."""
+    from ..scorelog import format_trend, trend
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.last is not None and args.last < 1:
+        parser.error("--last must be at least 1")
+    if args.window < 0:
+        parser.error("--window must not be negative")
+    path = os.path.abspath(args.path)
+    if not os.path.isdir(path):
+        print(f"Error: '{args.path}' is not a directory", file=sys.stderr)
+        return 1
+    rows = trend(path, args.since, args.until, args.last, args.window)
+    if args.json:
+        runs = [{**run.to_dict(), "median": median} for run, median in rows]
+        print(json.dumps({"path": path, "window": args.window, "runs": runs}, indent=2))
+    else:
+        print(format_trend(rows, args.window))
+    return 0
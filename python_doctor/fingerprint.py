@@ -0,0 +1,194 @@
+"""Stat-based Merkle fingerprint of a project tree, for instant no-op runs.
+
+Every indexed file contributes ``(name, size, mtime_ns, inode)`` to its
+directory's hash, and every directory hash feeds its parent's, so the root
+hash changes whenever any file is added, removed or touched. The tree is
+stored in ``<path>/.python-doctor/fingerprint.json`` next to the results
+of the scan it describes; when the next run computes the same root hash
+(and the same config and tool versions) the cached results are reused.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+
+from . import __version__
+from .rules import AnalyzerResult
+from .state import STATE_DIR, results_from_dicts, results_to_dicts
+
+FINGERPRINT_FILE = "fingerprint.json"
+
+# Only directories that no analyzer ever reads are left out of the index,
+# plus our own state directory (which every run rewrites).
+INDEX_SKIP_DIRS = frozenset({
+    ".git", "__pycache__", "node_modules", ".venv", "venv", ".tox", ".mypy_cache", ".ruff_cache", STATE_DIR,
+})
+
+# External tools whose version changes invalidate cached results.
+_TOOLS = ("ruff", "bandit", "radon")
+
+
+def _hash_dir(abs_dir: str, rel_dir: str, tree: dict) -> str:
+    """Hash one directory bottom-up, recording it (and its subdirectories) in *tree*."""
+    files: dict[str, list[int]] = {}
+    subdirs: list[str] = []
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        entries = sorted(os.scandir(abs_dir), key=lambda e: e.name)
+    except OSError:
+        entries = []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in INDEX_SKIP_DIRS:
+                    continue
+                child = _hash_dir(entry.path, f"{rel_dir}/{entry.name}" if rel_dir else entry.name, tree)
+                subdirs.append(entry.name)
+                h.update(f"d\0{entry.name}\0{child}\n".encode())
+            elif entry.is_file():
+                st = entry.stat()
+                sig = [st.st_size, st.st_mtime_ns, st.st_ino]
+                files[entry.name] = sig
+                h.update(f"f\0{entry.name}\0{sig}\n".encode())
+        except OSError:
+            continue
+    digest = h.hexdigest()
+    tree[rel_dir] = {"h": digest, "f": files, "d": subdirs}
+    return digest
+
+
+def build_tree(path: str) -> dict:
+    """Stat every indexed file under *path* and return the Merkle tree.
+
+    The result maps each directory (relative, ``""`` for the root) to its
+    hash ``h``, its files ``f`` (name -> [size, mtime_ns, inode]) and its
+    subdirectory names ``d``.
+    """
+    tree: dict = {}
+    _hash_dir(path, "", tree)
+    return tree
+
+
+def root_hash(tree: dict) -> str:
+    """Return the hash covering the whole tree."""
+    return tree[""]["h"]
+
+
+def _all_files(tree: dict, rel_dir: str, out: list[str]) -> None:
+    """Append every file under *rel_dir* in *tree* to *out*."""
+    node = tree.get(rel_dir)
+    if node is None:
+        return
+    prefix = f"{rel_dir}/" if rel_dir else ""
+    out.extend(prefix + name for name in node["f"])
+    for sub in node["d"]:
+        _all_files(tree, prefix + sub, out)
+
+
+def changed_files(old: dict, new: dict) -> list[str]:
+    """Return files added, removed or modified between two trees.
+
+    Only directories whose hash differs are descended into, so a mostly
+    unchanged tree is compared in time proportional to what changed.
+    """
+    changed: list[str] = []
+
+    def descend(rel_dir: str) -> None:
+        before, after = old.get(rel_dir), new.get(rel_dir)
+        if before is None or after is None:
+            _all_files(old if after is None else new, rel_dir, changed)
+            return
+        if before["h"] == after["h"]:
+            return
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        for name in sorted(before["f"].keys() | after["f"].keys()):
+            if before["f"].get(name) != after["f"].get(name):
+                changed.append(prefix + name)
+        for sub in sorted(set(before["d"]) | set(after["d"])):
+            descend(prefix + sub)
+
+    descend("")
+    return sorted(changed)
+
+
+def _tool_signature(tool: str) -> str:
+    """Identify the installed version of an external tool without running it."""
+    exe = shutil.which(tool)
+    if exe:
+        try:
+            st = os.stat(exe)
+            return f"{exe}:{st.st_size}:{st.st_mtime_ns}"
+        except OSError:
+            pass
+    try:
+        return importlib.metadata.version(tool)
+    except importlib.metadata.PackageNotFoundError:
+        return "missing"
+
+
+def scan_key(profile_name: str | None = None, level: str = "standard") -> str:
+    """Hash everything besides the tree that affects results.
+
+    Project config lives in ``pyproject.toml``, which the tree already
+    covers; this adds the python-doctor and tool versions and CLI overrides.
+    """
+    parts = [__version__, profile_name or "", *(_tool_signature(t) for t in _TOOLS)]
+    if level != "standard":
+        parts += [level, _tool_signature("vulture")]
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _fingerprint_path(path: str) -> str:
+    return os.path.join(path, STATE_DIR, FINGERPRINT_FILE)
+
+
+def load_fingerprint(path: str) -> dict | None:
+    """Read the stored fingerprint and cached results, or None if absent/corrupt."""
+    try:
+        with open(_fingerprint_path(path)) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and isinstance(data.get("tree"), dict) else None
+
+
+def _covers(stored: dict, keep: int | None, score_only: bool) -> bool:
+    """True if a cached run kept at least what this run needs."""
+    if stored.get("score_only") and not score_only:
+        return False
+    cached_keep = stored.get("keep")
+    return cached_keep is None or (keep is not None and cached_keep >= keep)
+
+
+def cached_results(
+    stored: dict | None, tree: dict, key: str, keep: int | None = None, score_only: bool = False
+) -> list[AnalyzerResult] | None:
+    """Return the stored results if the tree and key match, else None."""
+    if not stored or stored.get("key") != key or not _covers(stored, keep, score_only):
+        return None
+    stored_tree = stored["tree"]
+    if "" not in stored_tree or root_hash(stored_tree) != root_hash(tree):
+        return None
+    try:
+        return results_from_dicts(stored["results"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def save_fingerprint(
+    path: str, tree: dict, key: str, results: list[AnalyzerResult], keep: int | None = None, score_only: bool = False
+) -> None:
+    """Store the tree, key and the results computed for it."""
+    payload = {
+        "version": __version__,
+        "key": key,
+        "keep": keep,
+        "score_only": score_only,
+        "results": results_to_dicts(results),
+        "tree": tree,
+    }
+    os.makedirs(os.path.join(path, STATE_DIR), exist_ok=True)
+    with open(_fingerprint_path(path), "w") as f:
+        json.dump(payload, f, separators=(",", ":"))
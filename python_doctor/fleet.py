@@ -0,0 +1,211 @@
+"""Fleet mode: score many repositories in one run (``python-doctor fleet``).
+
+Every repository is cut into units of work, one per analyzer, and large
+repositories into one per analyzer and shard (see :mod:`python_doctor.shard`).
+All units go to one pool of long-lived worker processes, largest estimated
+cost first (see :mod:`python_doctor.costmodel`); a worker takes the next unit as soon as it is free, so a huge
+repository's shards spread over every core while small repositories fill
+the gaps. Workers are reused across repositories, so interpreter start-up
+and analyzer imports are paid once per worker instead of once per
+repository, and each repository's fingerprint cache and state are used
+as in a normal run.
+
+An NDJSON ``repo`` line is written as each repository completes, then one
+``fleet`` summary line.
+"""
+
+import concurrent.futures
+import math
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+from .costmodel import CostModel, load_file_costs, project_work
+from .fingerprint import build_tree, cached_results, load_fingerprint, save_fingerprint, scan_key
+from .gitobjects import head_commit
+from .registry import ANALYZERS
+from .rules import AnalyzerResult
+from .runner import run_shard_category, shard_settings
+from .scorelog import append_run
+from .scorer import compute_score
+from .shard import FILE_OVERHEAD_BYTES, Partition, build_partial, index_sizes, merge_partials, shard_files
+from .state import compute_delta, load_state, save_state
+
+# Source bytes per shard: repositories larger than this are split so their
+# analyzers can run on several workers at once.
+SHARD_BYTES = 2 * 1024 * 1024
+
+
+def discover_repos(target: str) -> list[str]:
+    """Return the repositories named by *target*, as absolute paths.
+
+    *target* is either a directory, whose non-hidden subdirectories are the
+    repositories, or a file listing one path per line (blank lines and
+    ``#`` comments are skipped; relative paths are relative to the file).
+    """
+    if os.path.isdir(target):
+        names = sorted(n for n in os.listdir(target) if not n.startswith("."))
+        return [os.path.abspath(os.path.join(target, n)) for n in names if os.path.isdir(os.path.join(target, n))]
+    base = os.path.dirname(os.path.abspath(target))
+    with open(target, encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    paths = [os.path.abspath(os.path.join(base, line)) for line in lines if line and not line.startswith("#")]
+    return list(dict.fromkeys(paths))
+
+
+@dataclass
+class _Repo:
+    """Scheduling state of one repository."""
+
+    path: str
+    tree: dict
+    key: str
+    partition: Partition
+    started: float
+    outcomes: dict = field(default_factory=dict)
+
+    @property
+    def shards(self) -> int:
+        return self.partition.shards
+
+    @property
+    def units(self) -> int:
+        return self.shards * len(ANALYZERS)
+
+
+def _partition(path: str, sizes: dict[str, int], shards: int, learned: bool) -> Partition:
+    """Split *path* into *shards*, balanced on the recorded per-file times if *learned*."""
+    if shards == 1 or not learned:
+        return Partition(sizes, shards)
+    return Partition(sizes, shards, CostModel.load(path).file_weights(sizes, load_file_costs(path)))
+
+
+def _plan(path: str, profile_name: str | None, workers: int, learned: bool = True) -> tuple[_Repo, dict]:
+    """Index *path* and choose its shard count; return the plan and each analyzer's predicted seconds.
+
+    With *learned*, predictions and shard balance use the times recorded
+    in the repository's state directory (see :mod:`python_doctor.costmodel`).
+    """
+    tree = build_tree(path)
+    sizes = index_sizes(tree)
+    size = sum(sizes.values()) + FILE_OVERHEAD_BYTES * len(sizes)
+    shards = max(1, min(workers, math.ceil(size / SHARD_BYTES)))
+    model = CostModel.load(path) if learned else CostModel()
+    costs = model.category_times("standard", project_work(sizes))
+    partition = _partition(path, sizes, shards, learned)
+    return _Repo(path, tree, scan_key(profile_name), partition, time.monotonic()), costs
+
+
+# Partitions and fingerprint trees rebuilt by each worker process, keyed by (path, shards).
+_worker_partitions: dict[tuple[str, int], tuple[Partition, dict]] = {}
+
+
+def _run_unit(
+    path: str, shard: int, shards: int, digest: str, cat_name: str, profile_name: str | None, learned: bool = True
+):
+    """Worker entry point: run one analyzer over one shard of one repository."""
+    if shards == 1:
+        return run_shard_category(path, cat_name, profile_name=profile_name, keep=0)
+    partition, tree = _worker_partitions.get((path, shards), (None, None))
+    if partition is None or partition.digest != digest:
+        tree = build_tree(path)
+        partition = _partition(path, index_sizes(tree), shards, learned)
+        _worker_partitions[(path, shards)] = (partition, tree)
+    if partition.digest != digest:
+        raise RuntimeError("files changed while the repository was being scanned")
+    include = partition.includer(path, shard)
+    return run_shard_category(path, cat_name, include, shard_files(path, partition, shard, tree), profile_name)
+
+
+def _combine(repo: _Repo, profile_name: str | None) -> list[AnalyzerResult]:
+    """Results of a repository whose units have all finished, in ``ANALYZERS`` order."""
+    if repo.shards == 1:
+        return [repo.outcomes[(1, cat)][0] for cat, _ in ANALYZERS]
+    settings = shard_settings(repo.path, profile_name)
+    parts = []
+    for shard in range(1, repo.shards + 1):
+        outcomes = [repo.outcomes[(shard, cat)] for cat, _ in ANALYZERS]
+        results = [result for result, _facts in outcomes]
+        facts = {result.category: data for result, data in outcomes if data is not None}
+        parts.append(build_partial(repo.path, repo.partition, shard, results, facts, settings))
+    return merge_partials(parts)[1]
+
+
+def run_fleet(
+    repos: list[str],
+    writer,
+    workers: int | None = None,
+    profile_name: str | None = None,
+    use_cache: bool = True,
+) -> dict[str, int]:
+    """Scan every repository in *repos* on a shared process pool; return scores by path.
+
+    *writer* is a :class:`~python_doctor.report.NdjsonWriter` that receives a
+    ``repo`` record as each repository finishes (repositories that are not
+    directories get one with an ``error``) and a final ``fleet`` record.
+    With *use_cache*, unchanged repositories are answered from their
+    fingerprint cache and every repository's state and cache are updated.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.monotonic()
+    scores: dict[str, int] = {}
+    errors = 0
+
+    def finish(repo: _Repo, results: list[AnalyzerResult], cached: bool) -> None:
+        score = compute_score(results)
+        scores[repo.path] = score
+        delta = compute_delta(load_state(repo.path) if use_cache else None, results, score)
+        if use_cache:
+            try:
+                save_state(repo.path, results, score)
+                append_run(repo.path, results, score, seconds=time.monotonic() - repo.started,
+                           commit=head_commit(repo.path))
+                if not cached:
+                    keep = 0 if repo.shards == 1 else None
+                    save_fingerprint(repo.path, repo.tree, repo.key, results, keep=keep)
+            except (OSError, sqlite3.Error):
+                pass
+        writer.repo(repo.path, results, score, delta, cached=cached, shards=repo.shards,
+                    seconds=time.monotonic() - repo.started)
+
+    units = []
+    for path in repos:
+        if not os.path.isdir(path):
+            writer.repo_error(path, "not a directory")
+            errors += 1
+            continue
+        repo, costs = _plan(path, profile_name, workers, learned=use_cache)
+        if use_cache:
+            cached = cached_results(load_fingerprint(path), repo.tree, repo.key, keep=0)
+            if cached is not None:
+                finish(repo, cached, cached=True)
+                continue
+        for shard in range(1, repo.shards + 1):
+            for cat_name, _mod in ANALYZERS:
+                units.append((costs[cat_name] / repo.shards, repo, shard, cat_name))
+
+    # Longest predicted units first (LPT): the long poles start early, small ones fill in.
+    # The sort is stable, so equal predictions keep repository and ANALYZERS order.
+    units.sort(key=lambda unit: -unit[0])
+    if units:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(
+                    _run_unit, repo.path, shard, repo.shards, repo.partition.digest, cat_name, profile_name, use_cache
+                ):
+                    (repo, shard, cat_name)
+                for _cost, repo, shard, cat_name in units
+            }
+            for future in concurrent.futures.as_completed(futures):
+                repo, shard, cat_name = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = (AnalyzerResult(category=cat_name, error=str(e) or type(e).__name__), None)
+                repo.outcomes[(shard, cat_name)] = outcome
+                if len(repo.outcomes) == repo.units:
+                    finish(repo, _combine(repo, profile_name), cached=False)
+
+    writer.fleet(scores, errors, seconds=time.monotonic() - started)
+    return scores
@@ -0,0 +1,572 @@
+"""Score history across commits (``python-doctor history``).
+
+Commits are never checked out. Trees and blobs are read through one
+``git cat-file --batch`` process (see :mod:`python_doctor.gitobjects`).
+Every analyzer finding is per file, and a file's findings depend only on
+its path, its content, the packages above it and the tool configuration
+and top-level packages of the tree. They are cached on exactly that, in
+``.python-doctor/blobs.sqlite``, keyed by blob id: scoring N commits
+analyzes the oldest tree once plus each file version that appears later,
+and a repeated run analyzes nothing.
+
+File versions still to analyze are written to temporary directories, at
+most one version of each path per directory, and every tool runs once
+per batch of those directories. Each commit is then scored from the
+cached findings: suppression, caps and the project-wide checks (import
+cycles, test and type-hint ratios, project health) run per commit, on a
+skeleton of its tree holding the config and health files.
+"""
+
+import concurrent.futures
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from .fingerprint import INDEX_SKIP_DIRS, scan_key
+from .gitobjects import CatFile, Commit, first_parent_commits, locate, write_blob
+from .registry import ANALYZERS, load_analyzer, rescore
+from .rules import CATEGORIES, AnalyzerResult, Finding
+from .runner import make_suppressor, merged_settings
+from .scorer import category_score, compute_score
+from .state import STATE_DIR
+
+BLOB_CACHE_FILE = "blobs.sqlite"
+
+# Root files read by the config, profile and project-health checks.
+_ROOT_FILES = frozenset({
+    "README.md", "README.rst", "README", "LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE", ".gitignore",
+    "pyproject.toml", "setup.cfg", "ruff.toml", "mypy.ini", "pyrightconfig.json", ".mypy.ini",
+})
+# Tool configuration, at any depth: part of the cache key and copied next to analyzed files.
+_TOOL_CONFIG_FILES = frozenset({"pyproject.toml", "setup.cfg", "ruff.toml", ".ruff.toml"})
+
+# Version directories handed to one run of each external tool.
+_DIRS_PER_TOOL_RUN = 16
+
+
+class BlobCache:
+    """Per-file analysis results keyed by configuration, path and version (see :func:`_versions`).
+
+    Stored in SQLite at *db_path*, or kept in memory when it is None.
+    """
+
+    def __init__(self, db_path: str | None):
+        if db_path is not None:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path or ":memory:")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "config TEXT, path TEXT, version TEXT, data TEXT, PRIMARY KEY (config, path, version))"
+        )
+
+    def get(self, config: str, rel: str, version: str) -> dict | None:
+        row = self._db.execute(
+            "SELECT data FROM files WHERE config = ? AND path = ? AND version = ?", (config, rel, version)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_many(self, config: str, entries: dict[tuple[str, str], dict]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                [(config, rel, ver, json.dumps(entry, default=sorted)) for (rel, ver), entry in entries.items()],
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+@dataclass
+class HistoryPoint:
+    """The score of one commit."""
+
+    commit: str
+    timestamp: int
+    subject: str
+    score: int
+    categories: dict[str, int]
+    files: int
+    changed: int
+    analyzed: int
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def date(self) -> str:
+        return datetime.fromtimestamp(self.timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def to_dict(self) -> dict:
+        return {
+            "commit": self.commit,
+            "date": self.date,
+            "subject": self.subject,
+            "score": self.score,
+            "categories": self.categories,
+            "files": self.files,
+            "changed": self.changed,
+            "analyzed": self.analyzed,
+            "errors": self.errors,
+        }
+
+
+def _first_party(files: dict[str, str]) -> list[str]:
+    """Top-level packages, at the root and under ``src/``, each as ``name/``.
+
+    Ruff's import sorting tells first-party imports by what exists there,
+    so lint results depend on them. Only directories holding an
+    ``__init__.py`` count, so adding a root file or a directory that is not
+    a package keeps every cached result; imports of root modules and
+    namespace packages are sorted as third-party.
+    """
+    names = set()
+    for rel in files:
+        parts = rel.split("/")
+        if parts[-1] != "__init__.py":
+            continue
+        if len(parts) == 2:
+            names.add(f"{parts[0]}/")
+        elif len(parts) == 3 and parts[0] == "src":
+            names.add(f"src/{parts[1]}/")
+    return sorted(names)
+
+
+def _config_key(key: str, files: dict[str, str]) -> str:
+    """Cache namespace: tool versions, every tool configuration file and the top-level packages."""
+    h = hashlib.blake2b(key.encode(), digest_size=16)
+    for rel in sorted(rel for rel in files if rel.rsplit("/", 1)[-1] in _TOOL_CONFIG_FILES):
+        h.update(f"\0{rel}\0{files[rel]}".encode())
+    for name in _first_party(files):
+        h.update(f"\0{name}".encode())
+    return h.hexdigest()
+
+
+def _ancestors(rel: str) -> list[str]:
+    """Directories above *rel*, the root (``""``) first."""
+    parts = rel.split("/")[:-1]
+    return ["", *("/".join(parts[:i + 1]) for i in range(len(parts)))]
+
+
+def _versions(files: dict[str, str]) -> dict[str, str]:
+    """Version id of every Python file in a tree: its blob id and package chain.
+
+    The chain has one ``1`` or ``0`` per directory above the file, telling
+    whether it holds an ``__init__.py``: it decides the file's package,
+    which its lint results depend on.
+    """
+    packages = {rel.rpartition("/")[0] for rel in files if rel.rpartition("/")[2] == "__init__.py"}
+    return {
+        rel: f"{blob}:{''.join('1' if d in packages else '0' for d in _ancestors(rel))}"
+        for rel, blob in files.items()
+        if rel.endswith(".py")
+    }
+
+
+def _abs(root: str, rel: str) -> str:
+    return os.path.join(root, *rel.split("/"))
+
+
+def _empty_entry() -> dict:
+    return {"findings": {}, "imports": None, "structure": None}
+
+
+def _run_tool_category(mod: str, roots: list[str]) -> dict[str, tuple[AnalyzerResult, dict | None]]:
+    """Run one analyzer over every root, without suppression or caps beyond the defaults."""
+    analyzer = load_analyzer(mod)
+    outcomes = {}
+    if hasattr(analyzer, "fetch_batch"):
+        for start in range(0, len(roots), _DIRS_PER_TOOL_RUN):
+            chunk = roots[start:start + _DIRS_PER_TOOL_RUN]
+            try:
+                batch = analyzer.fetch_batch(chunk)
+            except Exception:
+                batch = {}
+            for root in chunk:
+                outcomes[root] = (analyzer.analyze(path=root, items=batch.get(root)), None)
+    elif hasattr(analyzer, "analyze_shard"):
+        for root in roots:
+            outcomes[root] = analyzer.analyze_shard(path=root)
+    else:
+        for root in roots:
+            outcomes[root] = (analyzer.analyze(path=root), None)
+    return outcomes
+
+
+def _pack(missing: list[tuple[str, str]]) -> list[tuple[dict[str, str], dict[str, str]]]:
+    """Group file versions into as few version directories as possible.
+
+    Each group holds at most one version of a path, and its members agree
+    on which directories are packages. Returns ``(members, packages)``
+    pairs: path to version, and directory to ``1`` or ``0``.
+    """
+    groups: list[tuple[dict[str, str], dict[str, str]]] = []
+    for rel, version in missing:
+        need = dict(zip(_ancestors(rel), version.split(":")[1]))
+        for members, packages in groups:
+            if rel not in members and all(packages.get(d, flag) == flag for d, flag in need.items()):
+                break
+        else:
+            members, packages = {}, {}
+            groups.append((members, packages))
+        members[rel] = version
+        packages.update(need)
+    return groups
+
+
+def _add_outcome(stored: dict, paths: dict, cat_name: str, result: AnalyzerResult, facts: dict | None) -> None:
+    """Add one analyzer's findings and per-file facts in a version directory to *stored* entries."""
+    for f in result.findings:
+        member = paths.get(os.path.normpath(f.file))
+        if member is not None:
+            stored[member]["findings"].setdefault(cat_name, []).append([f.rule, f.message, f.line, f.severity, f.cost])
+    for fp, data in (facts or {}).get("files", {}).items():
+        member = paths.get(os.path.normpath(fp))
+        if member is not None:
+            stored[member][cat_name] = data
+
+
+def _skeleton_layout(files: dict[str, str]) -> tuple[dict[str, str], set[str]]:
+    """The files and directories of a commit's skeleton: what the per-commit checks read.
+
+    Root config and health files map to their blob; ``py.typed`` markers,
+    root modules and top-level package ``__init__.py`` files, which the
+    checks only test for, map to ``""`` (empty). Every directory of the
+    tree is kept.
+    """
+    wanted: dict[str, str] = {}
+    dirs: set[str] = set()
+    for rel, blob in files.items():
+        parent, _, name = rel.rpartition("/")
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+        depth = rel.count("/")
+        if depth == 0 and name in _ROOT_FILES:
+            wanted[rel] = blob
+        elif name == "py.typed" or (depth == 0 and name.endswith(".py")) or (depth == 1 and name == "__init__.py"):
+            wanted[rel] = ""
+    return wanted, dirs
+
+
+@dataclass
+class ScoredCommit:
+    """One commit scored by :class:`CommitScorer`.
+
+    Finding paths in *results* are under the scorer's skeleton directory;
+    :meth:`CommitScorer.relative` turns them into repository paths.
+    """
+
+    commit: Commit
+    versions: dict[str, str]
+    results: list[AnalyzerResult]
+    errors: dict[str, str]
+
+    @property
+    def score(self) -> int:
+        return compute_score(self.results)
+
+
+class CommitScorer:
+    """Scores commits of the repository holding *path* from the per-file cache.
+
+    Use as a context manager: it owns the ``git cat-file`` process, the
+    cache and the scratch directories. Only *path*'s part of each tree is
+    scored. With *use_cache*, per-file results are read from and written to
+    ``<path>/.python-doctor/blobs.sqlite``; otherwise they last for the
+    scorer's lifetime.
+    """
+
+    def __init__(self, path: str, profile_name: str | None = None, use_cache: bool = True):
+        self.path = path
+        self.top, self.prefix = locate(path)
+        self.profile_name = profile_name
+        self.use_cache = use_cache
+        self.key = scan_key()
+        self.entries: dict[tuple[str, str, str], dict] = {}
+        self.errors: dict[tuple[str, str, str], dict[str, str]] = {}
+        self._skeleton_files: dict[str, str] = {}
+        self._skeleton_dirs: set[str] = set()
+        self._layers = 0
+
+    def __enter__(self):
+        self.cat = CatFile(self.top)
+        self.cache = BlobCache(os.path.join(self.path, STATE_DIR, BLOB_CACHE_FILE) if self.use_cache else None)
+        self._scratch = tempfile.TemporaryDirectory(prefix="python-doctor-history-")
+        # Tools report resolved paths; match them against resolved version directories.
+        self.scratch = os.path.realpath(self._scratch.name)
+        self.skeleton = os.path.join(self.scratch, "tree")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cat.close()
+        self.cache.close()
+        self._scratch.cleanup()
+
+    def relative(self, file: str) -> str:
+        """Repository-relative (to *path*) form of a finding path, ``/``-separated."""
+        return os.path.relpath(file, self.skeleton).replace(os.sep, "/") if file else ""
+
+    def _tree(self, sha: str) -> tuple[Commit, dict[str, str]] | None:
+        """A commit and the files of *path*'s tree in it, or None if it has no such tree."""
+        commit = self.cat.commit(sha)
+        tree = self.cat.subtree(commit.tree, self.prefix)
+        if tree is None:
+            return None
+        return commit, self.cat.files(tree, INDEX_SKIP_DIRS)
+
+    def prepare(self, shas: list[str], progress=None) -> dict[str, int]:
+        """Analyze, in one batch, every file version of these commits not yet cached.
+
+        Returns, per commit that has *path*, how many of its file versions
+        were first analyzed here. *progress* is called with a status
+        message before the analysis.
+        """
+        pending: dict[str, tuple[dict[str, str], list[tuple[str, str]]]] = {}
+        new_versions: dict[str, int] = {}
+        for sha in shas:
+            tree = self._tree(sha)
+            if tree is None:
+                continue
+            files = tree[1]
+            config = _config_key(self.key, files)
+            missing = self.lookup(config, _versions(files))
+            if missing:
+                pending.setdefault(config, (files, []))[1].extend(missing)
+            new_versions[sha] = len(missing)
+        if pending:
+            if progress:
+                progress(f"Analyzing {sum(new_versions.values())} new file versions")
+            self.analyze(pending)
+        return new_versions
+
+    def score_commit(self, sha: str) -> ScoredCommit | None:
+        """Score one commit, analyzing its uncached file versions first; None if it lacks *path*."""
+        tree = self._tree(sha)
+        if tree is None:
+            return None
+        commit, files = tree
+        versions = _versions(files)
+        config = _config_key(self.key, files)
+        missing = self.lookup(config, versions)
+        if missing:
+            self.analyze({config: (files, missing)})
+        results, errors = self.score(config, files, versions)
+        return ScoredCommit(commit, versions, results, errors)
+
+    def lookup(self, config: str, versions: dict[str, str]) -> list[tuple[str, str]]:
+        """Load cached entries for one commit's Python files; return the ``(path, version)`` still missing."""
+        missing = []
+        for rel, version in versions.items():
+            if (config, rel, version) in self.entries:
+                continue
+            entry = self.cache.get(config, rel, version)
+            if entry is None:
+                missing.append((rel, version))
+                entry = _empty_entry()
+            self.entries[(config, rel, version)] = entry
+        return missing
+
+    def _layer(self, files: dict[str, str], members: dict[str, str], packages: dict[str, str]) -> tuple[str, dict]:
+        """Write one version directory; return it and its files' paths mapped to ``(path, version)``.
+
+        Besides *members*, it holds the tool configuration of *files*, its
+        top-level package directories and an empty ``__init__.py`` in each
+        directory that *packages* marks as a package.
+        """
+        root = os.path.join(self.scratch, f"v{self._layers}")
+        self._layers += 1
+        for rel, blob in files.items():
+            if rel.rsplit("/", 1)[-1] in _TOOL_CONFIG_FILES:
+                write_blob(self.cat, blob, _abs(root, rel))
+        for name in _first_party(files):
+            os.makedirs(_abs(root, name.rstrip("/")), exist_ok=True)
+        placeholders = [f"{d}/__init__.py" if d else "__init__.py" for d, flag in packages.items() if flag == "1"]
+        for rel in placeholders:
+            if rel not in members:
+                os.makedirs(os.path.dirname(_abs(root, rel)), exist_ok=True)
+                open(_abs(root, rel), "wb").close()
+        paths = {}
+        for rel, version in members.items():
+            write_blob(self.cat, version.split(":")[0], _abs(root, rel))
+            paths[_abs(root, rel)] = (rel, version)
+        return root, paths
+
+    def analyze(self, pending: dict[str, tuple[dict[str, str], list[tuple[str, str]]]]) -> None:
+        """Analyze file versions not in the cache and store their results.
+
+        *pending* maps each configuration to the files of a tree that has
+        it and the ``(path, version)`` pairs still to analyze (packed into
+        directories by :func:`_pack`).
+        """
+        layers = []
+        for config, (files, missing) in pending.items():
+            for members, packages in _pack(missing):
+                layers.append((*self._layer(files, members, packages), config))
+
+        roots = [root for root, _paths, _config in layers]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(ANALYZERS), os.cpu_count() or 4)) as pool:
+            futures = {cat_name: pool.submit(_run_tool_category, mod, roots) for cat_name, mod in ANALYZERS}
+            outcomes = {cat_name: future.result() for cat_name, future in futures.items()}
+
+        for root, paths, config in layers:
+            self._store(config, paths, {cat_name: by_root[root] for cat_name, by_root in outcomes.items()})
+            shutil.rmtree(root, ignore_errors=True)
+
+    def _store(self, config: str, paths: dict, outcomes: dict[str, tuple[AnalyzerResult, dict | None]]) -> None:
+        """File one version directory's analyzer *outcomes* under its file versions.
+
+        They are cached unless a tool failed, so a later run retries it.
+        """
+        stored = {member: self.entries[(config, *member)] for member in paths.values()}
+        errors = {}
+        for cat_name, (result, facts) in outcomes.items():
+            if result.error:
+                errors[cat_name] = result.error
+            _add_outcome(stored, paths, cat_name, result, facts)
+        if errors:
+            for member in stored:
+                self.errors[(config, *member)] = errors
+        else:
+            self.cache.put_many(config, stored)
+
+    def _sync_skeleton(self, files: dict[str, str]) -> None:
+        """Make the skeleton directory mirror :func:`_skeleton_layout` of a commit's tree."""
+        wanted, dirs = _skeleton_layout(files)
+        for rel in self._skeleton_files.keys() - wanted.keys():
+            os.remove(_abs(self.skeleton, rel))
+        for rel in sorted(self._skeleton_dirs - dirs, reverse=True):
+            shutil.rmtree(_abs(self.skeleton, rel), ignore_errors=True)
+        for rel in sorted(dirs - self._skeleton_dirs):
+            os.makedirs(_abs(self.skeleton, rel), exist_ok=True)
+        os.makedirs(self.skeleton, exist_ok=True)
+        for rel, blob in wanted.items():
+            if self._skeleton_files.get(rel) == blob:
+                continue
+            dest = _abs(self.skeleton, rel)
+            if blob:
+                write_blob(self.cat, blob, dest)
+            else:
+                open(dest, "wb").close()
+        self._skeleton_files = wanted
+        self._skeleton_dirs = dirs
+
+    def score(
+        self, config: str, files: dict[str, str], versions: dict[str, str]
+    ) -> tuple[list[AnalyzerResult], dict[str, str]]:
+        """Score one commit's tree from the per-file entries; return results and tool errors."""
+        self._sync_skeleton(files)
+        root = self.skeleton
+        max_deduction, suppressed, per_file = merged_settings(root, self.profile_name)
+        suppress = make_suppressor(root, suppressed, per_file)
+        _result, tree_facts = load_analyzer("structure").analyze_shard(path=root, include=lambda _fp: False)
+
+        findings: dict[str, list[Finding]] = {cat_name: [] for cat_name, _mod in ANALYZERS}
+        facts = {"imports": {"files": {}}, "structure": {**tree_facts, "files": {}}}
+        errors: dict[str, str] = {}
+        for rel, version in versions.items():
+            entry = self.entries[(config, rel, version)]
+            errors.update(self.errors.get((config, rel, version), {}))
+            file = _abs(root, rel)
+            for cat_name, items in entry["findings"].items():
+                findings[cat_name].extend(
+                    Finding(cat_name, rule, message, file=file, line=line, severity=severity, cost=cost)
+                    for rule, message, line, severity, cost in items
+                )
+            for cat_name in facts:
+                if entry[cat_name] is not None:
+                    facts[cat_name]["files"][file] = entry[cat_name]
+
+        results = []
+        for cat_name, _mod in ANALYZERS:
+            cap = max_deduction.get(cat_name, CATEGORIES[cat_name]["max_deduction"])
+            result = rescore(cat_name, cap, suppress, findings[cat_name], facts.get(cat_name))
+            result.error = errors.get(cat_name)
+            results.append(result)
+        return results, errors
+
+
+def score_history(
+    path: str,
+    last: int,
+    rev: str = "HEAD",
+    profile_name: str | None = None,
+    use_cache: bool = True,
+    progress=None,
+) -> list[HistoryPoint]:
+    """Score *path* at each of the last *last* first-parent commits of *rev*, oldest first.
+
+    *path* may be a subdirectory of the repository; commits in which it
+    does not exist are left out. *use_cache* is as for
+    :class:`CommitScorer`. *progress*, if given, is called with a short
+    status message before each long step. Raises
+    :class:`~python_doctor.gitobjects.GitError` if *path* is not in a git
+    repository or *rev* does not exist.
+    """
+    with CommitScorer(path, profile_name, use_cache) as scorer:
+        shas = first_parent_commits(scorer.top, rev, last)
+        if progress:
+            progress(f"Reading {len(shas)} commits")
+        new_versions = scorer.prepare(shas, progress)
+        points = []
+        previous: dict[str, str] = {}
+        for sha in shas:
+            scored = scorer.score_commit(sha)
+            if scored is None:
+                continue
+            py_files = {rel: version.split(":")[0] for rel, version in scored.versions.items()}
+            changed = sum(1 for rel in py_files.keys() | previous.keys() if py_files.get(rel) != previous.get(rel))
+            points.append(HistoryPoint(
+                commit=sha,
+                timestamp=scored.commit.timestamp,
+                subject=scored.commit.subject,
+                score=scored.score,
+                categories={r.category: category_score(r) for r in scored.results},
+                files=len(py_files),
+                changed=changed if previous else len(py_files),
+                analyzed=new_versions[sha],
+                errors=scored.errors,
+            ))
+            previous = py_files
+    return points
+
+
+def write_history_json(points: list[HistoryPoint], path: str, rev: str, out) -> None:
+    json.dump({"path": path, "rev": rev, "commits": [p.to_dict() for p in points]}, out, indent=2)
+    out.write("\n")
+
+
+def write_history_csv(points: list[HistoryPoint], out) -> None:
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["commit", "date", "score", *CATEGORIES, "files", "changed", "analyzed", "subject"])
+    for p in points:
+        writer.writerow([
+            p.commit, p.date, p.score, *(p.categories.get(cat, "") for cat in CATEGORIES),
+            p.files, p.changed, p.analyzed, p.subject,
+        ])
+
+
+def format_history(points: list[HistoryPoint], rev: str) -> str:
+    """Text table of the score per commit, oldest first."""
+    lines = [f"📈 Score history: last {len(points)} commits of {rev}"]
+    if not points:
+        lines.append("  No commits contain this path.")
+        return "\n".join(lines)
+    lines.append(f"  {'commit':<9} {'date':<10} {'score':>5} {'Δ':>4} {'files':>6} {'changed':>7}  subject")
+    previous = None
+    for p in points:
+        delta = "" if previous is None else f"{p.score - previous:+d}"
+        subject = p.subject if len(p.subject) <= 60 else p.subject[:57] + "..."
+        lines.append(
+            f"  {p.commit[:9]:<9} {p.date[:10]:<10} {p.score:>5} {delta:>4} {p.files:>6} {p.changed:>7}  {subject}"
+        )
+        previous = p.score
+    first, last = points[0].score, points[-1].score
+    lines.append(f"  {first} → {last} ({last - first:+d}) over {len(points)} commits")
+    errors = {cat: msg for p in points for cat, msg in p.errors.items()}
+    for cat, msg in errors.items():
+        lines.append(f"  ⚠️  {cat}: {msg}")
+    return "\n".join(lines)
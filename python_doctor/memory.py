@@ -0,0 +1,186 @@
+"""Memory profiling for scans (``--memory-report``).
+
+Uses :mod:`tracemalloc` to measure the Python heap of each analyzer and
+the ``RUSAGE_CHILDREN`` high-water mark for the external tools. Analyzers
+are run one at a time while profiling, since tracemalloc cannot attribute
+allocations to concurrently running threads, and tracing makes the
+in-process analyzers several times slower.
+"""
+
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+DEFAULT_TOP_SITES = 10
+# Deep enough to get from ast.parse / json.loads back to the calling
+# analyzer; every extra frame makes traced allocations slower.
+_TRACEBACK_FRAMES = 4
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_KIB = 1024
+_MIB = 1024 * 1024
+
+
+def _children_maxrss() -> int:
+    """Peak RSS in bytes of the largest reaped child process so far."""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def findings_size(findings: list) -> int:
+    """Approximate bytes held by a findings list: the list, the objects and their distinct strings."""
+    size = sys.getsizeof(findings)
+    strings: dict[int, int] = {}
+    for f in findings:
+        size += sys.getsizeof(f)
+        for value in (f.category, f.rule, f.message, f.file, f.severity):
+            strings.setdefault(id(value), sys.getsizeof(value))
+    return size + sum(strings.values())
+
+
+@dataclass
+class AnalyzerMemory:
+    """Memory used by one analyzer run."""
+
+    name: str
+    peak: int = 0
+    retained: int = 0
+    tool_rss: int | None = None
+    findings: int = 0
+    findings_bytes: int = 0
+    sites: list[tuple[str, int, int]] = field(default_factory=list)
+
+
+class _AnalyzerMeasure:
+    """Context manager measuring heap use around one analyzer run."""
+
+    def __init__(self, report: "MemoryReport", name: str):
+        self._report = report
+        self._entry = AnalyzerMemory(name)
+
+    def __enter__(self) -> AnalyzerMemory:
+        self._before = tracemalloc.take_snapshot()
+        self._base = tracemalloc.get_traced_memory()[0]
+        self._rss = _children_maxrss()
+        tracemalloc.reset_peak()
+        return self._entry
+
+    def __exit__(self, *exc) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        entry = self._entry
+        entry.peak = peak - self._base
+        entry.retained = current - self._base
+        rss = _children_maxrss()
+        # The children high-water mark only moves when this analyzer's tool
+        # used more memory than every earlier tool.
+        entry.tool_rss = rss if rss > self._rss else None
+        diff = tracemalloc.take_snapshot().compare_to(self._before, "traceback")
+        entry.sites = _own_sites(diff, self._report.top_sites)
+        self._report.analyzers[entry.name] = entry
+
+
+def _own_sites(diffs, top: int) -> list[tuple[str, int, int]]:
+    """Group allocation growth by the innermost frame in python_doctor's own code.
+
+    Allocations made by the profiler itself (the snapshots) are skipped.
+    Returns ``(location, bytes, blocks)`` for the largest *top* sites.
+    """
+    sites: dict[str, list[int]] = {}
+    for stat in diffs:
+        if stat.size_diff <= 0:
+            continue
+        for frame in reversed(stat.traceback):
+            if frame.filename == __file__:
+                break
+            if frame.filename.startswith(_PACKAGE_DIR):
+                where = f"{os.path.relpath(frame.filename, _PACKAGE_DIR)}:{frame.lineno}"
+                totals = sites.setdefault(where, [0, 0])
+                totals[0] += stat.size_diff
+                totals[1] += stat.count_diff
+                break
+    ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)
+    return [(where, size, count) for where, (size, count) in ranked[:top]]
+
+
+class MemoryReport:
+    """Per-analyzer peak and retained memory for one scan."""
+
+    key = "memory"
+
+    def __init__(self, top_sites: int = DEFAULT_TOP_SITES):
+        self.top_sites = top_sites
+        self.analyzers: dict[str, AnalyzerMemory] = {}
+        self.peak = 0
+        self._started_here = False
+
+    def start(self) -> None:
+        """Start tracing allocations (if nobody else already is)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEBACK_FRAMES)
+            self._started_here = True
+
+    def stop(self) -> None:
+        """Stop tracing and record the overall traced peak."""
+        self.peak = tracemalloc.get_traced_memory()[1]
+        if self._started_here:
+            tracemalloc.stop()
+
+    def measure(self, name: str) -> _AnalyzerMeasure:
+        """Measure analyzer *name* (run it inside the block)."""
+        return _AnalyzerMeasure(self, name)
+
+    def record_results(self, results: list) -> None:
+        """Record the number and size of the findings each category kept."""
+        for r in results:
+            entry = self.analyzers.setdefault(r.category, AnalyzerMemory(r.category))
+            entry.findings = len(r.findings)
+            entry.findings_bytes = findings_size(r.findings)
+
+    def to_dict(self, root: str) -> dict:
+        """JSON-ready summary; all sizes in bytes."""
+        return {
+            "peak": self.peak,
+            "analyzers": {
+                name: {
+                    "peak": m.peak,
+                    "retained": m.retained,
+                    "tool_rss": m.tool_rss,
+                    "findings": m.findings,
+                    "findings_bytes": m.findings_bytes,
+                    "sites": [{"site": where, "bytes": size, "blocks": count} for where, size, count in m.sites],
+                }
+                for name, m in self.analyzers.items()
+            },
+        }
+
+    def format_table(self, root: str) -> str:
+        """Human-readable memory table, largest peak first."""
+        lines = [
+            "🧠 Memory (MiB)",
+            f"{'analyzer':<12} {'peak':>8} {'retained':>9} {'tool rss':>9} {'findings':>9} {'KiB':>8}",
+        ]
+        ranked = sorted(self.analyzers.values(), key=lambda m: m.peak, reverse=True)
+        for m in ranked:
+            rss = f"{m.tool_rss / _MIB:>9.1f}" if m.tool_rss is not None else f"{'-':>9}"
+            lines.append(
+                f"{m.name:<12} {m.peak / _MIB:>8.1f} {m.retained / _MIB:>9.1f} {rss}"
+                f" {m.findings:>9} {m.findings_bytes / _KIB:>8.1f}"
+            )
+        lines.append(f"{'total':<12} {self.peak / _MIB:>8.1f}")
+        sites = sorted(
+            ((size, where, m.name) for m in ranked for where, size, _count in m.sites), reverse=True
+        )[: self.top_sites]
+        if sites:
+            lines.append("")
+            lines.append("Top retained allocation sites:")
+            for size, where, name in sites:
+                lines.append(f"  {size / _MIB:8.2f}  {where} ({name})")
+        return "\n".join(lines)
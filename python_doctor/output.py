@@ -0,0 +1,199 @@
+"""Printing scan results: the text report, the badge, JSON payloads and exit codes.
+
+Shared by the scan and the subcommands that report merged results. Like the
+CLI, this imports scoring modules only inside the functions that use them.
+"""
+
+import os
+import sys
+
+from . import __version__
+
+MAX_FINDINGS_DISPLAY = 5
+
+
+def format_finding(f, path: str) -> str:
+    """Format a single finding for display."""
+    rel = os.path.relpath(f.file, path) if f.file else ""
+    loc = f"{rel}:{f.line}" if f.line else rel
+    icon = "⚠" if f.severity in ("warning", "low", "medium") else "✗"
+    return f"  {icon} {f.rule}: {f.message}" + (f" ({loc})" if loc else "")
+
+
+def _format_delta_suffix(delta: dict | None) -> str:
+    """Return ASCII suffix for the score header, e.g. '  [+3 from last run]'."""
+    if not delta or not delta.get("has_previous"):
+        return ""
+    total = delta["total_delta"]
+    baseline = delta.get("baseline", "last run")
+    if total > 0:
+        body = f"+{total} from {baseline}"
+    elif total < 0:
+        body = f"{total} from {baseline}"
+    else:
+        body = "no change"
+    return f"  [{body}]"
+
+
+def print_report(results, path: str, verbose: bool = False, delta: dict | None = None):
+    """Print the full health report to stdout."""
+    from .rules import CATEGORIES
+    from .scorer import category_score, compute_score, score_label
+
+    print(f"\n🐍 Python Doctor v{__version__}")
+    print(f"Scanning: {path}\n")
+
+    score = compute_score(results)
+    label = score_label(score)
+    suffix = _format_delta_suffix(delta)
+    print(f"📊 Score: {score}/100 ({label}){suffix}\n")
+
+    for result in results:
+        cat = CATEGORIES[result.category]
+        cat_sc = category_score(result)
+        emoji = cat["emoji"]
+        name = cat["label"]
+        max_d = cat["max_deduction"]
+
+        if result.error:
+            print(f"{emoji} {name} — ⚠ {result.error}")
+            continue
+
+        count = result.finding_count
+        check = " ✓" if not count else ""
+        print(f"{emoji} {name} ({cat_sc}/{max_d}){check}")
+
+        if not count:
+            print("  ✓ All clear.")
+        else:
+            limit = None if verbose else MAX_FINDINGS_DISPLAY
+            shown = result.findings[:limit]
+            for f in shown:
+                print(format_finding(f, path))
+            remaining = count - len(shown)
+            if remaining > 0:
+                print(f"  ... and {remaining} more")
+        print()
+
+    if delta and delta.get("has_previous") and delta.get("total_delta", 0) < 0:
+        top = delta.get("top_regression")
+        if top:
+            cat_name, drop = top
+            label = CATEGORIES.get(cat_name, {}).get("label", cat_name)
+            points = abs(drop)
+            word = "point" if points == 1 else "points"
+            print(f"Regression: {label} dropped {points} {word}.")
+            print()
+
+
+def _badge_color(score: int) -> str:
+    """Return shields.io color for a given score."""
+    if score >= 90:
+        return "brightgreen"
+    if score >= 75:
+        return "green"
+    if score >= 50:
+        return "yellow"
+    return "red"
+
+
+def print_badge(score: int):
+    """Print a shields.io badge markdown snippet."""
+    color = _badge_color(score)
+    encoded = f"{score}%2F100"
+    url = f"https://img.shields.io/badge/python--doctor-{encoded}-{color}"
+    print(f"[![python-doctor]({url})](https://github.com/saikatkumardey/python-doctor)")
+    print()
+    print("Add this to your README.md. To auto-update the score on every push,")
+    print("run: python-doctor --ci > .github/workflows/python-doctor.yml")
+
+
+def build_json_output(results, path: str, score: int, delta: dict) -> dict:
+    """Build the JSON output payload. Returns a dict ready for json.dumps."""
+    from .rules import CATEGORIES
+    from .scorer import category_score, score_label
+
+    output = {
+        "version": __version__,
+        "path": path,
+        "score": score,
+        "label": score_label(score),
+        "categories": {},
+        "delta": {
+            "total": delta["total_delta"],
+            "categories": delta["category_deltas"],
+            "has_previous": delta["has_previous"],
+        },
+    }
+    for r in results:
+        cat = CATEGORIES[r.category]
+        output["categories"][r.category] = {
+            "score": category_score(r),
+            "max": cat["max_deduction"],
+            "deduction": r.deduction,
+            "error": r.error,
+            "findings": [
+                {"rule": f.rule, "message": f.message, "file": f.file, "line": f.line, "severity": f.severity}
+                for f in r.findings
+            ],
+        }
+    return output
+
+
+def open_output(args):
+    """Return a context manager yielding the stream for machine-readable output."""
+    import contextlib
+
+    if args.output and args.format != "text":
+        return open(args.output, "w", encoding="utf-8")
+    return contextlib.nullcontext(sys.stdout)
+
+
+def emit_output(args, results, path: str, score: int, delta: dict, out=None, diagnostics=()) -> None:
+    """Dispatch on output mode: --score / --format / default report.
+
+    *diagnostics* are the ``--timings`` / ``--memory-report`` summaries.
+    They go into the JSON payload or ndjson stream, after the text report,
+    or to stderr when stdout must carry only the score or a compact report.
+    """
+    import json
+
+    from .report import NdjsonWriter, write_compact_report
+
+    out = out if out is not None else sys.stdout
+    pending = list(diagnostics)
+    if args.score:
+        print(score)
+    elif args.format == "json":
+        output = build_json_output(results, path, score, delta)
+        for report in pending:
+            output[report.key] = report.to_dict(path)
+        pending = []
+        print(json.dumps(output, indent=None if args.compact else 2), file=out)
+    elif args.format == "ndjson":
+        # Findings and categories were streamed during the scan.
+        writer = NdjsonWriter(out)
+        for report in pending:
+            writer.diagnostics(report.key, report.to_dict(path))
+        pending = []
+        writer.score(path, score, delta)
+    elif args.format == "compact":
+        write_compact_report(out, results, path, score, delta, indent=not args.compact)
+    else:
+        print_report(results, path, verbose=args.verbose, delta=delta)
+        for report in pending:
+            print(report.format_table(path))
+            print()
+        pending = []
+    for report in pending:
+        print(report.format_table(path), file=sys.stderr)
+
+
+def compute_exit_code(score: int, args, delta: dict) -> int:
+    """Compute exit code based on score threshold and --strict regression check."""
+    threshold = args.min_score if args.min_score is not None else 50
+    if score < threshold:
+        return 1
+    if args.strict and delta["has_previous"] and delta["total_delta"] < 0:
+        return 2
+    return 0
@@ -0,0 +1,72 @@
+"""The analyzers, the scan levels that run them, and scoring a category's findings.
+
+The runner, cost model, sharding, baseline and history code all need these,
+so they live here, apart from any of them.
+"""
+
+import importlib
+
+from .analyzers._util import FindingSink
+from .rules import AnalyzerResult
+
+# (category, module in python_doctor.analyzers), in output order.
+ANALYZERS = [
+    ("security", "bandit_analyzer"),
+    ("lint", "ruff_analyzer"),
+    ("complexity", "complexity"),
+    ("structure", "structure"),
+    ("imports", "imports_analyzer"),
+    ("exceptions", "exceptions_analyzer"),
+    ("zen", "zen_analyzer"),
+]
+
+# Scan levels (--level). quick runs only the in-process analyzers; deep
+# adds DEEP_ANALYZERS, whose findings are scored with their category's.
+LEVELS = ("quick", "standard", "deep")
+TOOL_CATEGORIES = frozenset({"security", "lint", "complexity"})
+DEEP_ANALYZERS = [
+    ("lint", "vulture_analyzer"),
+]
+
+
+def load_analyzer(module_name: str):
+    """Import an analyzer module on first use."""
+    return importlib.import_module(f"{__package__}.analyzers.{module_name}")
+
+
+def job_name(cat_name: str, mod: str) -> str:
+    """Name of one analyzer run: its category, or the tool for the extra deep analyzers."""
+    return mod.removesuffix("_analyzer") if (cat_name, mod) in DEEP_ANALYZERS else cat_name
+
+
+def level_jobs(level: str = "standard") -> list[tuple[str, str]]:
+    """The ``(category, module)`` analyzer runs of a scan *level*."""
+    if level == "quick":
+        return [(cat, mod) for cat, mod in ANALYZERS if cat not in TOOL_CATEGORIES]
+    if level == "deep":
+        return ANALYZERS + DEEP_ANALYZERS
+    return list(ANALYZERS)
+
+
+def skipped_error(level: str) -> str:
+    """Error of the empty result a category not run at *level* gets."""
+    return f"not run at --level {level}"
+
+
+def rescore(
+    cat_name: str, cap: float, suppress, findings, facts: dict | None = None, suppressed: int = 0
+) -> AnalyzerResult:
+    """Score one category's *findings* together, as a single analyzer run would.
+
+    *suppress* is the ``suppress(rule, file)`` predicate and *suppressed* the
+    number of findings already suppressed upstream. With *facts*, the
+    merged facts of an analyzer with project-wide checks, those checks run
+    too.
+    """
+    sink = FindingSink(cat_name, cap, suppress=suppress)
+    sink.suppressed += suppressed
+    for finding in findings:
+        sink.add(finding)
+    if facts is not None:
+        load_analyzer(dict(ANALYZERS)[cat_name]).check_facts(facts, sink)
+    return sink.finish()
@@ -0,0 +1,208 @@
+"""Find the commit that lowered the score (``python-doctor bisect GOOD BAD``).
+
+The first-parent commits after GOOD up to BAD are binary-searched for the
+first one whose score (or one category's score) is lower than GOOD's, as
+:func:`~python_doctor.state.compute_delta` measures it. Probes are scored
+by a :class:`~python_doctor.history.CommitScorer`, so each one analyzes
+only file versions not already in the blob cache, and the result lists
+the findings the first bad commit introduced over its parent.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from .gitobjects import GitError, first_parent_range, resolve_commit
+from .history import CommitScorer, ScoredCommit
+from .rules import CATEGORIES
+from .scorer import category_score
+from .state import compute_delta
+
+
+@dataclass
+class Probe:
+    """The measured score of one commit; *value* is the whole score or one category's."""
+
+    commit: str
+    value: int
+
+
+@dataclass
+class BisectResult:
+    """Outcome of a bisection. *first_bad* is None when BAD is not worse than GOOD."""
+
+    category: str | None
+    good: Probe
+    bad: Probe
+    commits: int
+    probes: list[Probe] = field(default_factory=list)
+    first_bad: Probe | None = None
+    parent: Probe | None = None
+    subject: str = ""
+    timestamp: int = 0
+    introduced: list[dict] = field(default_factory=list)
+
+    @property
+    def metric(self) -> str:
+        return f"{self.category} score" if self.category else "score"
+
+    def to_dict(self) -> dict:
+        first = None
+        if self.first_bad is not None:
+            first = {
+                "commit": self.first_bad.commit,
+                "subject": self.subject,
+                "date": datetime.fromtimestamp(self.timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "parent": self.parent.commit,
+                "before": self.parent.value,
+                "after": self.first_bad.value,
+                "introduced": self.introduced,
+            }
+        return {
+            "category": self.category,
+            "good": {"commit": self.good.commit, "value": self.good.value},
+            "bad": {"commit": self.bad.commit, "value": self.bad.value},
+            "commits": self.commits,
+            "probes": [{"commit": p.commit, "value": p.value} for p in self.probes],
+            "first_bad": first,
+        }
+
+
+def _as_state(scored: ScoredCommit) -> dict:
+    """A commit's scores in the shape :func:`compute_delta` compares against."""
+    return {"score": scored.score, "categories": {r.category: category_score(r) for r in scored.results}}
+
+
+def _value(scored: ScoredCommit, category: str | None) -> int:
+    return _as_state(scored)["categories"][category] if category else scored.score
+
+
+def _drop(good: dict, scored: ScoredCommit, category: str | None) -> int:
+    """How far *scored* is below the GOOD state (negative when it is worse)."""
+    delta = compute_delta(good, scored.results, scored.score)
+    return delta["category_deltas"][category] if category else delta["total_delta"]
+
+
+def introduced_findings(
+    scorer: CommitScorer, before: ScoredCommit, after: ScoredCommit, category: str | None = None
+) -> list[dict]:
+    """Findings in *after* that *before* does not have, optionally of one category.
+
+    Findings are matched by category, rule, file and message, not line,
+    so code that merely moved does not count as new.
+    """
+    def key(result, f):
+        return result.category, f.rule, scorer.relative(f.file), f.message
+
+    old = Counter(key(r, f) for r in before.results for f in r.findings if category in (None, r.category))
+    new = []
+    for r in after.results:
+        if category not in (None, r.category):
+            continue
+        for f in r.findings:
+            k = key(r, f)
+            if old[k] > 0:
+                old[k] -= 1
+                continue
+            new.append({
+                "category": r.category, "rule": f.rule, "file": k[2], "line": f.line,
+                "message": f.message, "cost": f.cost,
+            })
+    return sorted(new, key=lambda d: (-d["cost"], d["category"], d["file"], d["line"]))
+
+
+def _score(scorer: CommitScorer, sha: str) -> ScoredCommit:
+    scored = scorer.score_commit(sha)
+    if scored is None:
+        raise GitError(f"{sha[:9]} does not contain {scorer.prefix or 'the project'}")
+    return scored
+
+
+def bisect_regression(
+    path: str,
+    good: str,
+    bad: str,
+    category: str | None = None,
+    profile_name: str | None = None,
+    use_cache: bool = True,
+    progress=None,
+) -> BisectResult:
+    """Find the first commit after *good*, up to *bad*, scoring below *good*.
+
+    With *category*, only that category's score is compared. Assumes the
+    drop persists once introduced, like ``git bisect``: the result is a
+    commit whose parent is not worse than GOOD and which is. *progress* is
+    called with a message for each probe. Raises
+    :class:`~python_doctor.gitobjects.GitError` for unknown revisions or
+    when *good* is not an ancestor of *bad*.
+    """
+    if category is not None and category not in CATEGORIES:
+        raise ValueError(f"unknown category '{category}'")
+    with CommitScorer(path, profile_name, use_cache) as scorer:
+        good_sha = resolve_commit(scorer.top, good)
+        bad_sha = resolve_commit(scorer.top, bad)
+        commits = first_parent_range(scorer.top, good_sha, bad_sha)
+        if not commits:
+            raise GitError(f"no commits between {good} and {bad}")
+
+        def probe(sha: str) -> ScoredCommit:
+            if progress:
+                progress(f"Scoring {sha[:9]}")
+            return _score(scorer, sha)
+
+        good_scored = probe(good_sha)
+        good_state = _as_state(good_scored)
+        bad_scored = probe(bad_sha)
+        result = BisectResult(
+            category, Probe(good_sha, _value(good_scored, category)), Probe(bad_sha, _value(bad_scored, category)),
+            len(commits),
+        )
+        if _drop(good_state, bad_scored, category) >= 0:
+            return result
+
+        # Invariant: commits[lo] is not worse than GOOD (-1 is GOOD itself), commits[hi] is.
+        lo, hi = -1, len(commits) - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            scored = probe(commits[mid])
+            result.probes.append(Probe(commits[mid], _value(scored, category)))
+            if _drop(good_state, scored, category) < 0:
+                hi = mid
+            else:
+                lo = mid
+
+        first = bad_scored if hi == len(commits) - 1 else _score(scorer, commits[hi])
+        parent = good_scored if lo < 0 else _score(scorer, commits[lo])
+        result.first_bad = Probe(commits[hi], _value(first, category))
+        result.parent = Probe(parent.commit.sha, _value(parent, category))
+        result.subject = first.commit.subject
+        result.timestamp = first.commit.timestamp
+        result.introduced = introduced_findings(scorer, parent, first, category)
+    return result
+
+
+def format_bisect(result: BisectResult, limit: int | None = 20) -> str:
+    """Text report of a bisection; *limit* caps the introduced findings listed."""
+    lines = [
+        f"🔎 Bisect: {result.metric} {result.good.value} at {result.good.commit[:9]} → "
+        f"{result.bad.value} at {result.bad.commit[:9]} ({result.commits} commits, {len(result.probes) + 2} scored)"
+    ]
+    if result.first_bad is None:
+        lines.append(f"  No regression: the {result.metric} at BAD is not below GOOD's.")
+        return "\n".join(lines)
+    before, after = result.parent.value, result.first_bad.value
+    lines.append(f"  First bad commit: {result.first_bad.commit[:9]} {result.subject}")
+    lines.append(
+        f"  {result.metric.capitalize()} {before} → {after} ({after - before:+d}) vs parent {result.parent.commit[:9]}"
+    )
+    introduced = result.introduced
+    if introduced:
+        lines.append(f"  Findings introduced ({len(introduced)}):")
+    else:
+        lines.append("  No new findings; the drop comes from configuration or category caps.")
+    for f in introduced[:limit]:
+        loc = f"{f['file']}:{f['line']}" if f["line"] else f["file"]
+        lines.append(f"    {f['rule']}: {f['message']}" + (f" ({loc})" if loc else ""))
+    if limit is not None and len(introduced) > limit:
+        lines.append(f"    ... and {len(introduced) - limit} more (see --json)")
+    return "\n".join(lines)
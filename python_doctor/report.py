@@ -0,0 +1,165 @@
+"""Streaming report writers."""
+
+import json
+import os
+import sys
+import threading
+from typing import TextIO
+
+from . import __version__
+from .rules import CATEGORIES, AnalyzerResult, Finding
+from .scorer import category_score, score_label
+
+
+def finding_record(f: Finding) -> dict:
+    """Return the JSON fields for one finding (same keys as ``--json``)."""
+    return {"rule": f.rule, "message": f.message, "file": f.file, "line": f.line, "severity": f.severity}
+
+
+class NdjsonWriter:
+    """Write scan events as newline-delimited JSON while analyzers run.
+
+    Each call writes and flushes one line, so a consumer can act on a
+    finding before the slower analyzers finish. Safe to call from the
+    analyzer worker threads.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self._stream = stream if stream is not None else sys.stdout
+        self._lock = threading.Lock()
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+
+    def finding(self, f: Finding) -> None:
+        """Emit a ``finding`` record."""
+        self._write({"type": "finding", "category": f.category, **finding_record(f)})
+
+    def category(self, result: AnalyzerResult) -> None:
+        """Emit a ``category`` record once an analyzer has finished."""
+        self._write({
+            "type": "category",
+            "category": result.category,
+            "score": category_score(result),
+            "max": CATEGORIES[result.category]["max_deduction"],
+            "deduction": result.deduction,
+            "error": result.error,
+            "findings": result.finding_count,
+        })
+
+    def diagnostics(self, kind: str, data: dict) -> None:
+        """Emit a diagnostics record such as ``timings`` or ``memory``."""
+        self._write({"type": kind, **data})
+
+    def score(self, path: str, score: int, delta: dict) -> None:
+        """Emit the final ``score`` record."""
+        self._write({
+            "type": "score",
+            "version": __version__,
+            "path": path,
+            "score": score,
+            "label": score_label(score),
+            "delta": {
+                "total": delta["total_delta"],
+                "categories": delta["category_deltas"],
+                "has_previous": delta["has_previous"],
+            },
+        })
+
+    def repo(
+        self, path: str, results: list[AnalyzerResult], score: int, delta: dict,
+        cached: bool = False, shards: int = 1, seconds: float = 0.0,
+    ) -> None:
+        """Emit a ``repo`` record summarizing one repository of a fleet run."""
+        self._write({
+            "type": "repo",
+            "path": path,
+            "score": score,
+            "label": score_label(score),
+            "delta": delta["total_delta"] if delta["has_previous"] else None,
+            "categories": {r.category: category_score(r) for r in results},
+            "findings": sum(r.finding_count for r in results),
+            "errors": {r.category: r.error for r in results if r.error},
+            "cached": cached,
+            "shards": shards,
+            "seconds": round(seconds, 3),
+        })
+
+    def repo_error(self, path: str, error: str) -> None:
+        """Emit a ``repo`` record for a repository that could not be scanned."""
+        self._write({"type": "repo", "path": path, "score": None, "error": error})
+
+    def fleet(self, scores: dict[str, int], errors: int = 0, seconds: float = 0.0) -> None:
+        """Emit the final ``fleet`` record: repository count and mean score."""
+        self._write({
+            "type": "fleet",
+            "version": __version__,
+            "repos": len(scores) + errors,
+            "scored": len(scores),
+            "errors": errors,
+            "mean": round(sum(scores.values()) / len(scores)) if scores else None,
+            "seconds": round(seconds, 3),
+        })
+
+
+COMPACT_SCHEMA = "python-doctor/compact-1"
+
+
+def write_compact_report(
+    stream: TextIO, results: list[AnalyzerResult], path: str, score: int, delta: dict, indent: bool = True
+) -> None:
+    """Write the compact JSON report to *stream* one piece at a time.
+
+    Each finding is a ``[rule, file, line, severity, message]`` array whose
+    *rule* and *file* are indexes into the ``rules`` and ``files`` tables
+    written at the end. Files are relative to *path*; project-level
+    findings have a ``null`` file. With *indent* False no whitespace is
+    written at all.
+    """
+    item_sep, key_sep = (", ", ": ") if indent else (",", ":")
+    nl, pad = ("\n", "  ") if indent else ("", "")
+
+    def dumps(value) -> str:
+        return json.dumps(value, separators=(item_sep, key_sep))
+
+    header = {
+        "schema": COMPACT_SCHEMA,
+        "version": __version__,
+        "path": path,
+        "score": score,
+        "label": score_label(score),
+        "delta": {
+            "total": delta["total_delta"],
+            "categories": delta["category_deltas"],
+            "has_previous": delta["has_previous"],
+        },
+    }
+    stream.write("{" + nl)
+    for key, value in header.items():
+        stream.write(f"{pad}{dumps(key)}{key_sep}{dumps(value)},{nl}")
+
+    rules: dict[str, int] = {}
+    files: dict[str, int] = {}
+    stream.write(f"{pad}\"categories\"{key_sep}{{{nl}")
+    for i, r in enumerate(results):
+        meta = {
+            "score": category_score(r),
+            "max": CATEGORIES[r.category]["max_deduction"],
+            "deduction": r.deduction,
+            "error": r.error,
+        }
+        stream.write(f"{pad * 2}{dumps(r.category)}{key_sep}{dumps(meta)[:-1]}{item_sep}\"findings\"{key_sep}[")
+        for j, f in enumerate(r.findings):
+            rule_idx = rules.setdefault(f.rule, len(rules))
+            file_idx = files.setdefault(os.path.relpath(f.file, path), len(files)) if f.file else None
+            row = dumps([rule_idx, file_idx, f.line, f.severity, f.message])
+            stream.write(f"{',' if j else ''}{nl}{pad * 3}{row}")
+        closing = f"{nl}{pad * 2}" if r.findings else ""
+        stream.write(f"{closing}]}}{',' if i < len(results) - 1 else ''}{nl}")
+    stream.write(f"{pad}}},{nl}")
+    stream.write(f"{pad}\"rules\"{key_sep}{dumps(list(rules))},{nl}")
+    stream.write(f"{pad}\"files\"{key_sep}{dumps(list(files))}{nl}")
+    stream.write("}\n")
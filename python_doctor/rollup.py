@@ -0,0 +1,144 @@
+"""Per-directory score rollups (``--rollup DEPTH``).
+
+Findings are pushed once through a path prefix tree: each finding feeds
+the deduction accumulators of every directory above it, down to the
+requested depth, so all directory scores come from a single pass. Each
+directory is scored like a whole project: per-category diminishing
+returns, capped at the category maximum, subtracted from 100.
+"""
+
+import os
+from dataclasses import dataclass, field
+
+from .analyzers._util import DeductionAccumulator
+from .rules import CATEGORIES, AnalyzerResult
+
+ROLLUP_TABLE_ROWS = 20
+
+
+class _Node:
+    """One directory in the prefix tree."""
+
+    __slots__ = ("children", "costs", "findings")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.costs: dict[str, DeductionAccumulator] = {}
+        self.findings = 0
+
+    def add(self, category: str, cost: float) -> None:
+        acc = self.costs.get(category)
+        if acc is None:
+            acc = self.costs[category] = DeductionAccumulator.for_category(category)
+        acc.add(cost)
+        self.findings += 1
+
+
+@dataclass
+class DirectoryScore:
+    """Score of one directory, relative to the scan root ("." for the root)."""
+
+    path: str
+    depth: int
+    score: int
+    findings: int
+    deductions: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def deduction(self) -> float:
+        return sum(self.deductions.values())
+
+    @property
+    def worst_category(self) -> str | None:
+        return max(self.deductions, key=self.deductions.get) if self.deductions else None
+
+
+def _score(deductions: dict[str, float]) -> int:
+    return max(0, int(100 - sum(deductions.values())))
+
+
+def build_rollup(
+    results: list[AnalyzerResult], root: str, depth: int, max_deduction: dict[str, float] | None = None
+) -> list[DirectoryScore]:
+    """Score every directory under *root* down to *depth* levels, sorted by path.
+
+    *max_deduction* holds per-category cap overrides (profile and config).
+    The root row reuses the analyzers' own deductions, so it always matches
+    the headline score; project-level findings (no file) count only there.
+    """
+    caps = {cat: (max_deduction or {}).get(cat, spec["max_deduction"]) for cat, spec in CATEGORIES.items()}
+    tree = _Node()
+    for result in results:
+        for f in result.findings:
+            tree.findings += 1
+            if not f.file or depth <= 0:
+                continue
+            rel = os.path.relpath(f.file, root)
+            if rel.startswith(os.pardir):
+                continue
+            node = tree
+            for part in rel.split(os.sep)[:-1][:depth]:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _Node()
+                node = child
+                node.add(result.category, f.cost)
+
+    root_deductions = {r.category: r.deduction for r in results if r.deduction}
+    rows = [DirectoryScore(".", 0, _score(root_deductions), tree.findings, root_deductions)]
+
+    def _visit(node: _Node, prefix: str, level: int) -> None:
+        for name in sorted(node.children):
+            child = node.children[name]
+            path = f"{prefix}/{name}" if prefix else name
+            deductions = {cat: acc.value(caps[cat]) for cat, acc in child.costs.items()}
+            rows.append(DirectoryScore(path, level, _score(deductions), child.findings, deductions))
+            _visit(child, path, level + 1)
+
+    _visit(tree, "", 1)
+    return rows
+
+
+class RollupReport:
+    """``--rollup`` output: per-directory scores as JSON or a hotspot table."""
+
+    key = "rollup"
+
+    def __init__(self, rows: list[DirectoryScore], depth: int):
+        self.rows = rows
+        self.depth = depth
+
+    def hotspots(self) -> list[DirectoryScore]:
+        """Directories below the root, worst score first."""
+        return sorted(self.rows[1:], key=lambda row: (row.score, -row.deduction, row.path))
+
+    def to_dict(self, root: str) -> dict:
+        """JSON-ready rollup, directories sorted by path."""
+        return {
+            "depth": self.depth,
+            "directories": [
+                {
+                    "path": row.path,
+                    "depth": row.depth,
+                    "score": row.score,
+                    "findings": row.findings,
+                    "deductions": {cat: round(d, 2) for cat, d in row.deductions.items()},
+                }
+                for row in self.rows
+            ],
+        }
+
+    def format_table(self, root: str) -> str:
+        """Hotspot table: the lowest-scoring directories first."""
+        hotspots = self.hotspots()
+        lines = [f"🔥 Hotspots (directories to depth {self.depth}, lowest score first)"]
+        if not hotspots:
+            lines.append("  No findings below the project root.")
+            return "\n".join(lines)
+        lines.append(f"  {'score':>5} {'deduct':>7} {'findings':>8}  {'worst':<11} directory")
+        for row in hotspots[:ROLLUP_TABLE_ROWS]:
+            worst = row.worst_category or "-"
+            lines.append(f"  {row.score:>5} {row.deduction:>7.1f} {row.findings:>8}  {worst:<11} {row.path}/")
+        if len(hotspots) > ROLLUP_TABLE_ROWS:
+            lines.append(f"  ... and {len(hotspots) - ROLLUP_TABLE_ROWS} more (see --json)")
+        return "\n".join(lines)
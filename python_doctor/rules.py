@@ -1,5 +1,6 @@
 """Rule definitions and scoring categories."""
 
+import sys
 from dataclasses import dataclass, field
 
 _CATEGORY_DEFS = {
@@ -28,12 +29,24 @@ def _build_categories(defs: dict) -> dict:
 
 CATEGORIES = _build_categories(_CATEGORY_DEFS)
 
+# Diminishing returns per category: (findings counted at full cost, rate for
+# the rest). Categories not listed here sum their costs linearly.
+DIMINISHING_RETURNS = {
+    "security": (5, 0.1),
+    "lint": (5, 0.1),
+    "complexity": (3, 0.1),
+    "zen": (3, 0.1),
+}
+
 # Security
 BANDIT_SEVERITY_COST = {"HIGH": 2, "MEDIUM": 1, "LOW": 0.5}
 
 # Lint
 RUFF_ERROR_COST = 1.0
 RUFF_WARNING_COST = 0.5
+# Dead code (vulture, --level deep): certain (unreachable, unused argument) vs likely unused.
+DEAD_CODE_CERTAIN_COST = 0.5
+DEAD_CODE_LIKELY_COST = 0.25
 
 # Complexity
 COMPLEXITY_COST = {15: 2, 25: 5}
@@ -69,9 +82,14 @@ LARGE_CLASS_COST = 1
 DENSE_LINE_COST = 0.5
 
 
-@dataclass
+@dataclass(slots=True)
 class Finding:
-    """A single diagnostic finding from an analyzer."""
+    """A single diagnostic finding from an analyzer.
+
+    Slotted, with its repetitive strings interned: a large scan holds one
+    shared copy of each category, rule ID, file path and severity instead
+    of one per finding. Messages are mostly unique, so they are not.
+    """
     category: str
     rule: str
     message: str
@@ -80,11 +98,31 @@ class Finding:
     severity: str = "medium"
     cost: float = 0.0
 
+    def __post_init__(self) -> None:
+        self.category = sys.intern(self.category)
+        self.rule = sys.intern(self.rule)
+        self.file = sys.intern(self.file)
+        self.severity = sys.intern(self.severity)
+
 
 @dataclass
 class AnalyzerResult:
-    """Result from running an analyzer, containing findings and deduction."""
+    """Result from running an analyzer, containing findings and deduction.
+
+    ``findings`` may hold only the first few findings when the analyzer ran
+    in summary mode; ``rule_counts`` and ``rule_costs`` always cover every
+    finding that was scored. ``suppressed`` counts findings dropped by rule
+    suppression.
+    """
     category: str
     findings: list[Finding] = field(default_factory=list)
     deduction: float = 0.0
     error: str | None = None
+    rule_counts: dict[str, int] = field(default_factory=dict)
+    rule_costs: dict[str, float] = field(default_factory=dict)
+    suppressed: int = 0
+
+    @property
+    def finding_count(self) -> int:
+        """Total number of findings, including any not kept in ``findings``."""
+        return max(len(self.findings), sum(self.rule_counts.values()))
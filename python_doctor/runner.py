@@ -0,0 +1,426 @@
+"""Scan orchestration: runs the analyzers for a project and gathers results.
+
+Analyzer modules are imported only when a scan actually runs them, so the
+CLI's non-scanning commands never pay for them.
+"""
+
+import concurrent.futures
+import contextlib
+import fnmatch
+import os
+import subprocess  # nosec B404 — only for catching tool errors
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from .config import load_config
+from .costmodel import CostModel
+from .fingerprint import build_tree
+from .memory import MemoryReport
+from .profile import detect_profile, profile_for_kind
+from .registry import ANALYZERS, job_name, level_jobs, load_analyzer, rescore, skipped_error
+from .rules import CATEGORIES, AnalyzerResult, Finding
+from .shard import Partition, build_partial, index_sizes, shard_files
+from .timing import FileClock, RunTimings
+
+
+def make_suppressor(path: str, suppressed: set[str], per_file: dict[str, set[str]]):
+    """Build the ``suppress(rule, file)`` predicate handed to analyzers.
+
+    Per-file patterns are matched once per distinct file and memoized, so
+    the check stays O(1) per finding however many findings a file has.
+    Returns None when nothing is suppressed.
+    """
+    if not suppressed and not per_file:
+        return None
+    file_rules: dict[str, frozenset[str]] = {}
+
+    def _rules_for(file: str) -> frozenset[str]:
+        rules = file_rules.get(file)
+        if rules is None:
+            rel = os.path.relpath(file, path)
+            rules = frozenset().union(*(r for pat, r in per_file.items() if fnmatch.fnmatch(rel, pat)))
+            file_rules[file] = rules
+        return rules
+
+    def suppress(rule: str, file: str) -> bool:
+        if rule in suppressed:
+            return True
+        return bool(file and per_file and rule in _rules_for(file))
+
+    return suppress
+
+
+def merged_settings(path: str, profile_name: str | None, config=None):
+    """Load config and profile for *path*.
+
+    *config*, a :class:`~python_doctor.config.Config`, is used instead of
+    the project's ``pyproject.toml`` when given. Returns the merged
+    per-category max-deduction overrides, the rules suppressed everywhere
+    and the per-file suppression patterns.
+    """
+    if config is None:
+        config = load_config(path)
+
+    # Determine profile: CLI flag > config file > auto-detect
+    if profile_name:
+        profile = profile_for_kind(profile_name)
+    elif config.profile_override:
+        profile = profile_for_kind(config.profile_override)
+    else:
+        profile = detect_profile(path)
+
+    # Merge overrides (config wins over profile defaults)
+    merged_max_deduction = {**profile.max_deduction_overrides, **config.max_deduction_overrides}
+    merged_suppressed = profile.suppressed_rules | config.suppress_rules
+    return merged_max_deduction, merged_suppressed, config.per_file_suppress
+
+
+def resolve_settings(path: str, profile_name: str | None, config=None):
+    """Return the merged max-deduction overrides and the suppression predicate for *path*."""
+    max_deduction, suppressed, per_file = merged_settings(path, profile_name, config)
+    return max_deduction, make_suppressor(path, suppressed, per_file)
+
+
+def category_caps(path: str, profile_name: str | None = None) -> dict[str, float]:
+    """Per-category maximum deductions for *path* after profile and config overrides."""
+    overrides, _suppress = resolve_settings(path, profile_name)
+    return {cat: overrides.get(cat, spec["max_deduction"]) for cat, spec in CATEGORIES.items()}
+
+
+def analyzer_kwargs(cat_name: str, path: str, fix: bool, max_deduction: dict, **options) -> dict:
+    """Build the keyword arguments for one analyzer's ``analyze`` call."""
+    kwargs = {"path": path, **options}
+    if cat_name == "lint":
+        kwargs["fix"] = fix
+    if cat_name in max_deduction:
+        kwargs["max_deduction"] = max_deduction[cat_name]
+    return kwargs
+
+
+def _merge_category(cat_name: str, cap: float, parts: list, keep: int | None):
+    """Score the findings of several analyzers of one category together, as one analyzer would."""
+    findings = [f for part in parts for f in part.findings]
+    merged = rescore(cat_name, cap, None, findings, suppressed=sum(part.suppressed for part in parts))
+    merged.error = next((part.error for part in parts if part.error), None)
+    if keep is not None:
+        del merged.findings[keep:]
+    return merged
+
+
+@dataclass
+class ScanOptions:
+    """How :func:`run_analyzers` runs the analyzers and what it reports while they run.
+
+    *level* (see :data:`~python_doctor.registry.LEVELS`) picks the analyzers: at ``quick`` the
+    external-tool categories are not run and come back empty with an
+    error saying so; at ``deep`` the ``DEEP_ANALYZERS`` run after their
+    category's analyzer, in the same worker, and the two are scored
+    together. *keep* limits how many findings each category retains
+    (counts and deductions still cover all of them); *score_only*
+    additionally lets analyzers stop once their category cap is reached.
+
+    *on_finding* is called from the worker threads for every finding as it
+    is produced and *on_result* with each category's result as soon as its
+    analyzer ends. *timings* collects wall and CPU time per analyzer and
+    per phase. *memory* measures each analyzer's heap use; analyzers then
+    run one at a time so allocations can be attributed. *durations*, a
+    dict, receives each analyzer run's wall time by :func:`job_name`;
+    *file_durations*, a dict, the time each file took in the in-process
+    analyzers, summed over them.
+
+    Analyzers are submitted longest predicted first; predictions come from
+    *cost_model* (its defaults if None), for a project of *work* MB (the
+    model's last recorded work if None).
+    """
+
+    level: str = "standard"
+    keep: int | None = None
+    score_only: bool = False
+    on_finding: Callable[[Finding], None] | None = None
+    on_result: Callable[[AnalyzerResult], None] | None = None
+    timings: RunTimings | None = None
+    memory: MemoryReport | None = None
+    durations: dict | None = None
+    file_durations: dict | None = None
+    cost_model: CostModel | None = None
+    work: float | None = None
+
+
+def _measured_analyze(analyzer, name: str, kwargs: dict, options: ScanOptions, files_lock) -> AnalyzerResult:
+    """Run one analyzer under the instrumentation *options* asks for, and record its durations."""
+    started = time.monotonic()
+    with contextlib.ExitStack() as stack:
+        if options.memory is not None:
+            stack.enter_context(options.memory.measure(name))
+        timer = None
+        if options.timings is not None:
+            timer = kwargs["timer"] = stack.enter_context(options.timings.measure(name))
+            if options.file_durations is not None:
+                timer.files = {}
+        elif options.file_durations is not None:
+            timer = kwargs["timer"] = FileClock()
+        result = analyzer.analyze(**kwargs)
+    if options.durations is not None:
+        options.durations[name] = time.monotonic() - started
+    if options.file_durations is not None and timer.files:
+        with files_lock:
+            for file, seconds in timer.files.items():
+                options.file_durations[file] = options.file_durations.get(file, 0.0) + seconds
+    return result
+
+
+def _schedule(jobs: list[tuple[str, str]], options: ScanOptions) -> list[tuple[str, str]]:
+    """The ``ANALYZERS`` entries among *jobs*, longest predicted first (LPT)."""
+    model = options.cost_model if options.cost_model is not None else CostModel()
+    predicted = model.category_times(options.level, options.work if options.work is not None else model.last_work)
+    # The sort is stable, so ties keep ANALYZERS order.
+    return sorted((pair for pair in ANALYZERS if pair in jobs), key=lambda pair: -predicted[pair[0]])
+
+
+def run_analyzers(
+    path: str, fix: bool = False, profile_name: str | None = None, options: ScanOptions | None = None
+) -> list[AnalyzerResult]:
+    """Run all analyzers on the given path and return results.
+
+    Analyzers run in parallel via a ThreadPoolExecutor (each one is I/O bound:
+    bandit/ruff/radon shell out, others walk AST/filesystem), scheduled and
+    instrumented as *options* (a :class:`ScanOptions`) says. Results are
+    returned in the same order as ``ANALYZERS`` so output stays
+    deterministic.
+    """
+    options = options if options is not None else ScanOptions()
+    max_deduction, suppress = resolve_settings(path, profile_name)
+    files_lock = threading.Lock()
+    jobs = level_jobs(options.level)
+    extras: dict[str, list[str]] = {}
+    for cat_name, mod in jobs:
+        if (cat_name, mod) not in ANALYZERS:
+            extras.setdefault(cat_name, []).append(mod)
+
+    def _run_mod(cat_name, mod, keep, score_only):
+        kwargs = analyzer_kwargs(
+            cat_name, path, fix, max_deduction,
+            suppress=suppress, keep=keep, score_only=score_only, on_finding=options.on_finding,
+        )
+        return _measured_analyze(load_analyzer(mod), job_name(cat_name, mod), kwargs, options, files_lock)
+
+    def _run_one(cat_name, mod):
+        if cat_name not in extras:
+            return _run_mod(cat_name, mod, options.keep, options.score_only)
+        # Merged categories are rescored from every finding of each part.
+        parts = [_run_mod(cat_name, m, None, False) for m in (mod, *extras[cat_name])]
+        cap = max_deduction.get(cat_name, CATEGORIES[cat_name]["max_deduction"])
+        return _merge_category(cat_name, cap, parts, options.keep)
+
+    def _skipped(cat_name):
+        return AnalyzerResult(category=cat_name, error=skipped_error(options.level))
+
+    scheduled = _schedule(jobs, options)
+    max_workers = 1 if options.memory is not None else min(len(scheduled), os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyzer") as executor:
+        futures = {pair: executor.submit(_skipped, pair[0]) for pair in ANALYZERS if pair not in jobs}
+        futures.update((pair, executor.submit(_run_one, *pair)) for pair in scheduled)
+        if options.on_result is not None:
+            for future in concurrent.futures.as_completed(futures.values()):
+                options.on_result(future.result())
+        # Collect in ANALYZERS order, whatever the submission order, so output stays deterministic.
+        results = [futures[pair].result() for pair in ANALYZERS]
+    return results
+
+
+def run_roots(
+    paths: list[str],
+    fix: bool = False,
+    profile_name: str | None = None,
+    keep: int | None = None,
+    score_only: bool = False,
+) -> dict[str, list]:
+    """Scan several project roots in one process and return results per root.
+
+    Every root gets its own config and profile. All (root, analyzer) pairs
+    share one thread pool, and analyzers that wrap an external tool and
+    provide ``fetch_batch`` run that tool once over all roots, handing each
+    root its share of the output. If a batched run fails, the tool is run
+    per root instead so each root reports its own error.
+    """
+    settings = {root: resolve_settings(root, profile_name) for root in paths}
+    options = {"keep": keep, "score_only": score_only}
+
+    def _kwargs(cat_name, root, **extra):
+        max_deduction, suppress = settings[root]
+        return analyzer_kwargs(cat_name, root, fix, max_deduction, suppress=suppress, **options, **extra)
+
+    def _run_one(cat_name, mod, root):
+        return load_analyzer(mod).analyze(**_kwargs(cat_name, root))
+
+    def _run_batched(cat_name, mod):
+        analyzer = load_analyzer(mod)
+        try:
+            batch = analyzer.fetch_batch(paths, fix=fix)
+        except Exception:
+            batch = {}
+        return {
+            root: analyzer.analyze(**_kwargs(cat_name, root, items=batch.get(root)))
+            for root in paths
+        }
+
+    max_workers = min(len(ANALYZERS) * len(paths), os.cpu_count() or 4)
+    results: dict[str, dict[str, object]] = {root: {} for root in paths}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyzer") as executor:
+        batched, single = {}, {}
+        for cat_name, mod in ANALYZERS:
+            if hasattr(load_analyzer(mod), "fetch_batch"):
+                batched[executor.submit(_run_batched, cat_name, mod)] = cat_name
+            else:
+                for root in paths:
+                    single[executor.submit(_run_one, cat_name, mod, root)] = (cat_name, root)
+        for future, cat_name in batched.items():
+            for root, result in future.result().items():
+                results[root][cat_name] = result
+        for future, (cat_name, root) in single.items():
+            results[root][cat_name] = future.result()
+    # Same category order as ANALYZERS for every root.
+    return {root: [results[root][cat] for cat, _ in ANALYZERS] for root in paths}
+
+
+def shard_settings(path: str, profile_name: str | None = None) -> dict:
+    """Per-category caps and globally suppressed rules, as recorded in shard results.
+
+    :func:`python_doctor.shard.merge_partials` applies them to the
+    project-level findings of the project-wide checks.
+    """
+    max_deduction, suppressed, _per_file = merged_settings(path, profile_name)
+    return {
+        "caps": {cat: max_deduction.get(cat, spec["max_deduction"]) for cat, spec in CATEGORIES.items()},
+        "suppressed_rules": sorted(suppressed),
+    }
+
+
+def analyze_files(cat_name: str, analyzer, kwargs: dict, include, files: list[str]):
+    """Run *analyzer* over *files* instead of the whole tree; return ``(result, facts)``.
+
+    *include* limits the findings scored to the files it accepts. Analyzers
+    wrapping a tool that takes a file list (``fetch_files``) get its output
+    for *files* as ``items``; if the tool fails, the result carries its
+    error. Analyzers with project-wide checks (``analyze_shard``) return
+    the facts those checks need; other analyzers return None facts.
+    """
+    kwargs.update(include=include, files=files)
+    if hasattr(analyzer, "fetch_files"):
+        try:
+            kwargs["items"] = analyzer.fetch_files(files)
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            return AnalyzerResult(category=cat_name, error=str(e)), None
+    if hasattr(analyzer, "analyze_shard"):
+        return analyzer.analyze_shard(**kwargs)
+    return analyzer.analyze(**kwargs), None
+
+
+def run_shard_category(
+    path: str,
+    cat_name: str,
+    include=None,
+    files: list[str] | None = None,
+    profile_name: str | None = None,
+    **options,
+):
+    """Run one analyzer over one shard of *path*; return ``(result, facts)``.
+
+    *include* accepts the files the shard owns and *files* lists the
+    files it gives the tools (see :func:`python_doctor.shard.shard_files`).
+    The analyzer scores only findings in owned files, and each tool runs
+    on *files* alone (see :func:`analyze_files`). Facts of project-wide
+    checks are returned instead of running the checks, for
+    :func:`python_doctor.shard.merge_partials`. Without *include* the
+    analyzer scans the whole project as usual. *options* are passed on (``keep``, ...).
+    """
+    max_deduction, suppress = resolve_settings(path, profile_name)
+    mod = dict(ANALYZERS)[cat_name]
+    kwargs = analyzer_kwargs(cat_name, path, False, max_deduction, suppress=suppress, **options)
+    analyzer = load_analyzer(mod)
+    if include is None:
+        return analyzer.analyze(**kwargs), None
+    return analyze_files(cat_name, analyzer, kwargs, include, files)
+
+
+def scan_shard(path: str, shard: int, shards: int, profile_name: str | None = None) -> dict:
+    """Scan shard *shard* of *shards* of *path* and return its partial results (see :mod:`python_doctor.shard`)."""
+    tree = build_tree(path)
+    partition = Partition(index_sizes(tree), shards)
+    files = shard_files(path, partition, shard, tree)
+    results, facts = run_shard(path, partition.includer(path, shard), files, profile_name)
+    return build_partial(path, partition, shard, results, facts, shard_settings(path, profile_name))
+
+
+def run_shard(path: str, include, files: list[str], profile_name: str | None = None):
+    """Run every analyzer over one shard of *path* (see :func:`run_shard_category`).
+
+    Returns ``(results, facts)``: results in ``ANALYZERS`` order and the
+    facts per category of the analyzers with project-wide checks.
+    """
+    max_workers = min(len(ANALYZERS), os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyzer") as executor:
+        futures = [
+            executor.submit(run_shard_category, path, cat_name, include, files, profile_name)
+            for cat_name, _mod in ANALYZERS
+        ]
+        outcomes = [future.result() for future in futures]
+    results = [result for result, _facts in outcomes]
+    facts = {result.category: data for result, data in outcomes if data is not None}
+    return results, facts
+
+
+def _gate_order(path: str) -> list[tuple[str, str]]:
+    """``ANALYZERS`` with the most deduction per predicted second first (see :mod:`~python_doctor.costmodel`)."""
+    model = CostModel.load(path)
+    predicted = model.category_times("standard", model.last_work)
+
+    def priority(pair) -> float:
+        cat_name, _mod = pair
+        return -CATEGORIES[cat_name]["max_deduction"] / max(predicted[cat_name], 1e-6)
+
+    return sorted(ANALYZERS, key=priority)
+
+
+def run_gate(path: str, decide, fix: bool = False, profile_name: str | None = None) -> tuple[int, int, int]:
+    """Run analyzers only until the pass/fail outcome is known.
+
+    After each analyzer completes, the score is bracketed: the upper bound
+    assumes the outstanding categories deduct nothing, the lower bound that
+    they hit their caps. ``decide(lower, upper)`` returns an exit code once
+    the outcome no longer depends on the outstanding work, or None to keep
+    going. Outstanding analyzers are then cancelled (including their tool
+    subprocesses).
+
+    Returns ``(exit_code, lower, upper)``; the bounds are equal when every
+    analyzer ran.
+    """
+    max_deduction, suppress = resolve_settings(path, profile_name)
+    pending = {cat: max_deduction.get(cat, CATEGORIES[cat]["max_deduction"]) for cat, _ in ANALYZERS}
+    cancel = threading.Event()
+    spent = 0.0
+
+    def _run_one(cat_name, mod):
+        kwargs = analyzer_kwargs(
+            cat_name, path, fix, max_deduction, suppress=suppress, keep=0, score_only=True, cancel=cancel
+        )
+        return load_analyzer(mod).analyze(**kwargs)
+
+    max_workers = min(len(ANALYZERS), os.cpu_count() or 4)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(_run_one, *pair): pair[0] for pair in _gate_order(path)}
+        for future in concurrent.futures.as_completed(futures):
+            spent += future.result().deduction
+            del pending[futures[future]]
+            upper = max(0, int(100 - spent))
+            lower = max(0, int(100 - spent - sum(pending.values())))
+            code = decide(lower, upper)
+            if code is not None:
+                return code, lower, upper
+    finally:
+        cancel.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+    raise AssertionError("gate undecided after all analyzers completed")  # pragma: no cover
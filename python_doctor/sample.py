@@ -0,0 +1,437 @@
+"""Approximate scores from a random sample of the project's files (``--sample``).
+
+The indexed Python files (see :mod:`python_doctor.fingerprint`) are split
+into strata by top-level directory and by whether they are tests, and the
+same fraction of each stratum is drawn at random (at least two files per
+stratum, or its only file). The per-file analyzers run on the sample only; every sampled
+finding then stands for ``N_h / n_h`` findings of its stratum, and each
+category's deduction is recomputed from those weighted findings with the
+category's diminishing-returns curve and cap, so a category that the
+sample already saturates is not pushed past its cap. Structure and imports
+depend on the whole tree (test ratio, import cycles) and are cheap, so
+they always run in full and are exact.
+
+The confidence interval comes from a stratified bootstrap: the sampled
+files of each stratum are resampled with replacement and the score is
+re-estimated, and the interval spans the middle 95% of those estimates.
+A stratum is either drawn in full, and exact, or drawn at least twice,
+since a single drawn file would give it no bootstrap variance and a
+zero-width interval however unrepresentative that file was. A few drawn
+files that all agree on a category still show no variance, so the
+interval is widened to cover the stratum's undrawn files being all like
+the cleanest or all like the costliest file drawn anywhere, and reported
+as unknown when the sample is too small to have anything to compare.
+"""
+
+import concurrent.futures
+import math
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from .fingerprint import build_tree
+from .rules import CATEGORIES, DIMINISHING_RETURNS, AnalyzerResult
+from .scorer import score_label
+from .shard import index_sizes
+
+# Categories whose checks need the whole tree; they are never sampled.
+EXACT_CATEGORIES = ("structure", "imports")
+
+BOOTSTRAP_ROUNDS = 200
+CONFIDENCE = 0.95
+
+# Drawn files of a partly drawn stratum that all agree on a category show
+# its variance only when there are more than this many: by the rule of
+# three, n agreeing draws put the share of differing files below 3/n at 95%.
+MIN_AGREEING_DRAWS = 3
+
+
+@dataclass
+class Stratum:
+    """Files of one top-level directory (tests or not) and those drawn from them."""
+
+    name: str
+    files: list[str]
+    sample: list[str]
+
+    @property
+    def weight(self) -> float:
+        """How many files of the stratum each sampled file stands for."""
+        return len(self.files) / len(self.sample)
+
+
+def _stratum_key(rel: str) -> str:
+    """Top-level directory (``.`` for root modules), with its test files apart."""
+    from .analyzers._util import is_test_file
+
+    parts = rel.split("/")
+    top = parts[0] if len(parts) > 1 else "."
+    return f"{top} (tests)" if is_test_file(os.path.join(*parts)) else top
+
+
+def draw_sample(
+    sizes: dict[str, int], fraction: float | None = None, count: int | None = None, seed: int = 0
+) -> list[Stratum]:
+    """Draw a stratified sample of the files in *sizes* (relative path -> bytes).
+
+    Give either *fraction* of the files or about *count* files; each
+    stratum contributes its share, rounded, and at least two files (all of
+    them if it has fewer). The
+    draw depends only on the file list and *seed*.
+    """
+    groups: dict[str, list[str]] = defaultdict(list)
+    for rel in sorted(sizes):
+        groups[_stratum_key(rel)].append(rel)
+    total = len(sizes)
+    if fraction is None:
+        fraction = min(1.0, (count or 0) / total) if total else 1.0
+    rng = random.Random(seed)  # nosec B311 — reproducible sampling, not security
+    strata = []
+    for name in sorted(groups):
+        files = groups[name]
+        wanted = min(len(files), max(2, round(fraction * len(files))))
+        strata.append(Stratum(name, files, sorted(rng.sample(files, wanted))))
+    return strata
+
+
+def weighted_deduction(category: str, weighted: list[tuple[float, float]], cap: float, linear: bool = False) -> float:
+    """The deduction of findings given as ``(cost, weight)``, a weight counting as that many findings.
+
+    Matches :class:`~python_doctor.analyzers._util.DeductionAccumulator`
+    for whole weights: the *top_n* costliest findings count in full, the
+    rest at the category's tail rate. *linear* sums every cost in full,
+    as scans with suppressed findings do.
+    """
+    top_n, tail_rate = DIMINISHING_RETURNS.get(category, (None, 1.0))
+    total = sum(cost * weight for cost, weight in weighted)
+    if linear or top_n is None:
+        return min(round(total, 9), cap)
+    head, room = 0.0, float(top_n)
+    for cost, weight in sorted(weighted, reverse=True):
+        take = min(room, weight)
+        head += cost * take
+        room -= take
+        if room <= 0:
+            break
+    return min(round(head + (total - head) * tail_rate, 9), cap)
+
+
+@dataclass
+class CategoryEstimate:
+    """One category's estimated score, its interval and how it was measured."""
+
+    category: str
+    score: int
+    low: int
+    high: int
+    deduction: float
+    exact: bool
+    findings: int
+    error: str | None = None
+    # False when too few agreeing files were drawn to bound the category.
+    bounded: bool = True
+
+
+@dataclass
+class SampleEstimate:
+    """Outcome of a sampled scan."""
+
+    path: str
+    files: int
+    sampled: int
+    strata: int
+    score: int
+    low: int
+    high: int
+    seconds: float
+    full_seconds: float
+    categories: list[CategoryEstimate] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return score_label(self.score)
+
+    @property
+    def saved(self) -> float:
+        return max(0.0, self.full_seconds - self.seconds)
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "score": self.score,
+            "label": self.label,
+            "confidence": CONFIDENCE,
+            "interval": [self.low, self.high],
+            "sample": {"files": self.sampled, "of": self.files, "strata": self.strata},
+            "seconds": round(self.seconds, 3),
+            "estimated_full_seconds": round(self.full_seconds, 3),
+            "categories": {
+                c.category: {
+                    "score": c.score,
+                    "max": CATEGORIES[c.category]["max_deduction"],
+                    "interval": [c.low, c.high],
+                    "deduction": c.deduction,
+                    "exact": c.exact,
+                    "bounded": c.bounded,
+                    "sampled_findings": c.findings,
+                    "error": c.error,
+                }
+                for c in self.categories
+            },
+        }
+
+
+def _run_category(path: str, cat_name: str, include, files: list[str], profile_name: str | None):
+    """Run one analyzer (over the sample unless its category is exact); return the result and its time."""
+    from .registry import ANALYZERS, load_analyzer
+    from .runner import analyze_files, analyzer_kwargs, resolve_settings
+
+    started = time.monotonic()
+    max_deduction, suppress = resolve_settings(path, profile_name)
+    analyzer = load_analyzer(dict(ANALYZERS)[cat_name])
+    kwargs = analyzer_kwargs(cat_name, path, False, max_deduction, suppress=suppress)
+    if cat_name in EXACT_CATEGORIES:
+        result = analyzer.analyze(**kwargs)
+    else:
+        result, _facts = analyze_files(cat_name, analyzer, kwargs, include, files)
+    return result, time.monotonic() - started
+
+
+def _percentiles(values: list[int]) -> tuple[int, int]:
+    values = sorted(values)
+    tail = (1 - CONFIDENCE) / 2
+    return values[int(tail * (len(values) - 1))], values[math.ceil((1 - tail) * (len(values) - 1))]
+
+
+class _Estimator:
+    """Weighted findings of each sampled category, by sampled file."""
+
+    def __init__(self, path: str, strata: list[Stratum], results: list[AnalyzerResult], caps: dict[str, float]):
+        self.strata = strata
+        self.caps = caps
+        self.results = {r.category: r for r in results if r.category not in EXACT_CATEGORIES}
+        # costs[category][file]: costs of the findings in one sampled file.
+        self.costs: dict[str, dict[str, list[float]]] = {cat: defaultdict(list) for cat in self.results}
+        # Findings outside the sampling frame (project-level or unindexed files) count once.
+        self.fixed: dict[str, list[tuple[float, float]]] = {cat: [] for cat in self.results}
+        sampled = {rel for s in strata for rel in s.sample}
+        for cat, r in self.results.items():
+            for f in r.findings:
+                rel = os.path.relpath(f.file, path).replace(os.sep, "/") if f.file else ""
+                if rel in sampled:
+                    self.costs[cat][rel].append(f.cost)
+                else:
+                    self.fixed[cat].append((f.cost, 1.0))
+
+    def deductions(self, draws: dict[str, float]) -> dict[str, float]:
+        """Estimated deduction per sampled category when each file in *draws* counts that many times."""
+        out = {}
+        for cat, r in self.results.items():
+            weighted = list(self.fixed[cat])
+            for rel, costs in self.costs[cat].items():
+                weight = draws.get(rel, 0.0)
+                if weight:
+                    weighted += [(cost, weight) for cost in costs]
+            out[cat] = weighted_deduction(cat, weighted, self.caps[cat], linear=r.suppressed > 0)
+        return out
+
+    def extremes(self) -> dict[str, tuple[float, float] | None]:
+        """Deduction range of each category the bootstrap cannot bound.
+
+        In a partly drawn stratum with at most ``MIN_AGREEING_DRAWS`` draws
+        that all agree on a category, the undrawn files are instead taken
+        to be all like the cleanest, then all like the costliest, file
+        drawn anywhere. The range is None (unknown) when the whole sample
+        is that small and found nothing to compare with.
+        """
+        drawn = sum(len(s.sample) for s in self.strata)
+        out: dict[str, tuple[float, float] | None] = {}
+        for cat in self.results:
+            agreeing = self._agreeing(cat)
+            if not agreeing:
+                continue
+            if not self.costs[cat] and drawn <= MIN_AGREEING_DRAWS:
+                out[cat] = None
+            else:
+                out[cat] = self._range(cat, agreeing, drawn)
+        return out
+
+    def _agreeing(self, cat: str) -> list[Stratum]:
+        """Partly drawn strata with few draws, all finding the same costs in *cat*."""
+        return [
+            s for s in self.strata
+            if len(s.files) > len(s.sample) and len(s.sample) <= MIN_AGREEING_DRAWS
+            and len({tuple(sorted(self.costs[cat].get(rel, ()))) for rel in s.sample}) == 1
+        ]
+
+    def _range(self, cat: str, agreeing: list[Stratum], drawn: int) -> tuple[float, float]:
+        """Deduction of *cat* with the undrawn files of *agreeing* like the cleanest, then the costliest, drawn file."""
+        files = self.costs[cat]
+        worst = max(files.values(), key=sum, default=[])
+        cleanest = [] if len(files) < drawn else min(files.values(), key=sum)
+        draws = {rel: s.weight for s in self.strata for rel in s.sample}
+        draws.update((rel, 1.0) for s in agreeing for rel in s.sample)
+        base = [(cost, draws[rel]) for rel, costs in files.items() for cost in costs] + self.fixed[cat]
+        undrawn = sum(len(s.files) - len(s.sample) for s in agreeing)
+        linear = self.results[cat].suppressed > 0
+        least, most = (
+            weighted_deduction(cat, base + [(cost, undrawn) for cost in like], self.caps[cat], linear)
+            for like in (cleanest, worst)
+        )
+        return least, most
+
+    def point(self) -> dict[str, float]:
+        return self.deductions({rel: s.weight for s in self.strata for rel in s.sample})
+
+    def bootstrap(self, rounds: int, seed: int) -> list[dict[str, float]]:
+        """Deductions re-estimated on *rounds* stratified resamples of the sampled files."""
+        rng = random.Random(seed)  # nosec B311 — resampling, not security
+        with_findings = {rel for costs in self.costs.values() for rel in costs}
+        replicates = []
+        for _ in range(rounds):
+            draws: dict[str, float] = {}
+            for s in self.strata:
+                if len(s.sample) == len(s.files):
+                    draws.update(dict.fromkeys(s.sample, 1.0))
+                    continue
+                counts = Counter(rng.choices(s.sample, k=len(s.sample)))
+                for rel, n in counts.items():
+                    if rel in with_findings:
+                        draws[rel] = n * s.weight
+            replicates.append(self.deductions(draws))
+        return replicates
+
+
+def estimate_score(
+    path: str,
+    fraction: float | None = None,
+    count: int | None = None,
+    profile_name: str | None = None,
+    seed: int = 0,
+    rounds: int = BOOTSTRAP_ROUNDS,
+) -> SampleEstimate:
+    """Estimate the score of *path* from a sample of *fraction* (or about *count*) of its files."""
+    from .runner import category_caps
+
+    started = time.monotonic()
+    sizes = index_sizes(build_tree(path))
+    strata = draw_sample(sizes, fraction, count, seed)
+    sample = {rel for s in strata for rel in s.sample}
+    indexed = time.monotonic()
+    outcomes = _run_sample(path, sample, profile_name)
+    analysis = time.monotonic() - indexed
+    results = [result for result, _seconds in outcomes]
+
+    caps = category_caps(path, profile_name)
+    estimator = _Estimator(path, strata, results, caps)
+    point = estimator.point()
+    replicates = estimator.bootstrap(rounds, seed + 1) if rounds else []
+    spans = estimator.extremes()
+    unbounded = {cat for cat, span in spans.items() if span is None}
+    extremes = {cat: span or (0.0, caps[cat]) for cat, span in spans.items()}
+    categories = [
+        _category_estimate(r, point, replicates, extremes.get(r.category), r.category not in unbounded)
+        for r in results
+    ]
+    exact_total = sum(r.deduction for r in results if r.category in EXACT_CATEGORIES)
+    score, low, high = _total_interval(exact_total, point, replicates, extremes)
+
+    full_seconds = (indexed - started) + _full_analysis_seconds(sizes, sample, outcomes, analysis)
+    return SampleEstimate(
+        path, len(sizes), len(sample), len(strata), score, low, high, time.monotonic() - started, full_seconds,
+        categories,
+    )
+
+
+def _full_analysis_seconds(
+    sizes: dict[str, int], sample: set[str], outcomes: list[tuple[AnalyzerResult, float]], analysis: float
+) -> float:
+    """Predicted analysis wall time of a full scan, from the sampled run's *analysis* seconds.
+
+    Sampled analyzers would take about as much longer as there is more
+    source to read; the wall time grows by the share of analyzer time that
+    scales.
+    """
+    scale = sum(sizes.values()) / (sum(sizes[rel] for rel in sample) or 1)
+    busy = sum(seconds for _r, seconds in outcomes) or 1.0
+    scaled = sum(seconds if r.category in EXACT_CATEGORIES else seconds * scale for r, seconds in outcomes)
+    return analysis * scaled / busy
+
+
+def _run_sample(path: str, sample: set[str], profile_name: str | None) -> list[tuple[AnalyzerResult, float]]:
+    """Run every analyzer over the *sample* files; return each result and its time, in ``ANALYZERS`` order."""
+    from .registry import ANALYZERS
+
+    files = [os.path.join(path, *rel.split("/")) for rel in sorted(sample)]
+
+    def include(file: str) -> bool:
+        return os.path.relpath(file, path).replace(os.sep, "/") in sample
+
+    max_workers = min(len(ANALYZERS), os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyzer") as executor:
+        futures = [
+            executor.submit(_run_category, path, cat_name, include, files, profile_name) for cat_name, _mod in ANALYZERS
+        ]
+        return [future.result() for future in futures]
+
+
+def _category_estimate(
+    r: AnalyzerResult, point: dict, replicates: list[dict], span: tuple[float, float] | None, bounded: bool
+) -> CategoryEstimate:
+    """Estimate of one category; *span* is the deduction range the bootstrap cannot rule out, if any."""
+    top = CATEGORIES[r.category]["max_deduction"]
+    if r.category in EXACT_CATEGORIES:
+        score = int(top - r.deduction)
+        return CategoryEstimate(r.category, score, score, score, r.deduction, True, len(r.findings), r.error)
+    deduction = point[r.category]
+    score = int(top - deduction)
+    low, high = _percentiles([int(top - rep[r.category]) for rep in replicates]) if replicates else (score, score)
+    if span is not None:
+        least, most = span
+        low, high = min(low, int(top - most)), max(high, int(top - least))
+    return CategoryEstimate(
+        r.category, score, min(low, score), max(high, score), round(deduction, 2), False, len(r.findings), r.error,
+        bounded,
+    )
+
+
+def _total_interval(
+    exact_total: float, point: dict, replicates: list[dict], extremes: dict[str, tuple[float, float]]
+) -> tuple[int, int, int]:
+    """Estimated total score and its interval, widened by each category's *extremes*."""
+    def total(deductions: dict[str, float]) -> int:
+        return max(0, int(100 - exact_total - sum(deductions.values())))
+
+    score = total(point)
+    low, high = _percentiles([total(rep) for rep in replicates]) if replicates else (score, score)
+    for cat, (least, most) in extremes.items():
+        low = max(0, low - math.ceil(max(0.0, most - point[cat])))
+        high = min(100, high + math.ceil(max(0.0, point[cat] - least)))
+    return score, min(low, score), max(high, score)
+
+
+def format_estimate(est: SampleEstimate) -> str:
+    """Text report of a sampled scan."""
+    share = est.sampled / est.files if est.files else 1.0
+    pct = round(CONFIDENCE * 100)
+    lines = [
+        f"🎲 Sampled {est.sampled} of {est.files} files ({share:.0%}, {est.strata} strata)",
+        f"📊 Estimated score: {est.score}/100 ({est.label})  {pct}% CI {est.low}–{est.high}",
+        "",
+        f"  {'category':<11} {'score':>7} {f'{pct}% CI':>9}",
+    ]
+    for c in est.categories:
+        top = CATEGORIES[c.category]["max_deduction"]
+        interval = "exact" if c.exact else f"{c.low}–{c.high}" if c.bounded else "unknown"
+        note = f"  ⚠️  {c.error}" if c.error else ""
+        lines.append(f"  {c.category:<11} {f'{c.score}/{top}':>7} {interval:>9}{note}")
+    unknown = [c.category for c in est.categories if not c.bounded]
+    if unknown:
+        lines.append(f"  Too few files drawn to bound {', '.join(unknown)}; the interval allows any deduction there.")
+    lines.append("")
+    lines.append(
+        f"⏱  {est.seconds:.1f}s; a full scan would take about {est.full_seconds:.1f}s (saved ~{est.saved:.1f}s)"
+    )
+    return "\n".join(lines)
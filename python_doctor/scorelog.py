@@ -0,0 +1,201 @@
+"""Append-only log of every scan's scores, in ``.python-doctor/scores.sqlite``.
+
+``state.json`` holds only the previous run; this log keeps them all, one
+row per run: timestamp, checked-out commit, total and per-category scores
+and scan time. A run appends one row and never rewrites the others.
+Rows are read back by range (``python-doctor trend``) through the
+timestamp index, or from the end through the primary key, e.g. for a
+rolling baseline: the median of the last N runs, in the shape
+:func:`~python_doctor.state.compute_delta` compares against.
+"""
+
+import os
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+
+from . import __version__
+from .rules import CATEGORIES, AnalyzerResult
+from .scorer import category_score
+from .state import STATE_DIR
+
+SCORE_LOG_FILE = "scores.sqlite"
+
+# Runs the rolling baseline covers by default.
+DEFAULT_WINDOW = 10
+
+
+@dataclass
+class RunRecord:
+    """One logged run; *id* orders runs logged in the same second."""
+
+    id: int
+    timestamp: int
+    commit: str | None
+    score: int
+    categories: dict[str, int | None]
+    seconds: float | None
+    version: str
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.timestamp)),
+            "commit": self.commit,
+            "score": self.score,
+            "categories": self.categories,
+            "seconds": self.seconds,
+            "version": self.version,
+        }
+
+
+def _log_path(path: str) -> str:
+    return os.path.join(path, STATE_DIR, SCORE_LOG_FILE)
+
+
+def _connect(path: str, create: bool) -> sqlite3.Connection | None:
+    """Open the log of *path*, creating it (or missing category columns) if *create*."""
+    db_path = _log_path(path)
+    if not create and not os.path.isfile(db_path):
+        return None
+    if create:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    db = sqlite3.connect(db_path)
+    if create:
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "id INTEGER PRIMARY KEY, timestamp INTEGER NOT NULL, git_commit TEXT, score INTEGER NOT NULL, "
+            "seconds REAL, version TEXT)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp)")
+        columns = {row[1] for row in db.execute("PRAGMA table_info(runs)")}
+        for cat in CATEGORIES:
+            if cat not in columns:
+                db.execute(f"ALTER TABLE runs ADD COLUMN {cat} INTEGER")  # nosec B608 — names from CATEGORIES
+    return db
+
+
+def append_run(
+    path: str,
+    results: list[AnalyzerResult],
+    score: int,
+    seconds: float | None = None,
+    commit: str | None = None,
+    timestamp: int | None = None,
+) -> None:
+    """Append one run of *path* to its log."""
+    cats = [r.category for r in results if r.category in CATEGORIES]
+    row = [int(time.time()) if timestamp is None else timestamp, commit, score, seconds, __version__]
+    row += [category_score(r) for r in results if r.category in CATEGORIES]
+    names = ", ".join(["timestamp", "git_commit", "score", "seconds", "version", *cats])
+    db = _connect(path, create=True)
+    try:
+        with db:
+            db.execute(
+                f"INSERT INTO runs ({names}) VALUES ({', '.join('?' * len(row))})", row  # nosec B608
+            )
+    finally:
+        db.close()
+
+
+def _select() -> str:
+    return f"SELECT id, timestamp, git_commit, score, seconds, version, {', '.join(CATEGORIES)} FROM runs"  # nosec B608
+
+
+def _record(row) -> RunRecord:
+    run_id, timestamp, commit, score, seconds, version, *cats = row
+    return RunRecord(run_id, timestamp, commit, score, dict(zip(CATEGORIES, cats)), seconds, version)
+
+
+def _fetch(path: str, clauses: list[str], params: list, last: int | None) -> list[RunRecord]:
+    db = _connect(path, create=False)
+    if db is None:
+        return []
+    sql = _select() + (" WHERE " + " AND ".join(clauses) if clauses else "") + " ORDER BY timestamp DESC, id DESC"
+    if last is not None:
+        sql += " LIMIT ?"
+        params = [*params, last]
+    try:
+        rows = db.execute(sql, params).fetchall()
+    except sqlite3.Error:
+        rows = []
+    finally:
+        db.close()
+    return [_record(row) for row in reversed(rows)]
+
+
+def query_runs(
+    path: str, since: int | None = None, until: int | None = None, last: int | None = None
+) -> list[RunRecord]:
+    """Logged runs with ``since <= timestamp < until``, oldest first; with *last*, only the newest *last*."""
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    return _fetch(path, clauses, params, last)
+
+
+def median_state(runs: list[RunRecord]) -> dict | None:
+    """The median total and category scores of *runs*, shaped like ``state.json``."""
+    if not runs:
+        return None
+    categories = {}
+    for cat in CATEGORIES:
+        values = [r.categories[cat] for r in runs if r.categories.get(cat) is not None]
+        if values:
+            categories[cat] = statistics.median_low(values)
+    return {"score": statistics.median_low(r.score for r in runs), "categories": categories}
+
+
+def rolling_baseline(path: str, window: int = DEFAULT_WINDOW) -> dict | None:
+    """Median of the last *window* logged runs of *path*, or None if none are logged."""
+    return median_state(query_runs(path, last=window))
+
+
+def trend(
+    path: str,
+    since: int | None = None,
+    until: int | None = None,
+    last: int | None = None,
+    window: int = DEFAULT_WINDOW,
+) -> list[tuple[RunRecord, int | None]]:
+    """Logged runs in range, each with the median score of the *window* runs before it.
+
+    The runs just before the range are read too, so the first rows have a
+    baseline; the median is None only when no earlier run is logged.
+    """
+    runs = query_runs(path, since, until, last)
+    if not runs:
+        return []
+    first = runs[0]
+    clauses = ["(timestamp < ? OR (timestamp = ? AND id < ?))"]
+    earlier = _fetch(path, clauses, [first.timestamp, first.timestamp, first.id], window) if window else []
+    history = earlier + runs
+    out = []
+    for i, run in enumerate(runs, start=len(earlier)):
+        before = history[max(0, i - window):i] if window else []
+        out.append((run, statistics.median_low(r.score for r in before) if before else None))
+    return out
+
+
+def format_trend(rows: list[tuple[RunRecord, int | None]], window: int = DEFAULT_WINDOW) -> str:
+    """Text table of logged runs, oldest first, with each one's delta from its rolling median."""
+    lines = [f"📈 Score trend: {len(rows)} logged runs"]
+    if not rows:
+        lines.append("  No runs logged yet; every scan without --no-cache adds one.")
+        return "\n".join(lines)
+    lines.append(f"  {'date':<19} {'commit':<9} {'score':>5} {'median':>6} {'Δ':>4} {'time':>7}")
+    for run, median in rows:
+        date = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(run.timestamp))
+        delta = "" if median is None else f"{run.score - median:+d}"
+        seconds = "" if run.seconds is None else f"{run.seconds:.1f}s"
+        shown = "" if median is None else str(median)
+        lines.append(f"  {date:<19} {(run.commit or '')[:9]:<9} {run.score:>5} {shown:>6} {delta:>4} {seconds:>7}")
+    first, last = rows[0][0].score, rows[-1][0].score
+    lines.append(f"  {first} → {last} ({last - first:+d}); median is over the previous {window} runs")
+    return "\n".join(lines)
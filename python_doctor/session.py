@@ -0,0 +1,221 @@
+"""Reusable scan sessions, for using python-doctor as a library.
+
+``Session(path)`` resolves the project's config and profile once, keeps one
+worker pool for its analyzers and remembers every finding of its last scan
+by file, with the facts the project-wide checks need. :meth:`Session.rescan`
+re-analyzes only the files that changed and rescores each category from the
+remembered findings plus the new ones, the way ``python-doctor merge``
+combines shards (see :mod:`python_doctor.shard`), so it scores exactly what
+a full scan would. Nothing is printed, ``sys.exit`` is never called and
+nothing is written to ``.python-doctor/``::
+
+    with Session("path/to/project") as session:
+        print(session.scan().score)
+        ...  # edit files
+        print(session.rescan(["pkg/mod.py"]).categories)
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from .analyzers._util import SKIP_DIRS
+from .costmodel import CostModel
+from .fingerprint import build_tree, changed_files, root_hash
+from .registry import ANALYZERS, load_analyzer, rescore
+from .rules import CATEGORIES, AnalyzerResult, Finding
+from .runner import analyze_files, analyzer_kwargs, resolve_settings
+from .scorer import category_score, compute_score, score_label
+
+# A change to any of these can change every finding, so rescans after one are full scans.
+CONFIG_FILES = frozenset({"pyproject.toml", "setup.cfg", "ruff.toml", ".ruff.toml", ".bandit"})
+
+
+@dataclass
+class ScanResult:
+    """Outcome of one :class:`Session` scan; *results* are in ``ANALYZERS`` order."""
+
+    score: int
+    results: list[AnalyzerResult]
+    seconds: float
+    # Files re-analyzed by a rescan, relative to the root; None after a full scan.
+    reanalyzed: list[str] | None = None
+
+    @property
+    def label(self) -> str:
+        return score_label(self.score)
+
+    @property
+    def categories(self) -> dict[str, int]:
+        """Score of each category."""
+        return {r.category: category_score(r) for r in self.results}
+
+    @property
+    def findings(self) -> list[Finding]:
+        return [f for r in self.results for f in r.findings]
+
+    @property
+    def errors(self) -> dict[str, str]:
+        """Error of each category whose analyzer failed or was skipped."""
+        return {r.category: r.error for r in self.results if r.error}
+
+
+def _by_file(findings: list[Finding]) -> dict[str, list[Finding]]:
+    grouped: dict[str, list[Finding]] = {}
+    for f in findings:
+        grouped.setdefault(f.file, []).append(f)
+    return grouped
+
+
+class Session:
+    """Scan one project repeatedly, reusing its settings, analyzers and a worker pool.
+
+    *config*, a :class:`~python_doctor.config.Config`, replaces the project's
+    ``[tool.python-doctor]`` table; *profile* overrides the detected profile
+    as ``--profile`` does. Use the session as a context manager, or call
+    :meth:`close`, to shut the pool down. Calls are serialized, so one
+    session can be shared between threads.
+    """
+
+    def __init__(self, path: str = ".", config=None, profile: str | None = None, workers: int | None = None):
+        self.path = os.path.abspath(path)
+        self.config = config
+        self.profile = profile
+        self._settings = resolve_settings(self.path, profile, config)
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers or min(len(ANALYZERS), os.cpu_count() or 4), thread_name_prefix="analyzer"
+        )
+        model = CostModel.load(self.path)
+        predicted = model.category_times("standard", model.last_work)
+        # Longest first, as run_analyzers submits them.
+        self._order = sorted((cat for cat, _mod in ANALYZERS), key=lambda cat: -predicted[cat])
+        self._lock = threading.Lock()
+        self._tree: dict | None = None
+        self._findings: dict[str, dict[str, list[Finding]]] = {}
+        self._facts: dict[str, dict | None] = {}
+        self._errors: dict[str, str | None] = {}
+        self._last: ScanResult | None = None
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def scan(self) -> ScanResult:
+        """Analyze every file. If nothing changed since the last scan, its result is returned as is."""
+        with self._lock:
+            tree = build_tree(self.path)
+            if self._last is not None and root_hash(tree) == root_hash(self._tree):
+                return self._last
+            return self._full_scan(tree)
+
+    def rescan(self, changed_paths: list[str] | None = None) -> ScanResult:
+        """Re-analyze only *changed_paths* (files or directories, absolute or relative to the root).
+
+        Paths that no longer exist drop their findings. Without
+        *changed_paths*, the files changed since the last scan are found by
+        comparing stat fingerprints (see :mod:`python_doctor.fingerprint`).
+        A change to a config file, or a rescan before any scan, runs a full
+        scan.
+        """
+        with self._lock:
+            tree = build_tree(self.path)
+            if self._last is None:
+                return self._full_scan(tree)
+            if changed_paths is None:
+                rels = changed_files(self._tree, tree)
+            else:
+                rels = [os.path.relpath(os.path.join(self.path, p), self.path).replace(os.sep, "/")
+                        for p in changed_paths]
+            if any(os.path.basename(rel) in CONFIG_FILES for rel in rels):
+                if self.config is None:
+                    self._settings = resolve_settings(self.path, self.profile)
+                return self._full_scan(tree)
+            return self._partial_scan(tree, rels)
+
+    def score(self) -> int:
+        """Score of the last scan, scanning first if there was none."""
+        last = self._last
+        return last.score if last is not None else self.scan().score
+
+    def _analyze(self, cat_name: str, files: list[str] | None):
+        """Run one analyzer, unsuppressed, over *files* (every file when None); return its result and facts."""
+        analyzer = load_analyzer(dict(ANALYZERS)[cat_name])
+        kwargs = analyzer_kwargs(cat_name, self.path, False, self._settings[0])
+        if files is not None:
+            return analyze_files(cat_name, analyzer, kwargs, frozenset(files).__contains__, files)
+        if hasattr(analyzer, "analyze_shard"):
+            return analyzer.analyze_shard(**kwargs)
+        return analyzer.analyze(**kwargs), None
+
+    def _run(self, files: list[str] | None) -> dict[str, tuple[AnalyzerResult, dict | None]]:
+        futures = {cat: self._pool.submit(self._analyze, cat, files) for cat in self._order}
+        return {cat: future.result() for cat, future in futures.items()}
+
+    def _full_scan(self, tree: dict) -> ScanResult:
+        started = time.monotonic()
+        for cat, (result, facts) in self._run(None).items():
+            self._findings[cat] = _by_file(result.findings)
+            self._facts[cat] = facts
+            self._errors[cat] = result.error
+        return self._finish(tree, started, None)
+
+    def _partial_scan(self, tree: dict, rels: list[str]) -> ScanResult:
+        started = time.monotonic()
+        touched = {os.path.join(self.path, *rel.split("/")) for rel in rels}
+        # Adding or removing a package marker changes the module names, and
+        # so the import findings, of every file below it.
+        touched.update(os.path.dirname(fp) for fp in list(touched) if os.path.basename(fp) == "__init__.py")
+        files = sorted(fp for fp in self._python_files(touched))
+        prefixes = tuple(p + os.sep for p in touched)
+
+        def stale(file: str) -> bool:
+            return file in touched or file.startswith(prefixes)
+
+        for cat, (result, facts) in self._run(files).items():
+            kept = {file: found for file, found in self._findings[cat].items() if not stale(file)}
+            kept.update(_by_file(result.findings))
+            self._findings[cat] = kept
+            old = self._facts.get(cat)
+            if facts is not None and old is not None:
+                # The tree-wide facts are fresh; per-file facts of unchanged files are kept.
+                facts = {**facts, "files": {
+                    **{fp: entry for fp, entry in old["files"].items() if not stale(fp)}, **facts["files"]
+                }}
+            self._facts[cat] = facts
+            self._errors[cat] = result.error
+        return self._finish(tree, started, sorted(os.path.relpath(fp, self.path).replace(os.sep, "/") for fp in files))
+
+    def _python_files(self, touched: set[str]):
+        """Yield the analyzable Python files among (or under) *touched*."""
+        for target in sorted(touched):
+            rel_parts = os.path.relpath(target, self.path).split(os.sep)
+            if rel_parts[0] == ".." or SKIP_DIRS.intersection(rel_parts):
+                continue
+            if os.path.isfile(target):
+                if target.endswith(".py"):
+                    yield target
+                continue
+            for root, dirs, names in os.walk(target):
+                dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+                yield from (os.path.join(root, name) for name in names if name.endswith(".py"))
+
+    def _finish(self, tree: dict, started: float, reanalyzed: list[str] | None) -> ScanResult:
+        """Score every category from the remembered findings and facts."""
+        overrides, suppress = self._settings
+        results = []
+        for cat, _mod in ANALYZERS:
+            findings = [f for file in sorted(self._findings[cat]) for f in self._findings[cat][file]]
+            cap = overrides.get(cat, CATEGORIES[cat]["max_deduction"])
+            result = rescore(cat, cap, suppress, findings, self._facts.get(cat))
+            result.error = self._errors.get(cat)
+            results.append(result)
+        self._tree = tree
+        self._last = ScanResult(compute_score(results), results, time.monotonic() - started, reanalyzed)
+        return self._last
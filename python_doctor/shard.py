@@ -0,0 +1,219 @@
+"""CI sharding: split one project's scan over several jobs and merge the results.
+
+``--shard i/N`` partitions the project's indexed Python files (see
+:mod:`python_doctor.fingerprint`) into N size-balanced shards, scans only
+shard *i* and writes a partial-results file. ``python-doctor merge`` combines
+the partials, runs the project-wide checks (import cycles, test and
+type-hint ratios, project health) on the merged facts and scores the
+result exactly as a single run would.
+
+The partition depends only on the indexed paths and sizes, so every job
+computes the same one on its own: files are taken largest first (ties
+broken by a hash of the path) and each goes to the currently lightest
+shard. Files a tool reports that are not indexed, such as ``.pyi`` stubs,
+are assigned by a hash of their path.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import zlib
+
+from . import __version__
+from .registry import ANALYZERS, load_analyzer, rescore
+from .rules import AnalyzerResult, Finding
+
+PARTIAL_FORMAT = "python-doctor/shard-1"
+
+# Files only some tools read, so they are not indexed; shards own them by path hash.
+TOOL_ONLY_SUFFIXES = (".pyi", ".ipynb")
+
+# Fixed per-file cost, in bytes of source, so empty files still spread out.
+FILE_OVERHEAD_BYTES = 1024
+
+
+def _path_hash(rel: str) -> int:
+    return zlib.crc32(rel.encode())
+
+
+def index_sizes(tree: dict) -> dict[str, int]:
+    """Return the size of every Python file in a fingerprint *tree*, keyed by relative path."""
+    sizes = {}
+    for rel_dir, node in tree.items():
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        for name, (size, _mtime, _inode) in node["f"].items():
+            if name.endswith(".py"):
+                sizes[prefix + name] = size
+    return sizes
+
+
+class Partition:
+    """A deterministic, size-balanced split of indexed files into *shards* shards.
+
+    Shards are numbered from 1. Relative paths use ``/`` as separator.
+    With *weights* (predicted seconds per file, see
+    :meth:`~python_doctor.costmodel.CostModel.file_weights`) shards are
+    balanced on those instead of sizes; the digest then covers them too.
+    """
+
+    def __init__(self, sizes: dict[str, int], shards: int, weights: dict[str, float] | None = None):
+        if shards < 1:
+            raise ValueError("shard count must be at least 1")
+        self.shards = shards
+        self.owners: dict[str, int] = {}
+        weighted = weights is not None
+        if weights is None:
+            weights = {rel: size + FILE_OVERHEAD_BYTES for rel, size in sizes.items()}
+        loads = [(0, shard) for shard in range(1, shards + 1)]
+        for rel in sorted(sizes, key=lambda r: (-weights[r], _path_hash(r), r)):
+            load, shard = heapq.heappop(loads)
+            self.owners[rel] = shard
+            heapq.heappush(loads, (load + weights[rel], shard))
+        h = hashlib.blake2b(digest_size=16)
+        for rel in sorted(sizes):
+            h.update(f"{rel}\0{sizes[rel]}\n".encode())
+        if weighted:
+            h.update(repr(sorted(weights.items())).encode())
+        self.digest = h.hexdigest()
+
+    def owner(self, rel: str) -> int:
+        """Shard owning *rel*; unindexed files go by a hash of their path."""
+        shard = self.owners.get(rel)
+        if shard is None:
+            shard = _path_hash(rel) % self.shards + 1
+        return shard
+
+    def files(self, shard: int) -> list[str]:
+        """Indexed files owned by *shard*, sorted."""
+        return sorted(rel for rel, owner in self.owners.items() if owner == shard)
+
+    def includer(self, path: str, shard: int):
+        """Return a predicate accepting file paths under *path* that *shard* owns."""
+        def include(file: str) -> bool:
+            return self.owner(_relative(file, path)) == shard
+
+        return include
+
+
+def _relative(file: str, path: str) -> str:
+    return os.path.relpath(file, path).replace(os.sep, "/")
+
+
+def build_partial(
+    path: str, partition: Partition, shard: int, results: list[AnalyzerResult], facts: dict, settings: dict
+) -> dict:
+    """Assemble the partial results of one shard, finding paths relative to *path*."""
+    return {
+        "format": PARTIAL_FORMAT,
+        "version": __version__,
+        "root": path,
+        "shard": shard,
+        "shards": partition.shards,
+        "index": partition.digest,
+        "files": len(partition.files(shard)),
+        **settings,
+        "results": {
+            r.category: {
+                "error": r.error,
+                "suppressed": r.suppressed,
+                "findings": [
+                    [f.rule, f.message, _relative(f.file, path) if f.file else "", f.line, f.severity, f.cost]
+                    for f in r.findings
+                ],
+            }
+            for r in results
+        },
+        "facts": facts,
+    }
+
+
+def shard_files(path: str, partition: Partition, shard: int, tree: dict | None = None) -> list[str]:
+    """Paths under *path* of the files *shard* gives the tools.
+
+    These are the indexed files it owns, plus, given the fingerprint
+    *tree*, the stubs and notebooks it owns, which ruff also checks.
+    """
+    rels = partition.files(shard)
+    if tree is not None:
+        for rel_dir, node in tree.items():
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            rels += [
+                prefix + name for name in node["f"]
+                if name.endswith(TOOL_ONLY_SUFFIXES) and partition.owner(prefix + name) == shard
+            ]
+    return [os.path.join(path, *rel.split("/")) for rel in sorted(rels)]
+
+
+def write_partial(partial: dict, out) -> None:
+    """Write partial results as JSON (import-graph sets become sorted lists)."""
+    json.dump(partial, out, default=sorted, separators=(",", ":"))
+    out.write("\n")
+
+
+def load_partials(paths: list[str]) -> list[dict]:
+    """Read partial-results files, rejecting anything that is not one."""
+    parts = []
+    for p in paths:
+        try:
+            with open(p, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"cannot read partial results '{p}': {e}") from None
+        if not isinstance(data, dict) or data.get("format") != PARTIAL_FORMAT:
+            raise ValueError(f"'{p}' is not a python-doctor shard result")
+        parts.append(data)
+    return parts
+
+
+def _check_complete(parts: list[dict]) -> None:
+    """Require exactly one partial per shard, all of the same tree and version."""
+    if not parts:
+        raise ValueError("no partial results to merge")
+    first = parts[0]
+    for part in parts[1:]:
+        for key, what in (("shards", "shard count"), ("index", "file index"), ("version", "python-doctor version")):
+            if part[key] != first[key]:
+                raise ValueError(f"partials disagree on {what}; were they produced from the same commit?")
+    seen = sorted(part["shard"] for part in parts)
+    expected = list(range(1, first["shards"] + 1))
+    if seen != expected:
+        missing = sorted(set(expected) - set(seen))
+        duplicate = sorted({s for s in seen if seen.count(s) > 1})
+        detail = ", ".join(
+            f"{label} {shards}" for label, shards in (("missing", missing), ("duplicated", duplicate)) if shards
+        )
+        raise ValueError(f"incomplete shard set ({len(parts)} of {first['shards']}): {detail}")
+
+
+def merge_partials(parts: list[dict]) -> tuple[str, list[AnalyzerResult]]:
+    """Combine the partials of every shard into the results of one full run.
+
+    Each category's findings are rescored together; analyzers with
+    project-wide checks run them on the merged facts. Returns the scanned
+    root (as recorded by the first shard) and results in ``ANALYZERS`` order.
+    """
+    _check_complete(parts)
+    parts = sorted(parts, key=lambda part: part["shard"])
+    root = parts[0]["root"]
+    caps = parts[0]["caps"]
+    rules = frozenset(parts[0]["suppressed_rules"])
+    suppress = (lambda rule, _file: rule in rules) if rules else None
+
+    results = []
+    for cat_name, mod in ANALYZERS:
+        data = [part["results"][cat_name] for part in parts]
+        findings = [
+            Finding(cat_name, rule, message, file=os.path.join(root, *rel.split("/")) if rel else "",
+                    line=line, severity=severity, cost=cost)
+            for d in data
+            for rule, message, rel, line, severity, cost in d["findings"]
+        ]
+        facts = [part["facts"].get(cat_name) for part in parts]
+        # A shard whose analyzer failed has no facts; its error is reported instead.
+        analyzer = load_analyzer(mod)
+        merged = analyzer.merge_facts(facts) if hasattr(analyzer, "check_facts") and None not in facts else None
+        result = rescore(cat_name, caps[cat_name], suppress, findings, merged, sum(d["suppressed"] for d in data))
+        result.error = next((d["error"] for d in data if d["error"]), None)
+        results.append(result)
+    return root, results
@@ -9,7 +9,7 @@ import os
 from datetime import datetime, timezone
 
 from . import __version__
-from .rules import AnalyzerResult
+from .rules import AnalyzerResult, Finding
 from .scorer import category_score
 
 STATE_DIR = ".python-doctor"
@@ -88,3 +88,42 @@ def compute_delta(prev: dict | None, current_results: list[AnalyzerResult], curr
         "top_regression": top_regression,
         "has_previous": True,
     }
+
+
+def results_to_dicts(results: list[AnalyzerResult]) -> list[dict]:
+    """Serialize analyzer results (including findings) to JSON-ready dicts."""
+    return [
+        {
+            "category": r.category,
+            "deduction": r.deduction,
+            "error": r.error,
+            "rule_counts": r.rule_counts,
+            "rule_costs": r.rule_costs,
+            "suppressed": r.suppressed,
+            "findings": [
+                [f.rule, f.message, f.file, f.line, f.severity, f.cost] for f in r.findings
+            ],
+        }
+        for r in results
+    ]
+
+
+def results_from_dicts(data: list[dict]) -> list[AnalyzerResult]:
+    """Rebuild analyzer results serialized by :func:`results_to_dicts`."""
+    results = []
+    for item in data:
+        cat = item["category"]
+        findings = [
+            Finding(category=cat, rule=rule, message=msg, file=file, line=line, severity=sev, cost=cost)
+            for rule, msg, file, line, sev, cost in item["findings"]
+        ]
+        results.append(AnalyzerResult(
+            category=cat,
+            findings=findings,
+            deduction=item["deduction"],
+            error=item["error"],
+            rule_counts=item.get("rule_counts", {}),
+            rule_costs=item.get("rule_costs", {}),
+            suppressed=item.get("suppressed", 0),
+        ))
+    return results
@@ -0,0 +1,415 @@
+"""Low-overhead timing instrumentation for scans (``--timings``, ``--trace``).
+
+Only monotonic clock reads and dict updates happen on the hot path, so the
+instrumentation is cheap enough to leave on in CI. Analyzers receive a
+:class:`Timer` (or the no-op :data:`NULL_TIMER`) through their sink and
+wrap their work in phases: ``walk``, ``read``, ``parse``, ``rules``,
+``subprocess`` and ``filtering``. Phases may nest (``filtering`` happens
+inside ``rules``), so they need not add up to the analyzer's wall time.
+
+With a :class:`TraceRecorder` attached, every span is also recorded as a
+Chrome trace event (viewable in Perfetto or ``chrome://tracing``).
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+DEFAULT_TOP_FILES = 10
+
+
+class _Span:
+    """Context manager adding its elapsed wall time to one phase."""
+
+    __slots__ = ("_timer", "_phase", "_start")
+
+    def __init__(self, timer: "Timer", phase: str):
+        self._timer = timer
+        self._phase = phase
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        self._timer.add(self._phase, end - self._start)
+        if self._timer.trace is not None:
+            self._timer.trace.complete(self._phase, self._timer.name, self._start, end)
+
+
+class _FileSpan(_Span):
+    """Context manager recording the time spent on one file."""
+
+    __slots__ = ()
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        self._timer.add_file(self._phase, end - self._start)
+        if self._timer.trace is not None:
+            self._timer.trace.complete(self._timer.trace.relpath(self._phase), "file", self._start, end)
+
+
+class _ToolSpan(_Span):
+    """Context manager timing an external tool run (the ``subprocess`` phase)."""
+
+    __slots__ = ("_cmd",)
+
+    def __init__(self, timer: "Timer", cmd: list[str]):
+        super().__init__(timer, "subprocess")
+        self._cmd = cmd
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        self._timer.add("subprocess", end - self._start)
+        trace = self._timer.trace
+        if trace is not None:
+            tool = tool_name(self._cmd)
+            trace.complete(f"subprocess: {tool}", self._timer.name, self._start, end)
+            trace.complete(
+                tool, "subprocess", self._start, end, args={"cmd": " ".join(self._cmd)}, pid=trace.tool_pid(tool), tid=0
+            )
+
+
+def tool_name(cmd: list[str]) -> str:
+    """Short name of the tool *cmd* runs (``python -m ruff`` -> ``ruff``)."""
+    if len(cmd) > 2 and cmd[1] == "-m":
+        return cmd[2]
+    return os.path.basename(cmd[0])
+
+
+class Timer:
+    """Wall time per phase, plus the slowest files, for one analyzer."""
+
+    def __init__(self, name: str, top_files: int = DEFAULT_TOP_FILES, trace: "TraceRecorder | None" = None):
+        self.name = name
+        self.trace = trace
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.phases: dict[str, float] = {}
+        self._top_files = top_files
+        self._slowest: list[tuple[float, str]] = []
+        # Every file's time, when a caller wants them all (see FileClock).
+        self.files: dict[str, float] | None = None
+
+    def phase(self, name: str) -> _Span:
+        """Time a block of work as part of phase *name*."""
+        return _Span(self, name)
+
+    def file(self, path: str) -> _FileSpan:
+        """Time all the work done on one file."""
+        return _FileSpan(self, path)
+
+    def tool(self, cmd: list[str]) -> _ToolSpan:
+        """Time an external tool run as part of the ``subprocess`` phase."""
+        return _ToolSpan(self, cmd)
+
+    def iterate(self, phase: str, iterable):
+        """Yield from *iterable*, charging only the time spent producing items to *phase*."""
+        it = iter(iterable)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.add(phase, clock() - start)
+                return
+            self.add(phase, clock() - start)
+            yield item
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Charge *seconds* to *phase*."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_file(self, path: str, seconds: float) -> None:
+        """Record a file's processing time, keeping only the slowest few."""
+        if self.files is not None:
+            self.files[path] = self.files.get(path, 0.0) + seconds
+        if len(self._slowest) < self._top_files:
+            heapq.heappush(self._slowest, (seconds, path))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, path))
+
+    def slowest_files(self) -> list[tuple[str, float]]:
+        """Return ``(path, seconds)`` for the slowest files, slowest first."""
+        return [(path, secs) for secs, path in sorted(self._slowest, reverse=True)]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTimer:
+    """Timer stand-in used when timings are off; every call is a no-op."""
+
+    def phase(self, name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def file(self, path: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def tool(self, cmd: list[str]) -> _NullSpan:
+        return _NULL_SPAN
+
+    def iterate(self, phase: str, iterable):
+        return iterable
+
+    def add(self, phase: str, seconds: float) -> None:
+        return None
+
+    def add_file(self, path: str, seconds: float) -> None:
+        return None
+
+
+NULL_TIMER = NullTimer()
+
+
+class FileClock(NullTimer):
+    """Timer that records only the time spent on each file, for the scheduler's per-file costs."""
+
+    trace = None
+
+    def __init__(self):
+        self.files: dict[str, float] = {}
+
+    def file(self, path: str) -> _FileSpan:
+        return _FileSpan(self, path)
+
+    def add_file(self, path: str, seconds: float) -> None:
+        self.files[path] = self.files.get(path, 0.0) + seconds
+
+
+class _AnalyzerSpan:
+    """Context manager measuring an analyzer's wall and thread CPU time."""
+
+    __slots__ = ("_timer", "_wall", "_cpu")
+
+    def __init__(self, timer: Timer):
+        self._timer = timer
+
+    def __enter__(self) -> Timer:
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self._timer
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        self._timer.wall += end - self._wall
+        self._timer.cpu += time.thread_time() - self._cpu
+        if self._timer.trace is not None:
+            self._timer.trace.complete(self._timer.name, "analyzer", self._wall, end)
+
+
+def _children_cpu() -> float:
+    """CPU seconds used by reaped child processes (the external tools)."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class RunTimings:
+    """Timings for a whole scan: one :class:`Timer` per analyzer plus run-level phases."""
+
+    key = "timings"
+
+    def __init__(self, top_files: int = DEFAULT_TOP_FILES, trace: "TraceRecorder | None" = None):
+        self.top_files = top_files
+        self.trace = trace
+        self.run = Timer("run", top_files, trace)
+        self.analyzers: dict[str, Timer] = {}
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.subprocess_cpu = 0.0
+        self.cached = False
+        # Files changed since the stored fingerprint, on a cache miss with one to compare.
+        self.changed_files: int | None = None
+        self._start: tuple[float, float, float] | None = None
+
+    def start(self) -> None:
+        """Start the run-level clocks."""
+        self._start = (time.perf_counter(), time.process_time(), _children_cpu())
+
+    def stop(self) -> None:
+        """Stop the run-level clocks."""
+        if self._start is None:
+            return
+        wall, cpu, children = self._start
+        self.wall = time.perf_counter() - wall
+        self.cpu = time.process_time() - cpu
+        self.subprocess_cpu = _children_cpu() - children
+
+    def record_cache(self, hit: bool, changed: int | None = None) -> None:
+        """Note whether the fingerprint cache supplied the results, and on a miss how many files changed."""
+        self.cached = hit
+        self.changed_files = changed
+        if self.trace is not None:
+            args = None if changed is None else {"changed_files": changed}
+            self.trace.instant("cache hit" if hit else "cache miss", "cache", args)
+
+    def analyzer(self, name: str) -> Timer:
+        """Return the timer for analyzer *name*, creating it on first use."""
+        timer = self.analyzers.get(name)
+        if timer is None:
+            timer = self.analyzers[name] = Timer(name, self.top_files, self.trace)
+        return timer
+
+    def measure(self, name: str) -> _AnalyzerSpan:
+        """Measure wall and CPU time of analyzer *name* (run it inside the block)."""
+        return _AnalyzerSpan(self.analyzer(name))
+
+    def slowest_files(self) -> list[tuple[str, str, float]]:
+        """Return ``(analyzer, path, seconds)`` for the slowest files across analyzers."""
+        rows = [(name, path, secs) for name, t in self.analyzers.items() for path, secs in t.slowest_files()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[: self.top_files]
+
+    def to_dict(self, root: str) -> dict:
+        """JSON-ready summary; file paths are relative to *root*."""
+        return {
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "subprocess_cpu": round(self.subprocess_cpu, 6),
+            "cached": self.cached,
+            "changed_files": self.changed_files,
+            "phases": _rounded(self.run.phases),
+            "analyzers": {
+                name: {"wall": round(t.wall, 6), "cpu": round(t.cpu, 6), "phases": _rounded(t.phases)}
+                for name, t in self.analyzers.items()
+            },
+            "slowest_files": [
+                {"analyzer": name, "file": os.path.relpath(path, root), "seconds": round(secs, 6)}
+                for name, path, secs in self.slowest_files()
+            ],
+        }
+
+    def format_table(self, root: str) -> str:
+        """Human-readable timing table, slowest analyzer first."""
+        phase_names = sorted({p for t in self.analyzers.values() for p in t.phases})
+        header = f"{'analyzer':<12} {'wall':>8} {'cpu':>8}" + "".join(f" {p:>10}" for p in phase_names)
+        title = "⏱ Timings (seconds)"
+        if self.cached:
+            title += " — results from fingerprint cache"
+        elif self.changed_files is not None:
+            title += f" — {self.changed_files} files changed since the cached scan"
+        lines = [title, header]
+        for name, t in sorted(self.analyzers.items(), key=lambda kv: kv[1].wall, reverse=True):
+            cells = "".join(f" {t.phases[p]:>10.3f}" if p in t.phases else f" {'-':>10}" for p in phase_names)
+            lines.append(f"{name:<12} {t.wall:>8.3f} {t.cpu:>8.3f}{cells}")
+        run_phases = "".join(f", {p} {secs:.3f}" for p, secs in self.run.phases.items())
+        totals = f"{'total':<12} {self.wall:>8.3f} {self.cpu:>8.3f}"
+        lines.append(f"{totals}   (tool subprocess cpu {self.subprocess_cpu:.3f}{run_phases})")
+        slowest = self.slowest_files()
+        if slowest:
+            lines.append("")
+            lines.append("Slowest files:")
+            for name, path, secs in slowest:
+                lines.append(f"  {secs:8.4f}  {os.path.relpath(path, root)} ({name})")
+        return "\n".join(lines)
+
+
+def _rounded(phases: dict[str, float]) -> dict[str, float]:
+    return {name: round(secs, 6) for name, secs in phases.items()}
+
+
+class TraceRecorder:
+    """Collects spans as Chrome trace events (the JSON "Trace Event Format").
+
+    Spans from the scan process are laid out by thread; each external tool
+    gets its own process track. Events are kept as tuples and only turned
+    into JSON objects by :meth:`write`.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._events: list[tuple] = []
+        self._threads: dict[int, str] = {}
+        self._tools: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def relpath(self, path: str) -> str:
+        """Return *path* relative to the scanned root, for event names."""
+        return os.path.relpath(path, self.root)
+
+    def _tid(self) -> int:
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if tid not in self._threads:
+            with self._lock:
+                self._threads[tid] = thread.name
+        return tid
+
+    def tool_pid(self, tool: str) -> int:
+        """Return the synthetic process id of *tool*'s track."""
+        with self._lock:
+            pid = self._tools.get(tool)
+            if pid is None:
+                pid = self._tools[tool] = self.pid + 1 + len(self._tools)
+            return pid
+
+    def complete(
+        self,
+        name: str,
+        cat: str,
+        start: float,
+        end: float,
+        args: dict | None = None,
+        pid: int | None = None,
+        tid: int | None = None,
+    ) -> None:
+        """Record a span between two ``time.perf_counter()`` readings."""
+        self._events.append((
+            "X", name, cat, start, end - start,
+            self.pid if pid is None else pid,
+            self._tid() if tid is None else tid,
+            args,
+        ))
+
+    def instant(self, name: str, cat: str, args: dict | None = None) -> None:
+        """Record a point-in-time event on the current thread."""
+        self._events.append(("i", name, cat, time.perf_counter(), 0.0, self.pid, self._tid(), args))
+
+    def events(self) -> list[dict]:
+        """Return the trace events, metadata first."""
+        events = [_metadata("process_name", self.pid, 0, "python-doctor")]
+        events += [_metadata("thread_name", self.pid, tid, name) for tid, name in self._threads.items()]
+        events += [_metadata("process_name", pid, 0, f"{tool} (subprocess)") for tool, pid in self._tools.items()]
+        for ph, name, cat, start, dur, pid, tid, args in self._events:
+            ts = round((start - self._origin) * 1e6, 3)
+            event = {"ph": ph, "name": name, "cat": cat, "ts": ts, "pid": pid, "tid": tid}
+            if ph == "X":
+                event["dur"] = round(dur * 1e6, 3)
+            else:
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+    def write(self, path: str) -> None:
+        """Write the trace as JSON to *path*."""
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, fh)
+
+
+def _metadata(kind: str, pid: int, tid: int, name: str) -> dict:
+    return {"ph": "M", "name": kind, "pid": pid, "tid": tid, "args": {"name": name}}
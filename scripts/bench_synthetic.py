@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Benchmark python-doctor on generated projects, fully offline.
+
+Generates a deterministic synthetic project (seeded; size, nesting depth and
+the rates of exception anti-patterns, import cycles and lint errors are all
+tunable), then runs each analyzer on its own and a full scan end to end,
+each in a fresh interpreter. Wall time, CPU time (including the tool
+subprocesses), peak RSS and files/sec are recorded as JSON so runs from
+two commits can be compared:
+
+    python scripts/bench_synthetic.py --size 10k --out before.json
+    git switch my-branch
+    python scripts/bench_synthetic.py --size 10k --out after.json --compare before.json
+
+Usage: python scripts/bench_synthetic.py [--size 1k|10k|100k | --files N] [--out FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess  # nosec B404 — benchmarks child interpreters
+import sys
+import tempfile
+import time
+
+SCHEMA = "python-doctor/bench-1"
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+ANALYZERS = ["security", "lint", "complexity", "structure", "imports", "exceptions", "zen"]
+MODULES_PER_PACKAGE = 50
+TEST_FRACTION = 0.1
+
+_SCAN = "import sys; from python_doctor.cli import main; sys.argv[0] = 'python-doctor'; main()"
+_ANALYZE = """\
+import json, sys
+from python_doctor import registry
+module = dict(registry.ANALYZERS)[sys.argv[1]]
+r = registry.load_analyzer(module).analyze(sys.argv[2], keep=0)
+print(json.dumps({"findings": r.finding_count, "deduction": r.deduction, "error": r.error}))
+"""
+
+
+# --- corpus generation -------------------------------------------------------
+
+
+def _nested_body(rng: random.Random, depth: int, indent: str) -> list[str]:
+    """A function body whose control flow nests *depth* levels deep."""
+    lines = []
+    for level in range(depth):
+        pad = indent + "    " * level
+        if level % 2:
+            lines.append(f"{pad}if value > {rng.randint(0, 9)}:")
+        else:
+            lines.append(f"{pad}for value in range({rng.randint(2, 9)}):")
+    pad = indent + "    " * depth
+    lines.append(f"{pad}total += value")
+    return lines
+
+
+def _exception_block(rng: random.Random) -> list[str]:
+    """One of the exception patterns the exceptions analyzer looks at."""
+    kind = rng.choice(["bare", "silent", "fallback"])
+    if kind == "bare":
+        return ["    try:", "        total += 1", "    except:", "        total = 0"]
+    if kind == "silent":
+        return ["    try:", "        total += 1", "    except Exception:", "        pass"]
+    return [
+        "    try:", "        total = int(total)", "    except ValueError:", "        pass",
+        "    try:", "        total = float(total)", "    except ValueError:", "        pass",
+    ]
+
+
+def module_source(rng: random.Random, imports: list[str], nesting: int, exception_rate: float, lint_rate: float) -> str:
+    """Source for one synthetic module."""
+    lines = ['"""Synthetic module."""', "", "import os"]
+    lines += [f"import {name}" for name in imports]
+    if rng.random() < lint_rate:
+        lines.append("import sys")  # unused import (F401)
+    lines.append("")
+    for fn in range(rng.randint(3, 6)):
+        lines += ["", f"def func_{fn}(arg: int) -> int:", "    total = arg"]
+        lines += _nested_body(rng, rng.randint(1, nesting), "    ")
+        if rng.random() < exception_rate:
+            lines += _exception_block(rng)
+        if rng.random() < lint_rate:
+            lines.append("    if total == None:")  # E711
+            lines.append("        return 0")
+        lines.append("    return total + len(os.sep)")
+    return "\n".join(lines) + "\n"
+
+
+def generate(
+    root: str,
+    files: int,
+    seed: int = 0,
+    nesting: int = 6,
+    exception_rate: float = 0.2,
+    cycle_rate: float = 0.05,
+    lint_rate: float = 0.1,
+) -> int:
+    """Write a deterministic synthetic project of about *files* Python files to *root*.
+
+    Returns the number of Python files written.
+    """
+    rng = random.Random(seed)
+    written = 0
+    for name, text in (("README.md", "# Synthetic\n"), (".gitignore", "__pycache__/\n")):
+        with open(os.path.join(root, name), "w") as fh:
+            fh.write(text)
+    n_tests = int(files * TEST_FRACTION)
+    n_source = files - n_tests
+    for pkg in range((n_source + MODULES_PER_PACKAGE - 1) // MODULES_PER_PACKAGE):
+        pkg_name = f"pkg_{pkg:05d}"
+        pkg_dir = os.path.join(root, pkg_name)
+        os.makedirs(pkg_dir, exist_ok=True)
+        # Each package holds __init__.py plus up to MODULES_PER_PACKAGE - 1 modules.
+        modules = min(MODULES_PER_PACKAGE, n_source - pkg * MODULES_PER_PACKAGE) - 1
+        imports: dict[int, list[str]] = {i: [] for i in range(modules)}
+        for i in range(0, modules - 1, 2):
+            if rng.random() < cycle_rate:
+                imports[i].append(f"{pkg_name}.mod_{i + 1:03d}")
+                imports[i + 1].append(f"{pkg_name}.mod_{i:03d}")
+        with open(os.path.join(pkg_dir, "__init__.py"), "w") as fh:
+            fh.write('"""Synthetic package."""\n')
+        written += 1
+        for i in range(modules):
+            with open(os.path.join(pkg_dir, f"mod_{i:03d}.py"), "w") as fh:
+                fh.write(module_source(rng, imports[i], nesting, exception_rate, lint_rate))
+            written += 1
+    tests_dir = os.path.join(root, "tests")
+    os.makedirs(tests_dir, exist_ok=True)
+    for i in range(n_tests):
+        with open(os.path.join(tests_dir, f"test_{i:05d}.py"), "w") as fh:
+            fh.write(f"def test_{i}():\n    assert {i} == {i}\n")
+        written += 1
+    return written
+
+
+def _prepare(workdir: str, params: dict) -> int:
+    """Generate the corpus into *workdir*, reusing it if it was built with *params*."""
+    marker = os.path.join(workdir, ".bench-params.json")
+    try:
+        with open(marker) as fh:
+            stored = json.load(fh)
+        if stored["params"] == params:
+            return stored["py_files"]
+    except (OSError, ValueError, KeyError):
+        pass
+    if os.listdir(workdir):
+        sys.exit(f"error: {workdir} is not empty and was not generated with these parameters")
+    py_files = generate(workdir, **params)
+    with open(marker, "w") as fh:
+        json.dump({"params": params, "py_files": py_files}, fh)
+    return py_files
+
+
+# --- measurement -------------------------------------------------------------
+
+
+def _measure(cmd: list[str]) -> dict:
+    """Run *cmd* and return wall, CPU (process tree) and peak RSS, plus its JSON stdout."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)  # nosec B603
+    out = proc.stdout.read()
+    proc.stdout.close()
+    # wait4 reports the child's usage including the tools it waited for;
+    # ru_maxrss is the largest process in that tree (KiB on Linux, bytes on macOS).
+    _pid, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+    rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    try:
+        payload = json.loads(out.splitlines()[-1]) if proc.returncode in (0, 1) else None
+    except (ValueError, IndexError):
+        payload = None
+    return {
+        "wall": round(wall, 4),
+        "cpu": round(usage.ru_utime + usage.ru_stime, 4),
+        "peak_rss": rss,
+        "exit": proc.returncode,
+        "output": payload,
+    }
+
+
+def _best_of(cmd: list[str], runs: int, py_files: int) -> dict:
+    """Measure *cmd* *runs* times and keep the fastest run."""
+    best = min((_measure(cmd) for _ in range(runs)), key=lambda m: m["wall"])
+    best["files_per_sec"] = round(py_files / best["wall"], 1) if best["wall"] else None
+    return best
+
+
+def run_benchmark(workdir: str, py_files: int, runs: int, analyzers: list[str]) -> dict:
+    """Benchmark each analyzer alone and a full ``--json --no-cache`` scan."""
+    results = {}
+    for name in analyzers:
+        results[name] = _best_of([sys.executable, "-c", _ANALYZE, name, workdir], runs, py_files)
+        print(f"  {name:<12} {results[name]['wall']:8.2f} s", file=sys.stderr)
+    scan = _best_of([sys.executable, "-c", _SCAN, workdir, "--json", "--compact", "--no-cache"], runs, py_files)
+    if scan["output"] is not None:
+        scan["output"] = {"score": scan["output"]["score"]}
+    results["end_to_end"] = scan
+    print(f"  {'end_to_end':<12} {scan['wall']:8.2f} s", file=sys.stderr)
+    return results
+
+
+def _commit() -> str | None:
+    """Current git commit of the python-doctor checkout, if any."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run(  # nosec B603 B607
+        ["git", "-C", here, "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False
+    )
+    return proc.stdout.strip() or None
+
+
+# --- comparison --------------------------------------------------------------
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """Print a side-by-side comparison and return the names that regressed."""
+    if old.get("params") != new.get("params"):
+        print("warning: runs used different corpus parameters", file=sys.stderr)
+    print(f"{'':<12} {'wall old':>9} {'wall new':>9} {'change':>8} {'cpu new':>8} {'rss new MiB':>12}")
+    regressed = []
+    for name, now in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        change = (now["wall"] - before["wall"]) / before["wall"] if before["wall"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<12} {before['wall']:>9.2f} {now['wall']:>9.2f} {change:>+8.1%}"
+            f" {now['cpu']:>8.2f} {now['peak_rss'] / 2**20:>12.1f}{flag}"
+        )
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--size", choices=sorted(SIZES), default="1k", help="Preset corpus size (Python files)")
+    size.add_argument("--files", type=int, help="Exact number of Python files to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--nesting", type=int, default=6, help="Maximum control-flow nesting per function")
+    parser.add_argument("--exception-rate", type=float, default=0.2, help="Share of functions with try/except")
+    parser.add_argument("--cycle-rate", type=float, default=0.05, help="Share of module pairs importing each other")
+    parser.add_argument("--lint-rate", type=float, default=0.1, help="Share of modules/functions with lint errors")
+    parser.add_argument("--workdir", help="Where to generate the corpus (reused across runs; default: temp dir)")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per measurement (fastest is kept)")
+    parser.add_argument("--analyzer", action="append", choices=ANALYZERS, help="Only benchmark these analyzers")
+    parser.add_argument("--out", help="Write results JSON to this file (default: stdout)")
+    parser.add_argument("--compare", metavar="FILE", help="Compare with an earlier results file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Wall-time increase that counts as a regression")
+    args = parser.parse_args()
+
+    params = {
+        "files": args.files if args.files is not None else SIZES[args.size],
+        "seed": args.seed,
+        "nesting": args.nesting,
+        "exception_rate": args.exception_rate,
+        "cycle_rate": args.cycle_rate,
+        "lint_rate": args.lint_rate,
+    }
+    with tempfile.TemporaryDirectory(prefix="pd-bench-") as tmp:
+        workdir = os.path.abspath(args.workdir or tmp)
+        os.makedirs(workdir, exist_ok=True)
+        print(f"generating {params['files']} files in {workdir} ...", file=sys.stderr)
+        py_files = _prepare(workdir, params)
+        results = run_benchmark(workdir, py_files, args.runs, args.analyzer or ANALYZERS)
+
+    report = {
+        "schema": SCHEMA,
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": params,
+        "py_files": py_files,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressed = compare(json.load(fh), report, args.threshold)
+        if regressed:
+            print(f"\nregressed by more than {args.threshold:.0%}: {', '.join(regressed)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Check that python-doctor's non-scanning commands start fast.
+
+Runs each command several times in a fresh interpreter and compares the
+best wall time with the budget, then uses ``python -X importtime`` to show
+which imports dominate the CLI's own import cost.
+
+Usage: python scripts/startup_budget.py [--budget-ms 50] [--runs 10]
+"""
+
+import argparse
+import subprocess  # nosec B404 — benchmarks a child interpreter
+import sys
+import time
+
+# The commands our hooks and docs call without scanning anything.
+COMMANDS = [
+    ["--version"],
+    ["--ci"],
+    ["--help"],
+]
+
+# Modules that only a scan needs; importing any of them at startup is a regression.
+SCAN_ONLY_MODULES = [
+    "python_doctor.runner",
+    "python_doctor.analyzers",
+    "python_doctor.config",
+    "python_doctor.state",
+    "concurrent.futures",
+    "tomllib",
+    "json",
+]
+
+_ENTRY = "import sys; from python_doctor.cli import main; sys.argv[0] = 'python-doctor'; main()"
+
+
+def _best_ms(argv: list[str], runs: int) -> float:
+    """Return the fastest of *runs* cold starts, in milliseconds."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", _ENTRY, *argv], capture_output=True, check=False)  # nosec B603
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _interpreter_ms(runs: int) -> float:
+    """Best cold start of a bare interpreter, for reference."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=False)  # nosec B603
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _import_profile(top: int = 8) -> tuple[list[tuple[int, str]], set[str]]:
+    """Return the slowest self-time imports of the CLI and every module imported."""
+    proc = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", "import python_doctor.cli"],
+        capture_output=True, text=True, check=False,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top], {name for _, name in rows}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Maximum cold start per command")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command (best is kept)")
+    args = parser.parse_args()
+
+    _best_ms(["--version"], 1)  # warm the .pyc cache
+    print(f"bare interpreter:          {_interpreter_ms(args.runs):6.1f} ms")
+
+    failed = False
+    for argv in COMMANDS:
+        ms = _best_ms(argv, args.runs)
+        status = "ok" if ms <= args.budget_ms else "OVER BUDGET"
+        failed |= ms > args.budget_ms
+        print(f"python-doctor {' '.join(argv):<12} {ms:6.1f} ms  ({status}, budget {args.budget_ms:.0f} ms)")
+
+    slowest, imported = _import_profile()
+    print("\nslowest imports (self time):")
+    for self_us, name in slowest:
+        print(f"  {self_us / 1000:6.2f} ms  {name}")
+
+    leaked = [m for m in SCAN_ONLY_MODULES if m in imported]
+    if leaked:
+        failed = True
+        print(f"\nscan-only modules imported at startup: {', '.join(leaked)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,7 @@ from python_doctor.analyzers.bandit_analyzer import (
 
 def test_build_cmd_uses_module_when_binary_missing(monkeypatch):
     """Falls back to ``python -m bandit`` when the binary is not on PATH."""
-    monkeypatch.setattr(bandit_analyzer.shutil, "which", lambda _: None)
+    monkeypatch.setattr(bandit_analyzer, "find_tool", lambda _: None)
     cmd = _build_bandit_cmd("/tmp/x", "/tmp/x/.venv")
     assert cmd[1] == "-m"
     assert cmd[2] == "bandit"
@@ -21,7 +21,7 @@ def test_build_cmd_uses_module_when_binary_missing(monkeypatch):
 
 def test_build_cmd_uses_binary_when_available(monkeypatch):
     """Prefers the standalone bandit binary when present."""
-    monkeypatch.setattr(bandit_analyzer.shutil, "which", lambda _: "/usr/bin/bandit")
+    monkeypatch.setattr(bandit_analyzer, "find_tool", lambda _: "/usr/bin/bandit")
     cmd = _build_bandit_cmd("/tmp/x", "")
     assert cmd[0] == "bandit"
     assert "-r" in cmd
@@ -0,0 +1,112 @@
+"""Tests for the findings baseline (--baseline / --update-baseline)."""
+
+import sys
+
+import pytest
+
+from python_doctor import cli
+from python_doctor.baseline import apply_baseline, default_baseline_path, load_baseline, write_baseline
+from python_doctor.registry import rescore
+from python_doctor.rules import CATEGORIES, AnalyzerResult, Finding
+
+CAPS = {cat: spec["max_deduction"] for cat, spec in CATEGORIES.items()}
+
+
+def _result(findings):
+    return [rescore("exceptions", CAPS["exceptions"], None, findings)]
+
+
+def _bare(file, line):
+    return Finding("exceptions", "exceptions/bare", "Bare except", str(file), line, cost=2)
+
+
+def _write_source(tmp_path, padding=0):
+    src = tmp_path / "mod.py"
+    src.write_text("\n" * padding + "try:\n    pass\nexcept:\n    pass\ntry:\n    pass\nexcept:\n    pass\n")
+    return src
+
+
+def test_fingerprints_survive_line_moves(tmp_path):
+    src = _write_source(tmp_path)
+    file = default_baseline_path(str(tmp_path))
+    assert write_baseline(file, str(tmp_path), _result([_bare(src, 3), _bare(src, 7)])) == 2
+
+    _write_source(tmp_path, padding=5)
+    results, report = apply_baseline(
+        str(tmp_path), _result([_bare(src, 8), _bare(src, 12)]), load_baseline(file), CAPS, file
+    )
+    assert results[0].findings == [] and results[0].deduction == 0
+    assert (report.known, report.new, report.fixed) == (2, 0, 0)
+
+
+def test_repeated_lines_are_counted(tmp_path):
+    """A fingerprint written once accepts one finding, not every identical line."""
+    src = _write_source(tmp_path)
+    file = default_baseline_path(str(tmp_path))
+    write_baseline(file, str(tmp_path), _result([_bare(src, 3)]))
+    results, report = apply_baseline(
+        str(tmp_path), _result([_bare(src, 3), _bare(src, 7)]), load_baseline(file), CAPS, file
+    )
+    assert len(results[0].findings) == 1 and results[0].deduction == 2
+    assert (report.known, report.new) == (1, 1)
+
+
+def test_fixed_findings_and_project_findings(tmp_path):
+    file = default_baseline_path(str(tmp_path))
+    ratio = Finding("exceptions", "exceptions/x", "3 of 10 handlers", "", 0, cost=1)
+    write_baseline(file, str(tmp_path), _result([ratio, _bare(tmp_path / "gone.py", 1)]))
+    moved = Finding("exceptions", "exceptions/x", "4 of 12 handlers", "", 0, cost=1)
+    results, report = apply_baseline(str(tmp_path), _result([moved]), load_baseline(file), CAPS, file)
+    assert results[0].findings == []
+    assert (report.known, report.new, report.fixed) == (1, 0, 1)
+
+
+def test_unchanged_results_are_kept(tmp_path):
+    file = default_baseline_path(str(tmp_path))
+    write_baseline(file, str(tmp_path), [AnalyzerResult("exceptions")])
+    original = _result([_bare(_write_source(tmp_path), 3)])
+    results, _report = apply_baseline(str(tmp_path), original, load_baseline(file), CAPS, file)
+    assert results[0] is original[0]
+
+
+def _main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["python-doctor", *argv])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    return exit_info.value.code
+
+
+def test_cli_gates_only_on_new_findings(tmp_path, monkeypatch, capsys):
+    (tmp_path / "app.py").write_text("def f(x):\n    try:\n        return x\n    except:\n        pass\n")
+    assert _main(monkeypatch, str(tmp_path), "--update-baseline") == 0
+    assert "Baseline updated" in capsys.readouterr().out
+    assert _main(monkeypatch, str(tmp_path), "--baseline", "--score", "--min-score", "100", "--no-cache") == 0
+    assert capsys.readouterr().out.strip() == "100"
+
+    (tmp_path / "app.py").write_text(
+        "\n\ndef f(x):\n    try:\n        return x\n    except:\n        pass\n\n\n"
+        "def g(x):\n    try:\n        return x\n    except:\n        return None\n"
+    )
+    assert _main(monkeypatch, str(tmp_path), "--baseline", "--score", "--min-score", "100", "--no-cache") == 1
+
+
+def test_cli_baseline_runs_save_the_whole_scan(tmp_path, monkeypatch, capsys):
+    from python_doctor.state import load_state
+
+    (tmp_path / "app.py").write_text("def f(x):\n    try:\n        return x\n    except:\n        pass\n")
+    assert _main(monkeypatch, str(tmp_path), "--update-baseline") == 0
+    assert _main(monkeypatch, str(tmp_path), "--baseline", "--score", "--min-score", "0") == 0
+    assert capsys.readouterr().out.strip().endswith("100")
+    assert load_state(str(tmp_path))["score"] < 100
+
+
+def test_cli_baseline_strict_fails_on_new_finding(tmp_path, monkeypatch, capsys):
+    (tmp_path / "app.py").write_text("def f(x):\n    try:\n        return x\n    except:\n        pass\n")
+    assert _main(monkeypatch, str(tmp_path), "--update-baseline") == 0
+    assert _main(monkeypatch, str(tmp_path), "--baseline", "--strict", "--min-score", "0") == 0
+    (tmp_path / "app.py").write_text(
+        "def f(x):\n    try:\n        return x\n    except:\n        pass\n\n\n"
+        "def g(x):\n    try:\n        return x\n    except:\n        return None\n"
+    )
+    assert _main(monkeypatch, str(tmp_path), "--baseline", "--strict", "--min-score", "0") == 2
+    assert "from last run" in capsys.readouterr().out
@@ -0,0 +1,32 @@
+"""Tests for CLI helpers."""
+
+import sys
+
+import pytest
+
+from python_doctor import cli
+from python_doctor.output import MAX_FINDINGS_DISPLAY
+
+
+def _args(*argv):
+    return cli._build_parser().parse_args([".", *argv])
+
+
+def test_summary_options_keep_only_displayed_findings():
+    """Score-only output keeps nothing; full reports and baselines keep everything."""
+    assert cli._summary_options(_args("--score")) == {"keep": 0, "score_only": True}
+    assert cli._summary_options(_args("--format", "ndjson")) == {"keep": 0}
+    assert cli._summary_options(_args()) == {"keep": MAX_FINDINGS_DISPLAY}
+    assert cli._summary_options(_args("--verbose")) == {}
+    assert cli._summary_options(_args("--format", "json")) == {}
+    assert cli._summary_options(_args("--score", "--baseline")) == {}
+
+
+
+def test_main_dispatches_subcommands(monkeypatch, tmp_path, capsys):
+    """``python-doctor merge`` runs the subcommand instead of scanning a directory."""
+    monkeypatch.setattr(sys, "argv", ["python-doctor", "merge", str(tmp_path / "missing.json")])
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    assert exc.value.code == 1
+    assert "Error:" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+"""Tests for the stat-based tree fingerprint and result cache."""
+
+import os
+
+from python_doctor.fingerprint import (
+    build_tree,
+    cached_results,
+    changed_files,
+    load_fingerprint,
+    root_hash,
+    save_fingerprint,
+)
+from python_doctor.rules import AnalyzerResult, Finding
+
+
+def _make_tree(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+    (tmp_path / "pkg" / "b.py").write_text("y = 2\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "conf.py").write_text("")
+    (tmp_path / "README.md").write_text("hi\n")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref\n")
+
+
+def _bump_mtime(p):
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_unchanged_tree_has_same_root_hash(tmp_path):
+    """Rebuilding an untouched tree gives the same root hash."""
+    _make_tree(tmp_path)
+    assert root_hash(build_tree(str(tmp_path))) == root_hash(build_tree(str(tmp_path)))
+
+
+def test_skipped_dirs_do_not_affect_hash(tmp_path):
+    """Changes under .git or the state directory leave the fingerprint alone."""
+    _make_tree(tmp_path)
+    before = build_tree(str(tmp_path))
+    (tmp_path / ".git" / "index").write_text("new")
+    (tmp_path / ".python-doctor").mkdir()
+    (tmp_path / ".python-doctor" / "state.json").write_text("{}")
+    assert root_hash(build_tree(str(tmp_path))) == root_hash(before)
+
+
+def test_changed_files_descends_only_into_changed_dirs(tmp_path):
+    """Modified, added and removed files are all reported."""
+    _make_tree(tmp_path)
+    before = build_tree(str(tmp_path))
+    _bump_mtime(tmp_path / "pkg" / "a.py")
+    (tmp_path / "pkg" / "b.py").unlink()
+    (tmp_path / "new").mkdir()
+    (tmp_path / "new" / "c.py").write_text("")
+    after = build_tree(str(tmp_path))
+
+    assert root_hash(after) != root_hash(before)
+    assert after["docs"]["h"] == before["docs"]["h"]
+    assert changed_files(before, after) == ["new/c.py", "pkg/a.py", "pkg/b.py"]
+
+
+def test_cached_results_round_trip_and_invalidation(tmp_path):
+    """Stored results come back while the tree matches and are dropped after a change."""
+    _make_tree(tmp_path)
+    results = [AnalyzerResult(
+        category="zen",
+        deduction=1.0,
+        findings=[Finding(category="zen", rule="zen/dense-code", message="m", file="f.py", line=2, cost=0.5)],
+        rule_counts={"zen/dense-code": 1},
+        rule_costs={"zen/dense-code": 0.5},
+    )]
+    tree = build_tree(str(tmp_path))
+    save_fingerprint(str(tmp_path), tree, "k", results)
+    stored = load_fingerprint(str(tmp_path))
+
+    assert cached_results(stored, build_tree(str(tmp_path)), "k") == results
+    assert cached_results(stored, tree, "other-key") is None
+
+    _bump_mtime(tmp_path / "README.md")
+    assert cached_results(stored, build_tree(str(tmp_path)), "k") is None
+
+
+def test_score_only_cache_not_used_for_full_report(tmp_path):
+    """Results from an early-stopped --score run cannot serve a full report."""
+    _make_tree(tmp_path)
+    tree = build_tree(str(tmp_path))
+    save_fingerprint(str(tmp_path), tree, "k", [AnalyzerResult(category="zen")], keep=0, score_only=True)
+    stored = load_fingerprint(str(tmp_path))
+    assert cached_results(stored, tree, "k", keep=0, score_only=True) is not None
+    assert cached_results(stored, tree, "k", keep=5) is None
@@ -0,0 +1,64 @@
+"""Tests for fleet mode (python-doctor fleet)."""
+
+import io
+import json
+
+from python_doctor import fleet
+from python_doctor.report import NdjsonWriter
+from python_doctor.runner import run_analyzers
+from python_doctor.scorer import compute_score
+
+
+def test_discover_repos_from_directory(tmp_path):
+    """Non-hidden subdirectories are the repositories; files are ignored."""
+    for name in ("b", "a", ".hidden"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "notes.txt").write_text("")
+    assert fleet.discover_repos(str(tmp_path)) == [str(tmp_path / "a"), str(tmp_path / "b")]
+
+
+def test_discover_repos_from_list(tmp_path):
+    """List entries are relative to the list file; comments, blanks and repeats are dropped."""
+    listing = tmp_path / "repos.txt"
+    listing.write_text("# nightly\nsvc-a\n\n/abs/svc-b\nsvc-a\n")
+    assert fleet.discover_repos(str(listing)) == [str(tmp_path / "svc-a"), "/abs/svc-b"]
+
+
+def _repo(root, n):
+    root.mkdir()
+    for i in range(n):
+        source = f"import os\n\n\ndef f{i}(x):\n    try:\n        return x\n    except:\n        pass\n"
+        (root / f"m{i}.py").write_text(source)
+    return str(root)
+
+
+def _run(repos, **kw):
+    buf = io.StringIO()
+    scores = fleet.run_fleet(repos, NdjsonWriter(buf), **kw)
+    return scores, [json.loads(line) for line in buf.getvalue().splitlines()]
+
+
+def test_fleet_matches_single_runs_and_streams_one_line_per_repo(tmp_path, monkeypatch):
+    """Sharded and unsharded repositories score as separate runs would."""
+    monkeypatch.setattr(fleet, "SHARD_BYTES", 1)
+    big = _repo(tmp_path / "big", 6)
+    small = _repo(tmp_path / "small", 1)
+    scores, records = _run([big, small, str(tmp_path / "missing")], workers=2, use_cache=False)
+
+    assert scores == {big: compute_score(run_analyzers(big)), small: compute_score(run_analyzers(small))}
+    repos = {r["path"]: r for r in records if r["type"] == "repo"}
+    assert repos[big]["shards"] == 2
+    assert repos[str(tmp_path / "missing")]["error"] == "not a directory"
+    assert records[-1]["type"] == "fleet"
+    assert records[-1]["scored"] == 2 and records[-1]["errors"] == 1
+
+
+def test_fleet_reuses_fingerprint_cache(tmp_path):
+    """An unchanged repository is answered from its cache on the next run."""
+    repo = _repo(tmp_path / "r", 1)
+    first, records = _run([repo], workers=1)
+    assert records[0]["cached"] is False
+    second, records = _run([repo], workers=1)
+    assert records[0]["cached"] is True
+    assert records[0]["delta"] == 0
+    assert first == second
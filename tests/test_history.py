@@ -0,0 +1,118 @@
+"""Tests for the commit score history and bisection (python-doctor history, bisect)."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from python_doctor.history import score_history
+from python_doctor.regression import bisect_regression
+from python_doctor.runner import run_analyzers
+from python_doctor.scorer import compute_score
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=root, check=True, capture_output=True,
+    )
+
+
+def _commit(root, message):
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", message)
+    return compute_score(run_analyzers(str(root)))
+
+
+def _repo(root):
+    """A repository whose score moves over four commits; returns the score after each."""
+    _git(root, "init", "-q")
+    pkg = root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "a.py").write_text("import pkg.b\n\n\ndef f(x: int) -> int:\n    return x\n")
+    (pkg / "b.py").write_text("def g(x):\n    return x\n")
+    scores = [_commit(root, "initial")]
+    (pkg / "b.py").write_text(
+        "import os\nimport pkg.a\n\n\ndef g(x):\n    try:\n        return eval(x)\n    except:\n        pass\n"
+    )
+    scores.append(_commit(root, "add a cycle and a bare except"))
+    (root / "tests").mkdir()
+    (root / "tests" / "test_a.py").write_text("def test_f():\n    assert True\n")
+    (root / "README.md").write_text("# pkg\n")
+    scores.append(_commit(root, "add tests and readme"))
+    (pkg / "__init__.py").unlink()
+    scores.append(_commit(root, "drop package marker"))
+    return scores
+
+
+def test_history_matches_a_scan_of_each_commit(tmp_path):
+    """Every point scores what a scan of that commit's checkout scores."""
+    scores = _repo(tmp_path)
+    points = score_history(str(tmp_path), 10)
+    assert [p.score for p in points] == scores
+    assert [p.subject for p in points][0] == "initial"
+    assert [p.files for p in points] == [3, 3, 4, 3]
+    assert [p.analyzed for p in points[:2]] == [3, 1]
+
+
+def test_history_reuses_per_file_cache(tmp_path):
+    """A second run analyzes no file versions and gives the same scores."""
+    _repo(tmp_path)
+    first = score_history(str(tmp_path), 10)
+    second = score_history(str(tmp_path), 10)
+    assert [p.score for p in second] == [p.score for p in first]
+    assert all(p.analyzed == 0 for p in second)
+
+
+def test_history_keeps_cache_when_root_files_are_added(tmp_path):
+    """Adding root files and non-package directories analyzes only the new file versions."""
+    scores = _repo(tmp_path)[:3]
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "setup.py").write_text("print('setup')\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "conf.py").write_text("project = 'pkg'\n")
+    scores.append(_commit(tmp_path, "add setup.py and docs"))
+    points = score_history(str(tmp_path), 10)
+    assert [p.score for p in points[:3] + points[4:]] == scores
+    assert [p.analyzed for p in points[2:]] == [1, 3, 2]
+
+
+def test_history_of_subdirectory_skips_commits_without_it(tmp_path):
+    _repo(tmp_path)
+    points = score_history(str(tmp_path / "tests"), 10)
+    assert [p.subject for p in points] == ["add tests and readme", "drop package marker"]
+
+
+def _shas(root):
+    out = subprocess.run(["git", "rev-list", "--reverse", "HEAD"], cwd=root, check=True, capture_output=True, text=True)
+    return out.stdout.split()
+
+
+def test_bisect_finds_first_bad_commit_and_its_findings(tmp_path):
+    scores = _repo(tmp_path)
+    shas = _shas(tmp_path)
+    result = bisect_regression(str(tmp_path), shas[0], shas[-1])
+    assert result.good.value == scores[0] and result.bad.value == scores[-1]
+    assert result.first_bad.commit == shas[1]
+    assert result.parent.commit == shas[0]
+    introduced = {(f["rule"], f["file"]) for f in result.introduced}
+    assert ("exceptions/bare", "pkg/b.py") in introduced
+    assert ("imports/circular", "") in introduced
+
+
+def test_bisect_by_category(tmp_path):
+    _repo(tmp_path)
+    shas = _shas(tmp_path)
+    result = bisect_regression(str(tmp_path), shas[0], shas[-1], category="exceptions")
+    assert result.first_bad.commit == shas[1]
+    assert {f["category"] for f in result.introduced} == {"exceptions"}
+
+
+def test_bisect_without_regression(tmp_path):
+    _repo(tmp_path)
+    shas = _shas(tmp_path)
+    result = bisect_regression(str(tmp_path), shas[1], shas[2], category="structure")
+    assert result.first_bad is None
@@ -0,0 +1,114 @@
+"""Tests for scan levels (--level) and the cost model behind --time-budget."""
+
+import json
+import shutil
+import sys
+
+import pytest
+
+from python_doctor import cli
+from python_doctor.costmodel import CostModel, _makespan
+from python_doctor.registry import ANALYZERS, TOOL_CATEGORIES, level_jobs, rescore
+from python_doctor.rules import Finding
+from python_doctor.runner import ScanOptions, _merge_category, run_analyzers
+
+
+def test_level_jobs():
+    assert {cat for cat, _mod in level_jobs("quick")} == {cat for cat, _mod in ANALYZERS} - TOOL_CATEGORIES
+    assert level_jobs("standard") == ANALYZERS
+    assert ("lint", "vulture_analyzer") in level_jobs("deep")
+
+
+def test_merged_category_scores_like_one_analyzer():
+    a = [Finding("lint", "F401", "unused", "a.py", i, cost=1) for i in range(8)]
+    b = [Finding("lint", "vulture/unused-function", "unused function", "b.py", i, cost=0.5) for i in range(4)]
+    parts = [rescore("lint", 10, None, a), rescore("lint", 10, None, b)]
+    merged = _merge_category("lint", 10, parts, keep=3)
+    assert merged.deduction == rescore("lint", 10, None, a + b).deduction
+    assert len(merged.findings) == 3
+
+
+def test_makespan_spreads_longest_first():
+    assert _makespan([4, 3, 3, 2], 2) == 6
+    assert _makespan([4, 3, 3, 2], 1) == 12
+
+
+def test_predict_fits_recorded_runs():
+    model = CostModel()
+    assert model.predict("security", 2.0) == pytest.approx(6.5)
+    model.record({"security": 2.0}, 1.0)
+    model.record({"security": 4.0}, 3.0)
+    assert model.predict("security", 5.0) == pytest.approx(6.0)
+    # No spread in work: the default curve is scaled through the mean.
+    flat = CostModel({"lint": [[1.0, 1.0], [1.0, 1.0]]})
+    assert flat.predict("lint", 3.0) == pytest.approx(0.2 / 0.1)
+
+
+def test_choose_level_under_budget():
+    model = CostModel({
+        "security": [[1.0, 10.0]], "lint": [[1.0, 1.0]], "complexity": [[1.0, 1.0]], "vulture": [[1.0, 1.0]],
+        "structure": [[1.0, 0.1]], "imports": [[1.0, 0.1]], "exceptions": [[1.0, 0.1]], "zen": [[1.0, 0.1]],
+    })
+    assert model.predict_level("quick", 1.0, workers=1) == pytest.approx(0.4)
+    assert model.choose_level(20, 1.0, workers=1) == "standard"
+    assert model.choose_level(20, 1.0, highest="deep", workers=1) == "deep"
+    assert model.choose_level(5, 1.0, workers=1) == "quick"
+    assert model.choose_level(0.01, 1.0, workers=1) == "quick"
+
+
+def _project(root):
+    (root / "app.py").write_text(
+        "import os\n\n\ndef used(x):\n    return eval(x)\n\n\ndef unused_helper():\n    return 1\n"
+    )
+
+
+@pytest.mark.skipif(shutil.which("vulture") is None, reason="vulture not installed")
+def test_deep_adds_dead_code_to_lint(tmp_path):
+    _project(tmp_path)
+    durations = {}
+    standard = {r.category: r for r in run_analyzers(str(tmp_path))}
+    deep = {r.category: r for r in run_analyzers(str(tmp_path), options=ScanOptions(level="deep", durations=durations))}
+    rules = {f.rule for f in deep["lint"].findings}
+    assert "vulture/unused-function" in rules
+    assert deep["lint"].deduction > standard["lint"].deduction
+    assert deep["security"].deduction == standard["security"].deduction
+    assert "vulture" in durations and "lint" in durations
+
+
+def _main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["python-doctor", *argv])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    return exit_info.value.code
+
+
+def test_quick_reuses_last_full_scan(tmp_path, monkeypatch, capsys):
+    _project(tmp_path)
+    _main(monkeypatch, str(tmp_path), "--format", "json")
+    full = json.loads(capsys.readouterr().out)
+    assert (tmp_path / ".python-doctor" / "costs.json").exists()
+
+    (tmp_path / "other.py").write_text("def g():\n    return 2\n")
+    _main(monkeypatch, str(tmp_path), "--level", "quick", "--format", "json")
+    captured = capsys.readouterr()
+    assert "Level quick" in captured.err
+    quick = json.loads(captured.out)
+    assert sorted(quick["level"]["reused"]) == sorted(TOOL_CATEGORIES)
+    assert quick["categories"]["security"] == full["categories"]["security"]
+
+
+def test_quick_without_full_scan_skips_tools(tmp_path, monkeypatch, capsys):
+    _project(tmp_path)
+    _main(monkeypatch, str(tmp_path), "--level", "quick", "--format", "json", "--no-cache")
+    quick = json.loads(capsys.readouterr().out)
+    assert sorted(quick["level"]["skipped"]) == sorted(TOOL_CATEGORIES)
+
+
+def test_quick_does_not_reuse_deep_results(tmp_path, monkeypatch, capsys):
+    _project(tmp_path)
+    _main(monkeypatch, str(tmp_path), "--level", "deep", "--format", "json")
+    capsys.readouterr()
+    _main(monkeypatch, str(tmp_path), "--level", "quick", "--format", "json")
+    quick = json.loads(capsys.readouterr().out)
+    assert quick["level"]["reused"] == []
+    assert not [f for f in quick["categories"]["lint"]["findings"] if f["rule"].startswith("vulture/")]
@@ -0,0 +1,41 @@
+"""Tests for the memory profiling report."""
+
+import tracemalloc
+
+from python_doctor.analyzers import zen_analyzer
+from python_doctor.memory import MemoryReport, findings_size
+from python_doctor.rules import AnalyzerResult, Finding
+
+
+def _finding(line):
+    return Finding(category="zen", rule="zen/dense-code", message="m", file="/p/a.py", line=line)
+
+
+def test_findings_size_counts_shared_strings_once():
+    """Interned strings shared by many findings are only counted once."""
+    one = findings_size([_finding(1)])
+    many = findings_size([_finding(i) for i in range(100)])
+    assert one < many < 100 * one
+
+
+def test_measure_reports_peak_retained_and_own_sites(tmp_path):
+    """An analyzer run gets a peak at least as large as what it retains."""
+    (tmp_path / "mod.py").write_text("def f():\n    a = 1; b = 2; c = 3\n" * 50)
+    report = MemoryReport()
+    report.start()
+    try:
+        with report.measure("zen"):
+            result = zen_analyzer.analyze(str(tmp_path))
+        report.record_results([result, AnalyzerResult(category="lint")])
+    finally:
+        report.stop()
+
+    assert not tracemalloc.is_tracing()
+    zen = report.analyzers["zen"]
+    assert zen.peak >= zen.retained > 0
+    assert zen.findings == 50
+    assert zen.findings_bytes > 0
+    assert all(not where.startswith("memory.py") for where, _size, _count in zen.sites)
+    data = report.to_dict(str(tmp_path))
+    assert data["analyzers"]["lint"]["findings"] == 0
+    assert "zen" in report.format_table(str(tmp_path))
@@ -0,0 +1,43 @@
+"""Tests for report output and exit codes."""
+
+import io
+import json
+
+from python_doctor import cli, output
+from python_doctor.rules import AnalyzerResult, Finding
+from python_doctor.state import compute_delta
+
+
+def _args(*argv):
+    return cli._build_parser().parse_args([".", *argv])
+
+
+def _results():
+    finding = Finding(category="zen", rule="zen/dense-code", message="m", file="/p/a.py", line=3, cost=10)
+    return [AnalyzerResult(category="zen", findings=[finding], deduction=10)]
+
+
+def test_exit_code_threshold_and_strict():
+    """Below --min-score fails; --strict fails only on a drop from a previous run."""
+    no_previous = compute_delta(None, [], 70)
+    assert output.compute_exit_code(70, _args(), no_previous) == 0
+    assert output.compute_exit_code(40, _args(), no_previous) == 1
+    assert output.compute_exit_code(70, _args("--min-score", "80"), no_previous) == 1
+    assert output.compute_exit_code(70, _args("--strict"), no_previous) == 0
+    dropped = compute_delta({"score": 75, "categories": {}}, [], 70)
+    assert output.compute_exit_code(70, _args("--strict"), dropped) == 2
+    assert output.compute_exit_code(70, _args(), dropped) == 0
+
+
+def test_emit_output_score_only(capsys):
+    output.emit_output(_args("--score"), _results(), "/p", 90, compute_delta(None, [], 90))
+    assert capsys.readouterr().out == "90\n"
+
+
+def test_emit_output_json_payload():
+    out = io.StringIO()
+    output.emit_output(_args("--format", "json"), _results(), "/p", 90, compute_delta(None, [], 90), out)
+    payload = json.loads(out.getvalue())
+    assert payload["score"] == 90
+    assert payload["categories"]["zen"]["deduction"] == 10
+    assert payload["categories"]["zen"]["findings"][0]["rule"] == "zen/dense-code"
@@ -0,0 +1,119 @@
+"""Asymptotic scaling checks for the analyzers' hot functions.
+
+Each case times a function at input size n and 10n and fails if the time
+grows by more than the case's ``max_ratio`` (about 10 for linear code, so a
+quadratic regression shows up as ~100). Ratios are machine-independent
+enough to run everywhere; the measured ratios are kept in
+``perf_baselines.json`` next to this file. Refresh them with::
+
+    PYTHON_DOCTOR_UPDATE_PERF_BASELINES=1 pytest tests/test_perf_scaling.py
+
+Deselect these tests with ``-m "not perf"``.
+"""
+
+import ast
+import json
+import os
+import timeit
+
+import pytest
+
+from python_doctor.analyzers._util import diminishing_deduction, is_test_file
+from python_doctor.analyzers.exceptions_analyzer import _find_fallback_chains
+from python_doctor.analyzers.zen_analyzer import _nesting_depth
+from python_doctor.runner import make_suppressor
+
+BASELINES = os.path.join(os.path.dirname(__file__), "perf_baselines.json")
+_UPDATE = bool(os.environ.get("PYTHON_DOCTOR_UPDATE_PERF_BASELINES"))
+
+
+def _function_tree(n: int) -> ast.AST:
+    """A function with *n* small nested blocks."""
+    body = "".join("    if a:\n        for b in c:\n            d = 1\n" for _ in range(n))
+    return ast.parse(f"def f(a, c):\n{body}").body[0]
+
+
+def _try_module(n: int) -> ast.Module:
+    """A module of *n* functions, each with a fallback chain and a lone handler."""
+    block = (
+        "def f():\n"
+        "    try:\n        a()\n    except ValueError:\n        pass\n"
+        "    try:\n        b()\n    except ValueError:\n        pass\n"
+        "    try:\n        c()\n    except Exception as e:\n        log(e)\n"
+    )
+    return ast.parse(block * n)
+
+
+def _deep_paths(n: int) -> list[str]:
+    """Paths *n* directories deep."""
+    return [os.path.join(*[f"d{i}" for i in range(n)], f"mod_{k}.py") for k in range(50)]
+
+
+def _suppress_all(n: int):
+    """A suppressor plus *n* (rule, file) checks spread over n/10 files."""
+    suppress = make_suppressor("/p", {"ruff/E501"}, {"tests/*": {"bandit/B101"}, "gen/*.py": {"zen/dense-code"}})
+    checks = [("zen/dense-code", f"/p/gen/m{i % max(1, n // 10)}.py") for i in range(n)]
+
+    def run():
+        for rule, file in checks:
+            suppress(rule, file)
+
+    return run
+
+
+# name -> (n, build(n) -> zero-argument callable)
+CASES = {
+    "zen._nesting_depth": (100, lambda n: (lambda tree=_function_tree(n): _nesting_depth(tree))),
+    "exceptions._find_fallback_chains": (50, lambda n: (lambda tree=_try_module(n): _find_fallback_chains(tree))),
+    "diminishing_deduction": (
+        2000, lambda n: (lambda costs=[float(i % 7) for i in range(n)]: diminishing_deduction(costs))
+    ),
+    "is_test_file": (10, lambda n: (lambda paths=_deep_paths(n): [is_test_file(p) for p in paths])),
+    "suppressor": (1000, _suppress_all),
+}
+
+
+_MIN_SAMPLE_SECONDS = 0.02
+
+
+def _per_call(fn) -> float:
+    """Best per-call time of *fn*, sampling batches of at least 20 ms."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < _MIN_SAMPLE_SECONDS:
+        number *= 2
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def _load_baselines() -> dict:
+    with open(BASELINES) as fh:
+        return json.load(fh)
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    data = _load_baselines()
+    yield data
+    if _UPDATE:
+        with open(BASELINES, "w") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_scales_linearly(name, baselines):
+    """Ten times the input costs at most ``max_ratio`` times the time."""
+    n, build = CASES[name]
+    small = build(n)
+    large = build(10 * n)
+    small()  # warm caches (e.g. the suppressor's per-file memo) before timing
+    large()
+    ratio = _per_call(large) / _per_call(small)
+
+    entry = baselines[name]
+    if _UPDATE:
+        entry["ratio"] = round(ratio, 2)
+    assert ratio <= entry["max_ratio"], (
+        f"{name}: 10x input took {ratio:.1f}x longer (allowed {entry['max_ratio']}, baseline {entry['ratio']})"
+    )
@@ -0,0 +1,77 @@
+"""Tests for the streaming report writers."""
+
+import io
+import json
+
+from python_doctor.report import COMPACT_SCHEMA, NdjsonWriter, write_compact_report
+from python_doctor.rules import AnalyzerResult, Finding
+from python_doctor.state import compute_delta
+
+
+def _lines(buf: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in buf.getvalue().splitlines()]
+
+
+def test_ndjson_writes_one_record_per_event():
+    """Findings, categories and the final score each get their own line."""
+    buf = io.StringIO()
+    writer = NdjsonWriter(buf)
+    finding = Finding(category="zen", rule="zen/dense-code", message="m", file="/p/a.py", line=3)
+    result = AnalyzerResult(category="zen", deduction=1.5, rule_counts={"zen/dense-code": 3})
+    writer.finding(finding)
+    writer.category(result)
+    writer.score("/p", 98, compute_delta(None, [result], 98))
+
+    records = _lines(buf)
+    assert [r["type"] for r in records] == ["finding", "category", "score"]
+    assert records[0]["rule"] == "zen/dense-code"
+    assert records[0]["line"] == 3
+    assert records[1]["findings"] == 3
+    assert records[2]["score"] == 98
+    assert records[2]["delta"]["has_previous"] is False
+
+
+def _sample_results():
+    return [
+        AnalyzerResult(category="lint", deduction=2.0, findings=[
+            Finding(category="lint", rule="ruff/F401", message="unused", file="/p/src/a.py", line=1),
+            Finding(category="lint", rule="ruff/F401", message="unused", file="/p/src/b.py", line=2),
+            Finding(category="lint", rule="ruff/E501", message="long", file="/p/src/a.py", line=9),
+        ]),
+        AnalyzerResult(category="structure", deduction=5.0, findings=[
+            Finding(category="structure", rule="structure/no-tests", message="No tests"),
+        ]),
+        AnalyzerResult(category="zen"),
+    ]
+
+
+def test_compact_report_uses_rule_and_file_tables():
+    """Findings reference shared tables; paths are relative to the scan root."""
+    results = _sample_results()
+    buf = io.StringIO()
+    write_compact_report(buf, results, "/p", 93, compute_delta(None, results, 93))
+    data = json.loads(buf.getvalue())
+
+    assert data["schema"] == COMPACT_SCHEMA
+    assert data["score"] == 93
+    assert data["rules"] == ["ruff/F401", "ruff/E501", "structure/no-tests"]
+    assert data["files"] == ["src/a.py", "src/b.py"]
+    assert data["categories"]["lint"]["findings"] == [
+        [0, 0, 1, "medium", "unused"],
+        [0, 1, 2, "medium", "unused"],
+        [1, 0, 9, "medium", "long"],
+    ]
+    assert data["categories"]["structure"]["findings"] == [[2, None, 0, "medium", "No tests"]]
+    assert data["categories"]["zen"]["findings"] == []
+
+
+def test_compact_report_without_indentation():
+    """indent=False writes the same data with no whitespace."""
+    results = _sample_results()
+    delta = compute_delta(None, results, 93)
+    pretty, tight = io.StringIO(), io.StringIO()
+    write_compact_report(pretty, results, "/p", 93, delta)
+    write_compact_report(tight, results, "/p", 93, delta, indent=False)
+    assert json.loads(pretty.getvalue()) == json.loads(tight.getvalue())
+    assert "\n" not in tight.getvalue().rstrip("\n")
+    assert len(tight.getvalue()) < len(pretty.getvalue())
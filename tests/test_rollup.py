@@ -0,0 +1,43 @@
+"""Tests for per-directory score rollups."""
+
+from python_doctor.rollup import RollupReport, build_rollup
+from python_doctor.rules import AnalyzerResult, Finding
+
+
+def _result(category, files, deduction, cost=1.0):
+    findings = [Finding(category=category, rule=f"{category}/x", message="m", file=f, cost=cost) for f in files]
+    return AnalyzerResult(category=category, findings=findings, deduction=deduction)
+
+
+def test_rollup_scores_each_directory_from_its_own_findings():
+    """Directories are scored from the findings beneath them, down to the depth."""
+    results = [
+        _result("lint", ["/p/a/x.py", "/p/a/b/y.py", "/p/c/z.py", "/p/top.py"], 4.0),
+        _result("structure", [""], 3.0),
+    ]
+    rows = {row.path: row for row in build_rollup(results, "/p", depth=2)}
+
+    assert set(rows) == {".", "a", "a/b", "c"}
+    assert rows["."].score == 93  # the analyzers' own deductions
+    assert rows["a"].deductions == {"lint": 2.0}
+    assert rows["a/b"].deductions == {"lint": 1.0}
+    assert rows["c"].score == 99
+    assert rows["."].findings == 5
+
+
+def test_rollup_applies_category_caps_and_depth_limit():
+    """Directory deductions use the (overridable) category caps; deeper dirs fold into their ancestor."""
+    results = [_result("imports", [f"/p/pkg/deep/er/m{i}.py" for i in range(20)], 10.0, cost=2.0)]
+    rows = build_rollup(results, "/p", depth=1, max_deduction={"imports": 5})
+    assert [row.path for row in rows] == [".", "pkg"]
+    assert rows[1].deductions == {"imports": 5}
+
+
+def test_hotspot_table_lists_lowest_scores_first():
+    """The table puts the worst directory first."""
+    results = [_result("lint", ["/p/good/a.py", "/p/bad/a.py", "/p/bad/b.py", "/p/bad/c.py"], 4.0)]
+    report = RollupReport(build_rollup(results, "/p", depth=1), 1)
+    assert [row.path for row in report.hotspots()] == ["bad", "good"]
+    table = report.format_table("/p")
+    assert table.index("bad/") < table.index("good/")
+    assert report.to_dict("/p")["directories"][0]["path"] == "."
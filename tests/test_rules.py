@@ -33,3 +33,26 @@ def test_max_deductions_sum_to_100():
     """Total max deduction across all categories must equal 100."""
     total = sum(cat["max_deduction"] for cat in CATEGORIES.values())
     assert total == 100, f"Max deductions sum to {total}, expected 100"
+
+
+def test_finding_is_slotted():
+    """Finding has no per-instance __dict__."""
+    f = Finding(category="lint", rule="ruff/F401", message="msg")
+    assert not hasattr(f, "__dict__")
+
+
+def test_finding_interns_repeated_strings():
+    """Equal rule IDs and paths built separately share one string object."""
+    parts = ["", "src", "pkg", "mod.py"]
+    a = Finding(category="lint", rule="ruff/" + "F401", message="m", file="/".join(parts))
+    b = Finding(category="lint", rule="ruff/" + "F401", message="m", file="/".join(parts))
+    assert a.rule is b.rule
+    assert a.file is b.file
+
+
+def test_finding_does_not_intern_messages():
+    """Messages are mostly unique, so each finding keeps its own."""
+    a = Finding(category="lint", rule="ruff/F401", message="".join(["unused ", "import x"]))
+    b = Finding(category="lint", rule="ruff/F401", message="".join(["unused ", "import x"]))
+    assert a.message == b.message
+    assert a.message is not b.message
@@ -0,0 +1,115 @@
+"""Tests for the scan runner."""
+
+from python_doctor import runner
+from python_doctor.costmodel import CostModel
+from python_doctor.rules import AnalyzerResult
+from python_doctor.runner import make_suppressor
+
+
+def test_suppressor_none_without_rules():
+    """No predicate is built when nothing is suppressed."""
+    assert make_suppressor("/p", set(), {}) is None
+
+
+def test_suppressor_global_and_per_file():
+    """Global rules match everywhere; per-file rules only under their pattern."""
+    suppress = make_suppressor("/p", {"ruff/E501"}, {"legacy/*": {"zen/long-function"}})
+    assert suppress("ruff/E501", "/p/src/a.py")
+    assert suppress("zen/long-function", "/p/legacy/old.py")
+    assert not suppress("zen/long-function", "/p/src/a.py")
+    assert not suppress("zen/long-function", "")
+
+
+class _FakeAnalyzer:
+    """Stand-in analyzer module returning a fixed deduction."""
+
+    def __init__(self, category, deduction, block=False):
+        self.category = category
+        self.deduction = deduction
+        self.block = block
+        self.started = False
+        self.cancelled = False
+
+    def analyze(self, path, **kw):
+        self.started = True
+        if self.block:
+            self.cancelled = kw["cancel"].wait(timeout=5)
+        return AnalyzerResult(category=self.category, deduction=self.deduction)
+
+
+def _install_fakes(monkeypatch, *fakes):
+    """Make the runner use *fakes* instead of the real analyzer modules."""
+    monkeypatch.setattr(runner, "ANALYZERS", [(fake.category, fake.category) for fake in fakes])
+    monkeypatch.setattr(runner, "load_analyzer", {fake.category: fake for fake in fakes}.get)
+
+
+def test_run_gate_fails_early_and_cancels_outstanding(monkeypatch, tmp_path):
+    """A decided failure returns immediately and cancels slow analyzers."""
+    slow = _FakeAnalyzer("security", 0, block=True)
+    _install_fakes(monkeypatch, slow, _FakeAnalyzer("lint", 20))
+    code, lower, upper = runner.run_gate(str(tmp_path), lambda lo, hi: 1 if hi < 90 else None)
+    assert (code, lower, upper) == (1, 55, 80)
+    # Depending on the worker count the slow analyzer was either never
+    # started or was told to stop.
+    assert slow.cancelled or not slow.started
+
+
+def test_gate_order_follows_recorded_costs(tmp_path):
+    """Gate runs start with the most deduction per predicted second, from the project's recorded timings."""
+    default = [cat for cat, _mod in runner._gate_order(str(tmp_path))]
+    assert default.index("security") > default.index("exceptions")
+    CostModel({"exceptions": [[1.0, 500.0]], "security": [[1.0, 0.01]]}).save(str(tmp_path))
+    learned = [cat for cat, _mod in runner._gate_order(str(tmp_path))]
+    assert learned[0] == "security"
+    assert learned[-1] == "exceptions"
+
+
+def test_run_gate_runs_to_completion_when_undecided(monkeypatch, tmp_path):
+    """Bounds collapse to the exact score once every analyzer has finished."""
+    _install_fakes(monkeypatch, _FakeAnalyzer("zen", 3), _FakeAnalyzer("lint", 2))
+    code, lower, upper = runner.run_gate(str(tmp_path), lambda lo, hi: 0 if lo == hi else None)
+    assert (code, lower, upper) == (0, 95, 95)
+
+
+class _FakeToolAnalyzer(_FakeAnalyzer):
+    """Stand-in for a tool analyzer that supports batched runs."""
+
+    def __init__(self, category):
+        super().__init__(category, 0)
+        self.batches = []
+
+    def fetch_batch(self, paths, fix=False):
+        self.batches.append(list(paths))
+        return {root: [root] * (i + 1) for i, root in enumerate(paths)}
+
+    def analyze(self, path, items=None, **kw):
+        return AnalyzerResult(category=self.category, deduction=len(items or []))
+
+
+def test_run_roots_batches_tools_and_keeps_roots_apart(monkeypatch, tmp_path):
+    """A tool runs once for all roots; each root gets its own share and results."""
+    roots = [str(tmp_path / name) for name in ("a", "b")]
+    for root in roots:
+        (tmp_path / root).mkdir()
+    tool = _FakeToolAnalyzer("lint")
+    _install_fakes(monkeypatch, tool, _FakeAnalyzer("zen", 3))
+    results = runner.run_roots(roots)
+    assert tool.batches == [roots]
+    assert [(r.category, r.deduction) for r in results[roots[0]]] == [("lint", 1), ("zen", 3)]
+    assert [(r.category, r.deduction) for r in results[roots[1]]] == [("lint", 2), ("zen", 3)]
+
+
+class _BrokenToolAnalyzer(_FakeAnalyzer):
+    """Stand-in for a tool analyzer whose tool cannot run on a file list."""
+
+    def fetch_files(self, files):
+        raise FileNotFoundError(2, "No such file or directory", "radon")
+
+
+def test_analyze_files_reports_tool_errors():
+    """A failing tool run on a file list is reported on the result, not swallowed."""
+    analyzer = _BrokenToolAnalyzer("complexity", 0)
+    result, facts = runner.analyze_files("complexity", analyzer, {"path": "/p"}, None, ["/p/a.py"])
+    assert facts is None
+    assert "radon" in result.error
+    assert not analyzer.started
@@ -0,0 +1,82 @@
+"""Tests for sampled scans (--sample / --sample-files)."""
+
+from python_doctor.analyzers._util import DeductionAccumulator
+from python_doctor.runner import run_analyzers
+from python_doctor.sample import draw_sample, estimate_score, weighted_deduction
+from python_doctor.scorer import compute_score
+
+
+def _sizes():
+    sizes = {f"pkg/m{i}.py": 100 + i for i in range(40)}
+    sizes.update({f"tests/test_m{i}.py": 50 for i in range(10)})
+    sizes.update({f"pkg/tests/test_n{i}.py": 50 for i in range(10)})
+    sizes["setup.py"] = 10
+    return sizes
+
+
+def test_draw_sample_is_stratified_and_deterministic():
+    strata = draw_sample(_sizes(), fraction=0.25)
+    by_name = {s.name: s for s in strata}
+    assert set(by_name) == {".", "pkg", "pkg (tests)", "tests (tests)"}
+    assert len(by_name["pkg"].sample) == 10 and len(by_name["pkg (tests)"].sample) == 2
+    assert by_name["."].sample == ["setup.py"] and by_name["."].weight == 1
+    assert all(rel.startswith("pkg/m") for rel in by_name["pkg"].sample)
+    assert [s.sample for s in draw_sample(_sizes(), fraction=0.25)] == [s.sample for s in strata]
+    assert [s.sample for s in draw_sample(_sizes(), fraction=0.25, seed=1)] != [s.sample for s in strata]
+
+
+def test_draw_sample_by_count():
+    strata = draw_sample(_sizes(), count=30)
+    assert sum(len(s.sample) for s in strata) == 31  # each stratum rounded, root module kept
+    assert sum(len(s.sample) for s in draw_sample(_sizes(), count=1000)) == len(_sizes())
+
+
+def test_weighted_deduction_matches_accumulator_for_whole_weights():
+    costs = [2, 2, 1, 1, 1, 0.5, 0.5, 3]
+    acc = DeductionAccumulator.for_category("security")
+    for cost in costs * 3:
+        acc.add(cost)
+    assert weighted_deduction("security", [(c, 3) for c in costs], 100) == acc.total
+    assert weighted_deduction("security", [(c, 3) for c in costs], 5) == 5
+    assert weighted_deduction("exceptions", [(2, 2.5)], 10) == 5
+    assert weighted_deduction("security", [(2, 10)], 100, linear=True) == 20
+
+
+def _project(root):
+    pkg = root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    for i in range(6):
+        (pkg / f"m{i}.py").write_text(
+            "import os\n\n\ndef f(x):\n    try:\n        return eval(x)\n    except:\n        pass\n" if i % 2 else
+            "def g(x: int) -> int:\n    return x\n"
+        )
+
+
+def test_full_sample_gives_the_exact_score(tmp_path):
+    _project(tmp_path)
+    estimate = estimate_score(str(tmp_path), fraction=1.0)
+    assert estimate.sampled == estimate.files == 7
+    assert estimate.score == estimate.low == estimate.high == compute_score(run_analyzers(str(tmp_path)))
+
+
+def test_partial_sample_interval_contains_estimate(tmp_path):
+    _project(tmp_path)
+    estimate = estimate_score(str(tmp_path), count=3)
+    assert estimate.sampled < estimate.files
+    assert estimate.low <= estimate.score <= estimate.high
+    exact = {c.category for c in estimate.categories if c.exact}
+    assert exact == {"structure", "imports"}
+
+
+def test_small_stratum_interval_contains_full_score(tmp_path):
+    """A partly drawn stratum gets at least two files, so its interval is not a single point."""
+    bad = "def f(x):\n    try:\n        return eval(x)\n    except:\n        pass\n"
+    (tmp_path / "a.py").write_text(bad)
+    (tmp_path / "b.py").write_text("def g(x: int) -> int:\n    return x\n")
+    (tmp_path / "c.py").write_text("def h(x: int) -> int:\n    return x + 1\n")
+    full = compute_score(run_analyzers(str(tmp_path)))
+    for seed in range(4):
+        estimate = estimate_score(str(tmp_path), fraction=0.1, seed=seed)
+        assert estimate.sampled == 2
+        assert estimate.low <= full <= estimate.high
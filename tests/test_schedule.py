@@ -0,0 +1,54 @@
+"""Tests for scheduling analyzers and shards from recorded timings."""
+
+import os
+
+import pytest
+
+from python_doctor.costmodel import CostModel, load_file_costs, save_file_costs
+from python_doctor.runner import ANALYZERS, ScanOptions, run_analyzers
+from python_doctor.shard import FILE_OVERHEAD_BYTES, Partition
+
+
+def _project(root):
+    (root / "a.py").write_text("def f(x):\n    try:\n        return x\n    except:\n        pass\n")
+    (root / "b.py").write_text("import os\n")
+
+
+def test_longest_predicted_analyzer_starts_first(tmp_path, monkeypatch):
+    _project(tmp_path)
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)  # one worker: completion order is submission order
+    model = CostModel({"zen": [[1.0, 60.0]], "imports": [[1.0, 30.0]]})
+    finished = []
+    options = ScanOptions(cost_model=model, work=1.0, on_result=lambda r: finished.append(r.category))
+    results = run_analyzers(str(tmp_path), options=options)
+    assert finished[:3] == ["zen", "imports", "security"]
+    assert [r.category for r in results] == [cat for cat, _mod in ANALYZERS]
+
+
+def test_file_durations_are_recorded(tmp_path):
+    _project(tmp_path)
+    file_durations = {}
+    run_analyzers(str(tmp_path), options=ScanOptions(file_durations=file_durations))
+    assert {os.path.basename(f) for f in file_durations} == {"a.py", "b.py"}
+    save_file_costs(str(tmp_path), file_durations)
+    assert set(load_file_costs(str(tmp_path))) == {"a.py", "b.py"}
+
+
+def test_partition_balances_weights():
+    sizes = {"big.py": 9000, "slow.py": 100, "c.py": 100, "d.py": 100}
+    by_size = Partition(sizes, 2)
+    assert by_size.files(1) == ["big.py"]
+    weights = {"big.py": 1.0, "slow.py": 5.0, "c.py": 0.5, "d.py": 0.5}
+    by_time = Partition(sizes, 2, weights)
+    assert by_time.files(1) == ["slow.py"] and by_time.files(2) == ["big.py", "c.py", "d.py"]
+    assert by_time.digest != by_size.digest
+    assert Partition(sizes, 2, weights).digest == by_time.digest
+
+
+def test_file_weights_use_recorded_times():
+    sizes = {"a.py": 1000, "b.py": 1000, "new.py": 3000}
+    weights = CostModel().file_weights(sizes, {"a.py": 2.0, "b.py": 0.0})
+    assert weights["a.py"] - weights["b.py"] == 2.0
+    # Unrecorded files go by size at the recorded files' mean rate.
+    ratio = (3000 + FILE_OVERHEAD_BYTES) / (1000 + FILE_OVERHEAD_BYTES)
+    assert weights["new.py"] == pytest.approx(weights["b.py"] * ratio + 1.0 * ratio)
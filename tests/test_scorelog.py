@@ -0,0 +1,69 @@
+"""Tests for the append-only score log and rolling baselines."""
+
+import sqlite3
+
+from python_doctor import commands
+from python_doctor.rules import CATEGORIES, AnalyzerResult
+from python_doctor.scorelog import append_run, query_runs, rolling_baseline, trend
+from python_doctor.state import compute_delta
+
+
+def _results():
+    return [AnalyzerResult(category=cat, deduction=0) for cat in CATEGORIES]
+
+
+def _log(tmp_path, scores, start=1000):
+    for i, score in enumerate(scores):
+        append_run(str(tmp_path), _results(), score, seconds=1.5, commit=f"c{i}", timestamp=start + i * 10)
+
+
+def test_query_runs_missing_log(tmp_path):
+    assert query_runs(str(tmp_path)) == []
+    assert rolling_baseline(str(tmp_path)) is None
+
+
+def test_append_and_query_range(tmp_path):
+    _log(tmp_path, [70, 80, 90, 60])
+    runs = query_runs(str(tmp_path))
+    assert [r.score for r in runs] == [70, 80, 90, 60]
+    assert runs[0].commit == "c0" and runs[0].seconds == 1.5
+    assert runs[0].categories["security"] == CATEGORIES["security"]["max_deduction"]
+    assert [r.score for r in query_runs(str(tmp_path), since=1010, until=1030)] == [80, 90]
+    assert [r.score for r in query_runs(str(tmp_path), last=2)] == [90, 60]
+
+
+def test_rolling_baseline_is_median_of_last_runs(tmp_path):
+    _log(tmp_path, [10, 70, 80, 90, 60])
+    baseline = rolling_baseline(str(tmp_path), window=3)
+    assert baseline["score"] == 80
+    delta = compute_delta(baseline, _results(), 85)
+    assert delta["has_previous"] and delta["total_delta"] == 5
+
+
+def test_trend_medians_use_runs_before_the_range(tmp_path):
+    _log(tmp_path, [70, 80, 90, 60])
+    rows = trend(str(tmp_path), last=2, window=2)
+    assert [(run.score, median) for run, median in rows] == [(90, 70), (60, 80)]
+    assert trend(str(tmp_path), window=2)[0][1] is None
+
+
+def test_missing_category_columns_are_added(tmp_path):
+    """Logs written before a category existed gain its column on the next append."""
+    db_dir = tmp_path / ".python-doctor"
+    db_dir.mkdir()
+    db = sqlite3.connect(db_dir / "scores.sqlite")
+    db.execute(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY, timestamp INTEGER NOT NULL, git_commit TEXT, "
+        "score INTEGER NOT NULL, seconds REAL, version TEXT, security INTEGER)"
+    )
+    db.commit()
+    db.close()
+    _log(tmp_path, [75])
+    assert query_runs(str(tmp_path))[0].categories["zen"] == CATEGORIES["zen"]["max_deduction"]
+
+
+def test_trend_command(tmp_path, capsys):
+    _log(tmp_path, [70, 80])
+    assert commands.run("trend", [str(tmp_path), "--since", "1970-01-01"]) == 0
+    out = capsys.readouterr().out
+    assert "2 logged runs" in out and "70 → 80 (+10)" in out
@@ -0,0 +1,75 @@
+"""Tests for the library API (python_doctor.Session)."""
+
+import subprocess
+import sys
+
+import python_doctor
+from python_doctor.config import Config
+from python_doctor.costmodel import CostModel
+from python_doctor.runner import run_analyzers
+from python_doctor.scorer import compute_score
+
+
+def _project(root):
+    pkg = root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "a.py").write_text("import os\n\n\ndef f(x):\n    try:\n        return eval(x)\n    except:\n        pass\n")
+    (pkg / "b.py").write_text("from pkg import a\n\n\ndef g():\n    return a.f('1')\n")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_a.py").write_text("def test_f():\n    assert True\n")
+
+
+def _assert_matches_full_run(root, scan):
+    full = run_analyzers(str(root))
+    assert scan.score == compute_score(full)
+    assert [(r.category, r.deduction, len(r.findings)) for r in scan.results] == [
+        (r.category, r.deduction, len(r.findings)) for r in full
+    ]
+
+
+def test_scan_matches_run_analyzers_and_is_reused(tmp_path):
+    _project(tmp_path)
+    with python_doctor.Session(str(tmp_path)) as session:
+        scan = session.scan()
+        _assert_matches_full_run(tmp_path, scan)
+        assert scan.reanalyzed is None and session.score() == scan.score
+        assert session.scan() is scan
+
+
+def test_rescan_reanalyzes_only_changed_files(tmp_path):
+    _project(tmp_path)
+    with python_doctor.Session(str(tmp_path)) as session:
+        session.scan()
+        (tmp_path / "pkg" / "b.py").write_text("def g(x):\n    try:\n        return x\n    except:\n        pass\n")
+        (tmp_path / "pkg" / "a.py").unlink()
+        (tmp_path / "pkg" / "c.py").write_text("from os import *\n")
+        scan = session.rescan(["pkg/a.py", "pkg/b.py", str(tmp_path / "pkg" / "c.py")])
+        assert scan.reanalyzed == ["pkg/b.py", "pkg/c.py"]
+        _assert_matches_full_run(tmp_path, scan)
+
+        (tmp_path / "pkg" / "c.py").write_text("x = 1\n")
+        scan = session.rescan()
+        assert scan.reanalyzed == ["pkg/c.py"]
+        _assert_matches_full_run(tmp_path, scan)
+
+
+def test_config_replaces_pyproject(tmp_path):
+    _project(tmp_path)
+    with python_doctor.Session(str(tmp_path)) as session:
+        assert "exceptions/bare" in {f.rule for f in session.scan().findings}
+    with python_doctor.Session(str(tmp_path), config=Config(suppress_rules={"exceptions/bare"})) as session:
+        assert "exceptions/bare" not in {f.rule for f in session.scan().findings}
+
+
+def test_analyzers_start_in_recorded_cost_order(tmp_path):
+    """The analyzer the project's recorded timings say is slowest is submitted first."""
+    _project(tmp_path)
+    CostModel({"zen": [[1.0, 60.0]]}).save(str(tmp_path))
+    with python_doctor.Session(str(tmp_path)) as session:
+        assert session._order[0] == "zen"
+
+
+def test_session_is_imported_lazily():
+    code = "import sys, python_doctor; assert 'python_doctor.session' not in sys.modules; python_doctor.Session"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,120 @@
+"""Tests for CI sharding (--shard) and merging partial results."""
+
+import io
+import json
+
+import pytest
+
+from python_doctor.fingerprint import build_tree
+from python_doctor.runner import run_analyzers, scan_shard
+from python_doctor.scorer import compute_score
+from python_doctor.shard import Partition, index_sizes, merge_partials, shard_files, write_partial
+
+
+def test_partition_is_deterministic_and_complete():
+    """Every file gets exactly one shard, the same one whatever the input order."""
+    sizes = {f"pkg/m{i}.py": (i * 37) % 500 for i in range(40)}
+    a = Partition(sizes, 4)
+    b = Partition(dict(reversed(list(sizes.items()))), 4)
+    assert a.owners == b.owners
+    assert a.digest == b.digest
+    assert sorted(f for shard in range(1, 5) for f in a.files(shard)) == sorted(sizes)
+
+
+def test_partition_balances_sizes():
+    """Large files are spread out instead of landing in one shard."""
+    sizes = {"big1.py": 10_000, "big2.py": 10_000, **{f"s{i}.py": 100 for i in range(20)}}
+    part = Partition(sizes, 2)
+    assert part.owner("big1.py") != part.owner("big2.py")
+    loads = [sum(sizes[f] for f in part.files(shard)) for shard in (1, 2)]
+    assert abs(loads[0] - loads[1]) <= 1_000
+
+
+def test_partition_hashes_unindexed_files():
+    """Files a tool reports outside the index still map to a stable shard."""
+    part = Partition({"a.py": 10}, 3)
+    assert part.owner("stubs/a.pyi") == part.owner("stubs/a.pyi")
+    assert 1 <= part.owner("stubs/a.pyi") <= 3
+
+
+def test_partition_digest_tracks_tree():
+    """Partials from different trees are told apart by the index digest."""
+    assert Partition({"a.py": 1}, 2).digest != Partition({"a.py": 2}, 2).digest
+
+
+def _project(root):
+    """A small project exercising per-file and project-wide checks."""
+    pkg = root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "a.py").write_text("import pkg.b\n\n\ndef f(x: int) -> int:\n    return pkg.b.g(x)\n")
+    (pkg / "b.py").write_text("import os\nimport pkg.a\n\n\ndef g(x):\n    return pkg.a.f(x)\n")
+    (pkg / "c.py").write_text(
+        "from os.path import *\n\n\ndef h():\n    try:\n        eval('1')\n    except:\n        pass\n"
+    )
+    (pkg / "d.py").write_text("x = 1; y = 2; z = 3\n" + "w = 1\n" * 1100)
+    (pkg / "e.pyi").write_text("import os\n\ndef e() -> int: ...\n")
+    tests = root / "tests"
+    tests.mkdir()
+    (tests / "test_a.py").write_text("def test_f():\n    assert True\n")
+
+
+def _merged(root, shards):
+    parts = []
+    for shard in range(1, shards + 1):
+        buf = io.StringIO()
+        write_partial(scan_shard(str(root), shard, shards), buf)
+        parts.append(json.loads(buf.getvalue()))
+    return merge_partials(parts)
+
+
+def _finding_keys(results):
+    return {r.category: sorted((f.rule, f.file, f.line, f.message) for f in r.findings) for r in results}
+
+
+def test_merged_shards_match_single_run(tmp_path):
+    """Merging every shard gives the same findings, deductions and score as one run."""
+    _project(tmp_path)
+    single = run_analyzers(str(tmp_path))
+    root, merged = _merged(tmp_path, 3)
+    assert root == str(tmp_path)
+    assert compute_score(merged) == compute_score(single)
+    assert [r.deduction for r in merged] == [r.deduction for r in single]
+    assert _finding_keys(merged) == _finding_keys(single)
+    rules = {f.rule for r in merged for f in r.findings}
+    assert "imports/circular" in rules
+    assert "structure/large-file" in rules
+
+
+def test_shard_files_split_the_tree(tmp_path):
+    """Each file the tools check goes to exactly one shard, stubs included."""
+    _project(tmp_path)
+    tree = build_tree(str(tmp_path))
+    partition = Partition(index_sizes(tree), 3)
+    shards = [shard_files(str(tmp_path), partition, shard, tree) for shard in range(1, 4)]
+    given = sorted(f for files in shards for f in files)
+    assert len(given) == len(set(given)) == 7
+    assert str(tmp_path / "pkg" / "e.pyi") in given
+    assert sorted(shard_files(str(tmp_path), partition, 1)) == sorted(f for f in shards[0] if f.endswith(".py"))
+
+
+def _partial(shard, shards=2, index="x"):
+    return {
+        "format": "python-doctor/shard-1", "version": "1", "root": "/p", "shard": shard, "shards": shards,
+        "index": index, "files": 0, "caps": {}, "suppressed_rules": [], "results": {}, "facts": {},
+    }
+
+
+def test_merge_rejects_missing_shard():
+    with pytest.raises(ValueError, match="missing \\[2\\]"):
+        merge_partials([_partial(1)])
+
+
+def test_merge_rejects_duplicate_shard():
+    with pytest.raises(ValueError, match="duplicated \\[1\\]"):
+        merge_partials([_partial(1), _partial(1)])
+
+
+def test_merge_rejects_different_trees():
+    with pytest.raises(ValueError, match="file index"):
+        merge_partials([_partial(1), _partial(2, index="y")])
@@ -0,0 +1,45 @@
+"""Tests that the CLI's non-scanning commands stay cheap to start."""
+
+import json
+import subprocess
+import sys
+
+SCAN_ONLY_MODULES = [
+    "python_doctor.runner",
+    "python_doctor.analyzers",
+    "python_doctor.config",
+    "python_doctor.state",
+    "concurrent.futures",
+    "tomllib",
+]
+
+
+def _modules_after(code: str) -> set[str]:
+    """Run *code* in a fresh interpreter and return the modules it imported."""
+    probe = f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+def test_importing_cli_skips_scan_modules():
+    """Importing the CLI does not pull in analyzers or scan machinery."""
+    loaded = _modules_after("import python_doctor.cli")
+    assert not [m for m in SCAN_ONLY_MODULES if m in loaded]
+
+
+def test_ci_command_skips_scan_modules():
+    """--ci prints the workflow without importing anything scan-related."""
+    code = (
+        "from python_doctor import cli\n"
+        "sys.argv = ['python-doctor', '--ci']\n"
+        "cli.main()"
+    )
+    loaded = _modules_after(code)
+    assert not [m for m in SCAN_ONLY_MODULES if m in loaded]
+
+
+def test_cli_still_exposes_run_analyzers():
+    """The scan entry points remain reachable from the cli module."""
+    from python_doctor import cli, runner
+
+    assert cli.run_analyzers is runner.run_analyzers
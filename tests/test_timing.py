@@ -0,0 +1,98 @@
+"""Tests for scan timing and trace instrumentation."""
+
+import json
+import sys
+
+import pytest
+
+from python_doctor import cli
+from python_doctor.analyzers import zen_analyzer
+from python_doctor.timing import NULL_TIMER, RunTimings, Timer, TraceRecorder
+
+
+def test_timer_accumulates_phases_and_keeps_slowest_files():
+    """Phase totals add up and only the slowest files are retained."""
+    timer = Timer("zen", top_files=2)
+    timer.add("parse", 0.5)
+    timer.add("parse", 0.25)
+    for path, secs in (("a.py", 0.1), ("b.py", 0.3), ("c.py", 0.2)):
+        timer.add_file(path, secs)
+    assert timer.phases == {"parse": 0.75}
+    assert timer.slowest_files() == [("b.py", 0.3), ("c.py", 0.2)]
+
+
+def test_iterate_charges_only_item_production():
+    """Work done by the consumer between items is not charged to the phase."""
+    timer = Timer("zen")
+    assert list(timer.iterate("walk", [1, 2, 3])) == [1, 2, 3]
+    assert set(timer.phases) == {"walk"}
+
+
+def test_null_timer_is_transparent():
+    """The disabled timer records nothing and passes iterables through."""
+    items = [1, 2]
+    assert NULL_TIMER.iterate("walk", items) is items
+    with NULL_TIMER.phase("parse"), NULL_TIMER.file("a.py"):
+        pass
+
+
+def test_analyzer_reports_phases_and_files(tmp_path):
+    """An in-process analyzer fills in walk/read/parse/rules and per-file times."""
+    src = tmp_path / "pkg"
+    src.mkdir()
+    (src / "mod.py").write_text("def f():\n    return 1\n")
+    timings = RunTimings()
+    timings.start()
+    with timings.measure("zen") as timer:
+        zen_analyzer.analyze(str(tmp_path), timer=timer)
+    timings.stop()
+
+    data = timings.to_dict(str(tmp_path))
+    assert {"walk", "read", "parse", "rules"} <= set(data["analyzers"]["zen"]["phases"])
+    assert data["slowest_files"][0]["file"] == "pkg/mod.py"
+    assert data["wall"] >= data["analyzers"]["zen"]["wall"]
+    assert "zen" in timings.format_table(str(tmp_path))
+
+
+def test_trace_records_analyzer_file_and_tool_spans(tmp_path):
+    """Trace events cover analyzers, files and tools, with tools on their own process track."""
+    (tmp_path / "mod.py").write_text("x = 1\n")
+    trace = TraceRecorder(str(tmp_path))
+    timings = RunTimings(trace=trace)
+    with timings.measure("zen") as timer:
+        zen_analyzer.analyze(str(tmp_path), timer=timer)
+        with timer.tool([sys.executable, "-m", "ruff", "check"]):
+            pass
+    timings.record_cache(False)
+    out = tmp_path / "trace.json"
+    trace.write(str(out))
+
+    events = json.loads(out.read_text())["traceEvents"]
+    spans = {(e["cat"], e["name"]): e for e in events if e["ph"] == "X"}
+    assert ("analyzer", "zen") in spans
+    assert ("file", "mod.py") in spans
+    assert ("zen", "parse") in spans
+    tool = spans[("subprocess", "ruff")]
+    assert tool["pid"] != trace.pid
+    names = {e["pid"]: e["args"]["name"] for e in events if e["ph"] == "M" and e["name"] == "process_name"}
+    assert names[tool["pid"]] == "ruff (subprocess)"
+    assert any(e["ph"] == "i" and e["name"] == "cache miss" for e in events)
+
+
+def _timed_scan(monkeypatch, capsys, path) -> dict:
+    monkeypatch.setattr(sys, "argv", ["python-doctor", str(path), "--timings", "--format", "json", "--min-score", "0"])
+    with pytest.raises(SystemExit):
+        cli.main()
+    return json.loads(capsys.readouterr().out)["timings"]
+
+
+def test_cache_miss_reports_changed_files(tmp_path, monkeypatch, capsys):
+    """A rescan after an edit reports how many files changed since the cached scan."""
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("y = 2\n")
+    first = _timed_scan(monkeypatch, capsys, tmp_path)
+    assert (first["cached"], first["changed_files"]) == (False, None)
+    assert _timed_scan(monkeypatch, capsys, tmp_path)["cached"]
+    (tmp_path / "b.py").write_text("y = 3  # edited\n")
+    again = _timed_scan(monkeypatch, capsys, tmp_path)
+    assert (again["cached"], again["changed_files"]) == (False, 1)
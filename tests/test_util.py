@@ -0,0 +1,95 @@
+"""Tests for the shared analyzer utilities."""
+
+import sys
+import threading
+
+import pytest
+
+from python_doctor.analyzers._util import FindingSink, ToolCancelled, run_tool, split_by_root
+from python_doctor.rules import Finding
+
+
+def _finding(rule="zen/long-function", cost=1.0, file="/p/a.py"):
+    return Finding(category="zen", rule=rule, message="m", file=file, cost=cost)
+
+
+def test_sink_keep_limits_findings_but_not_counts():
+    """Only *keep* findings are retained, while counts and costs cover all."""
+    sink = FindingSink("zen", keep=2)
+    for _ in range(5):
+        sink.add(_finding())
+    result = sink.finish()
+    assert len(result.findings) == 2
+    assert result.finding_count == 5
+    assert result.rule_counts == {"zen/long-function": 5}
+    assert result.rule_costs == {"zen/long-function": 5.0}
+
+
+def test_sink_saturates_only_in_score_only_mode():
+    """Reaching the cap stops analysis only when the score alone is wanted."""
+    full = FindingSink("zen", max_deduction=2)
+    score_only = FindingSink("zen", max_deduction=2, score_only=True)
+    for sink in (full, score_only):
+        sink.add(_finding(cost=1.0))
+        sink.add(_finding(cost=1.0))
+    assert not full.saturated
+    assert score_only.saturated
+    assert score_only.finish().deduction == 2
+
+
+def test_sink_suppressed_findings_rescored_linearly():
+    """Suppressed findings are dropped and the rest are summed without discount."""
+    sink = FindingSink("zen", suppress=lambda rule, _file: rule == "zen/dense-code")
+    sink.add(_finding(rule="zen/dense-code"))
+    for _ in range(4):
+        sink.add(_finding(cost=1.0))
+    result = sink.finish()
+    assert [f.rule for f in result.findings] == ["zen/long-function"] * 4
+    assert result.deduction == 4.0
+
+
+def test_sink_whole_deductions_are_ints():
+    """Whole deductions stay ints, so JSON reports show 10 rather than 10.0."""
+    sink = FindingSink("zen")
+    sink.add(_finding(cost=2.5))
+    sink.add(_finding(cost=7.5))
+    deduction = sink.finish().deduction
+    assert deduction == 10 and isinstance(deduction, int)
+    sink = FindingSink("zen")
+    sink.add(_finding(cost=1.5))
+    assert sink.finish().deduction == 1.5
+
+
+def test_sink_streams_scored_findings():
+    """on_finding sees every unsuppressed finding, even beyond *keep*."""
+    seen = []
+    sink = FindingSink("zen", keep=0, on_finding=seen.append, suppress=lambda rule, _file: rule == "zen/dense-code")
+    sink.add(_finding())
+    sink.add(_finding(rule="zen/dense-code"))
+    sink.add(_finding())
+    assert [f.rule for f in seen] == ["zen/long-function", "zen/long-function"]
+    assert sink.finish().findings == []
+
+
+def test_run_tool_killed_on_cancel():
+    """A cancelled tool run kills the child instead of waiting for it."""
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    with pytest.raises(ToolCancelled):
+        run_tool([sys.executable, "-c", "import time; time.sleep(30)"], cancel=cancel)
+
+
+def test_run_tool_returns_output():
+    """Uncancelled runs behave like subprocess.run with captured text."""
+    proc = run_tool([sys.executable, "-c", "print('ok')"], cancel=threading.Event())
+    assert proc.returncode == 0
+    assert proc.stdout.strip() == "ok"
+
+
+def test_split_by_root_assigns_items_to_containing_roots():
+    """Items go to every root containing them, nested roots included."""
+    items = [{"filename": "/r/a/x.py"}, {"filename": "/r/a/sub/y.py"}, {"filename": "/r/b/z.py"}, {"filename": "/o.py"}]
+    split = split_by_root(items, ["/r/a", "/r/a/sub", "/r/b"], lambda item: item["filename"])
+    assert [i["filename"] for i in split["/r/a"]] == ["/r/a/x.py", "/r/a/sub/y.py"]
+    assert [i["filename"] for i in split["/r/a/sub"]] == ["/r/a/sub/y.py"]
+    assert [i["filename"] for i in split["/r/b"]] == ["/r/b/z.py"]
@@ -1,7 +1,7 @@
 """Tests for the Zen of Python analyzer."""
 
 from python_doctor.analyzers import zen_analyzer
-from python_doctor.analyzers._util import diminishing_deduction
+from python_doctor.analyzers._util import DeductionAccumulator, diminishing_deduction
 
 
 def test_detects_deep_nesting(tmp_path):
@@ -158,6 +158,27 @@ def test_diminishing_deduction_empty():
     assert diminishing_deduction([], top_n=5, tail_rate=0.1, cap=100.0) == 0.0
 
 
+def test_accumulator_matches_sorted_reference():
+    """Streaming costs in any order gives the same result as sorting them all."""
+    costs = [0.5, 2.0, 1.0, 0.5, 2.0, 1.0, 0.5, 1.0, 2.0, 0.5]
+    acc = DeductionAccumulator(top_n=3, tail_rate=0.1)
+    for c in costs:
+        acc.add(c)
+    ranked = sorted(costs, reverse=True)
+    expected = sum(ranked[:3]) + sum(ranked[3:]) * 0.1
+    assert acc.total == expected
+    assert acc.raw_total == sum(costs)
+    assert acc.value(cap=4.0) == 4.0
+
+
+def test_accumulator_for_linear_category():
+    """Categories without a diminishing curve count every cost in full."""
+    acc = DeductionAccumulator.for_category("exceptions")
+    for c in [2, 2, 2, 2, 2, 2]:
+        acc.add(c)
+    assert acc.total == 12
+
+
 def test_clean_code_no_findings(tmp_path):
     code = tmp_path / "clean.py"
     code.write_text(
@@ -167,3 +188,15 @@ def test_clean_code_no_findings(tmp_path):
     result = zen_analyzer.analyze(str(tmp_path))
     assert len(result.findings) == 0
     assert result.deduction == 0
+
+
+def test_accumulator_total_independent_of_order():
+    """Feeding the same costs in another order gives exactly the same total."""
+    costs = [0.5, 0.1, 0.2, 1.0, 0.3, 0.7, 0.1, 2.0] * 7
+    forward, backward = DeductionAccumulator(), DeductionAccumulator()
+    for c in costs:
+        forward.add(c)
+    for c in reversed(costs):
+        backward.add(c)
+    assert forward.total == backward.total
+    assert forward.raw_total == backward.raw_total